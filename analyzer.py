@@ -2,18 +2,21 @@
 Main code analyzer
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 
 from analyzer_registry import get_analyzers_for_language
 from config import Config
 from file_discovery import FileDiscovery
-from logger import Logger
+from logger import BufferedLogger, Logger
 from models import LogLevel, RuleResult, RuleStatus, Severity, Violation
 from path_utils import to_relative_posix
 from project_wide_rules import FILTER_INCAPABLE, PROJECT_WIDE_ANALYZERS
 from rules import MaxLinesRule, PMDDuplicatesRule, PMDSimilarCodeRule
+from rules.base import ProjectWideRule
 from rules.context import RuleContext
+from rules.project_files import ProjectFileIndex
 
 
 @dataclass(frozen=True)
@@ -53,6 +56,10 @@ class CodeAnalyzer:
             {p.replace('\\', '/') for p in cfg.filter_files} if cfg.filter_files else None
         )
         self.logger = cfg.logger or Logger()
+        # One extension scan of the project, shared by every rule in this run
+        self.file_index = ProjectFileIndex(self.base_path)
+        # Results rules memoize for this run only (e.g. PMD CPD reports shared between languages)
+        self.run_cache: dict = {}
         self._enabled_analyzers = self._get_enabled_analyzers()
         self._multi_language = len(self.languages) > 1
         self._last_language_header = None
@@ -137,23 +144,21 @@ class CodeAnalyzer:
                 self._run_and_record(pmd_rule, self.files[0])
 
         # Run project-wide analyzers (each runs once, not per file)
+        project_rules = []
         for analyzer_name, RuleClass in self._PROJECT_WIDE_ANALYZERS:
             if self._should_run(analyzer_name):
                 # Skip whole-project-only analyzers when filtering to a file subset.
                 if self.filter_files is not None and analyzer_name in self._FILTER_INCAPABLE:
                     continue
-                self._print_language_header(analyzer_name)
                 rule_config = self.config.get_rule(analyzer_name)
-                rule = RuleClass(self._make_ctx(rule_config))
-                self._run_and_record(rule, self.files[0])
+                project_rules.append((analyzer_name, RuleClass(self._make_ctx(rule_config))))
+        self._run_project_rules(project_rules, self.files[0])
 
         # Run per-file rules on each file (skip files not in filter, if set)
-        for file_path in self.files:
-            if self.filter_files is not None:
-                rel = to_relative_posix(file_path, self.base_path)
-                if rel not in self.filter_files:
-                    continue
-            self._check_file(file_path)
+        files = self.files
+        if self.filter_files is not None:
+            files = [f for f in files if to_relative_posix(f, self.base_path) in self.filter_files]
+        self._check_files(files)
 
         # Filter project-wide tool violations to the requested file set
         if self.filter_files is not None:
@@ -193,28 +198,67 @@ class CodeAnalyzer:
             logger=self.logger,
             language=language,
             filter_files=self.filter_files,
+            file_index=self.file_index,
+            run_cache=self.run_cache,
         )
 
-    def _check_file(self, file_path: Path):
-        """Check a single file against all enabled rules"""
-        if self._should_run('max_lines_per_file'):
+    def _check_files(self, files: list[Path]):
+        """Check files against all enabled per-file rules"""
+        if self._should_run('max_lines_per_file') and files:
             rule_config = self.config.get_rule('max_lines_per_file')
             rule = MaxLinesRule(self._make_ctx(rule_config))
-            self._run_and_record(rule, file_path)
+            for result in rule.check_many(files):
+                self._record(result)
+
+    def _run_project_rules(self, rules: list[tuple[str, ProjectWideRule]], file_path: Path) -> None:
+        """Run project-wide rules, concurrently when "parallel_rules" is set.
+
+        The rules mostly wait on external tools, so threads overlap them well.
+        Rules with parallel_safe = False run one after another on the calling
+        thread meanwhile. In that mode each rule logs to a BufferedLogger,
+        flushed below its language header afterwards; headers, rule output and
+        results come out in registry order either way, so the report does not
+        depend on which tool finished first.
+        """
+        workers = self.config.get_global_parallel_rules()
+        concurrent = [rule for _, rule in rules if rule.parallel_safe] if workers else []
+        if len(concurrent) < 2:
+            for analyzer_name, rule in rules:
+                self._print_language_header(analyzer_name)
+                self._run_and_record(rule, file_path)
+            return
+
+        buffers = {}
+        for _, rule in rules:
+            buffers[id(rule)] = rule.logger = BufferedLogger(quiet=self.logger.quiet)
+        with ThreadPoolExecutor(max_workers=min(workers, len(concurrent))) as executor:
+            futures = {id(rule): executor.submit(self._run_rule, rule, file_path) for rule in concurrent}
+            serial_results = {id(rule): self._run_rule(rule, file_path)
+                              for _, rule in rules if id(rule) not in futures}
+        for analyzer_name, rule in rules:
+            self._print_language_header(analyzer_name)
+            future = futures.get(id(rule))
+            result = future.result() if future is not None else serial_results[id(rule)]
+            buffers[id(rule)].flush_to(self.logger)
+            rule.logger = self.logger
+            self._record(result)
 
     def _run_and_record(self, rule, file_path: Path) -> None:
-        """Run a rule and record its typed result.
+        """Run a rule and record its typed result."""
+        self._record(self._run_rule(rule, file_path))
+
+    def _run_rule(self, rule, file_path: Path) -> RuleResult:
+        """Run a rule and return its typed result.
 
         Any unexpected exception is converted to a FAILED result so a broken
         rule fails loudly instead of crashing the run or silently vanishing.
         """
         try:
-            result = rule.check(file_path)
+            return rule.check(file_path)
         except Exception as e:
             name = getattr(rule, 'rule_name', '') or rule.__class__.__name__
-            self.logger.error(f"Error running {name}: {e}")
-            result = RuleResult(rule_name=name, status=RuleStatus.FAILED, message=f"unexpected error: {e}")
-        self._record(result)
+            getattr(rule, 'logger', self.logger).error(f"Error running {name}: {e}")
+            return RuleResult(rule_name=name, status=RuleStatus.FAILED, message=f"unexpected error: {e}")
 
     def _record(self, result: RuleResult) -> None:
         """Aggregate a rule result: collect its violations and surface failures.
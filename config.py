@@ -60,6 +60,18 @@ class Config:
             return None
         return value if value > 0 else None
 
+    def get_global_parallel_rules(self) -> int | None:
+        """Get how many project-wide analyzers may run concurrently.
+
+        Returns:
+            Worker count of at least 2, or None to run analyzers one at a time
+            (unset/invalid/less than 2).
+        """
+        value = self.rules.get('parallel_rules')
+        if isinstance(value, bool) or not isinstance(value, int):
+            return None
+        return value if value >= 2 else None
+
     def get_rule_log_level(self, rule_name: str) -> str:
         """Get log level for a specific rule.
 
@@ -2,9 +2,14 @@
 Logging abstraction for the code analyzer.
 
 When quiet=True, all output is suppressed. This is used when --file is set
-so that only the final report (text or JSON) is printed.
+so that only the final report (text or JSON) is printed. Output is serialized
+with a lock so rules running on worker threads never interleave within a line.
 """
 
+import threading
+
+_PRINT_LOCK = threading.Lock()
+
 
 class Logger:
     """Simple logger that can suppress output in quiet mode."""
@@ -13,13 +18,37 @@ class Logger:
         self.quiet = quiet
 
     def info(self, msg: str = ""):
-        if not self.quiet:
-            print(msg)
+        self._print(msg)
 
     def warning(self, msg: str = ""):
-        if not self.quiet:
-            print(msg)
+        self._print(msg)
 
     def error(self, msg: str = ""):
+        self._print(msg)
+
+    def _print(self, msg: str) -> None:
+        if not self.quiet:
+            with _PRINT_LOCK:
+                print(msg)
+
+
+class BufferedLogger(Logger):
+    """Logger that holds its lines until flushed to another logger.
+
+    Lets the analyzer run rules concurrently and still print each rule's
+    output in one piece, below its own language header.
+    """
+
+    def __init__(self, quiet: bool = False):
+        super().__init__(quiet)
+        self.lines: list[str] = []
+
+    def flush_to(self, target: Logger) -> None:
+        """Print the held lines through ``target`` and forget them."""
+        for line in self.lines:
+            target.info(line)
+        self.lines.clear()
+
+    def _print(self, msg: str) -> None:
         if not self.quiet:
-            print(msg)
+            self.lines.append(msg)
@@ -70,9 +70,7 @@ class AutoHotkeyAnalyzeRule(ProjectWideRule):
 
         # Two roots may include the same broken sub-file; report each issue once.
         violations = self._dedupe(violations)
-        violations = self._filter_violations_by_log_level(violations)
-        if self.max_errors and len(violations) > self.max_errors:
-            violations = violations[:self.max_errors]
+        violations = self._limit_violations(violations)
 
         if violations:
             self.logger.info(f"AutoHotkey: {len(violations)} issue(s) found")
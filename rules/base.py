@@ -3,11 +3,17 @@ Base rule class for all code analysis rules
 """
 
 import csv
+import functools
+import heapq
+import os
 import shutil
 import subprocess
+import threading
 from abc import ABC, abstractmethod
-from collections.abc import Callable
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
 from fnmatch import fnmatch
+from itertools import islice
 from pathlib import Path
 from typing import Any
 
@@ -15,6 +21,80 @@ from logger import Logger
 from models import LogLevel, RuleResult, RuleStatus, Severity, Violation
 from rules.context import RuleContext
 from rules.filter_scope import FilterScopeMixin
+from rules.project_files import ProjectFileIndex
+
+# Large write buffer for CSV reports so rows are flushed in few big writes.
+CSV_WRITE_BUFFER_SIZE = 1 << 20
+
+# Report ordering, most severe first; look up with .get(severity, 3)
+SEVERITY_ORDER = {Severity.ERROR: 0, Severity.WARNING: 1, Severity.INFO: 2}
+
+# Severity by upper-case name, for BaseRule._map_severity
+_SEVERITY_NAMES = {'INFO': Severity.INFO, 'WARNING': Severity.WARNING, 'ERROR': Severity.ERROR}
+
+# Root of the cli-code-analyzer checkout; relative tool paths and bundled tools live under it
+_SCRIPT_DIR = Path(__file__).resolve().parent.parent
+
+# Severities each log level lets through, for BaseRule._log_level_accepts
+_ACCEPTED_SEVERITIES = {
+    LogLevel.ERROR: frozenset({Severity.ERROR}),
+    LogLevel.WARNING: frozenset({Severity.ERROR, Severity.WARNING}),
+    LogLevel.ALL: frozenset(Severity),
+}
+
+# Tool paths resolved by _get_tool_path, keyed by (tool_name, settings_name, base_path) and
+# shared by every rule in the process. Only successful lookups are stored, so a missing tool
+# is still reported (and prompted for) the next time it is needed.
+_TOOL_PATH_CACHE: dict[tuple[str, str, Path | None], str] = {}
+
+# Serializes the interactive tool path prompt: with "parallel_rules" several rules (e.g. PHPStan
+# and PHP-CS-Fixer) can miss a tool at once, and their prompts and settings writes must not interleave.
+_PROMPT_LOCK = threading.Lock()
+
+
+def count_file_lines(file_path: Path) -> int:
+    """Count the lines of a UTF-8 text file; read and decode errors propagate.
+
+    Gives the same count as iterating the file in text mode (universal
+    newlines), but counts line-ending bytes in C instead of building a str
+    per line. A module-level function so process pool workers can call it.
+    """
+    with open(file_path, 'rb') as f:
+        data = f.read()
+    # Non-UTF-8 files fail here just as they would when read as text
+    data.decode('utf-8')
+    count = data.count(b'\n')
+    if b'\r' in data:
+        # A lone '\r' also ends a line; '\r\n' is already counted once via its '\n'
+        count += data.count(b'\r') - data.count(b'\r\n')
+    if data and not data.endswith((b'\n', b'\r')):
+        count += 1  # last line without a line ending
+    return count
+
+
+@functools.lru_cache(maxsize=None)
+def _which(name: str) -> str | None:
+    """Memoized shutil.which() for probes repeated by many rules (e.g. fvm)."""
+    return shutil.which(name)
+
+
+@functools.lru_cache(maxsize=None)
+def _bundled_php_bin_names() -> frozenset[str]:
+    """Entry names of the bundled php/vendor/bin folder, listed with one scandir per process."""
+    try:
+        with os.scandir(_SCRIPT_DIR / 'php' / 'vendor' / 'bin') as entries:
+            return frozenset(entry.name for entry in entries)
+    except OSError:
+        return frozenset()
+
+
+def find_bundled_php_tool(name: str) -> str | None:
+    """Look up a tool in the bundled php/vendor/bin folder, preferring the .bat wrapper."""
+    names = _bundled_php_bin_names()
+    for candidate in (f'{name}.bat', name):
+        if candidate in names:
+            return str(_SCRIPT_DIR / 'php' / 'vendor' / 'bin' / candidate)
+    return None
 
 
 class BaseRule(FilterScopeMixin, ABC):
@@ -35,6 +115,10 @@ class BaseRule(FilterScopeMixin, ABC):
         self.logger = ctx.logger or Logger()
         self.language = ctx.language
         self.filter_files = ctx.filter_files
+        self.file_index = ctx.file_index if ctx.file_index is not None else ProjectFileIndex(self.base_path)
+        self.run_cache = ctx.run_cache if ctx.run_cache is not None else {}
+        # _get_relative_path results; tools report many issues per file
+        self._relative_path_cache: dict[Path, str] = {}
         self._settings = None
 
     @property
@@ -64,7 +148,17 @@ class BaseRule(FilterScopeMixin, ABC):
         return RuleResult(rule_name=self._result_name(), status=RuleStatus.SKIPPED, message=message)
 
     def _get_relative_path(self, file_path: Path) -> str:
-        """Get relative path from base path, or absolute path if not relative."""
+        """Get relative path from base path, or absolute path if not relative.
+
+        Memoized per rule instance, so Path.resolve() runs once per file.
+        """
+        rel_path = self._relative_path_cache.get(file_path)
+        if rel_path is None:
+            rel_path = self._compute_relative_path(file_path)
+            self._relative_path_cache[file_path] = rel_path
+        return rel_path
+
+    def _compute_relative_path(self, file_path: Path) -> str:
         if self.base_path:
             try:
                 return str(file_path.resolve().relative_to(self.base_path))
@@ -72,15 +166,6 @@ class BaseRule(FilterScopeMixin, ABC):
                 return str(file_path)
         return str(file_path)
 
-    def _count_lines(self, file_path: Path) -> int:
-        """Count lines in a file, returning 0 on error."""
-        try:
-            with open(file_path, encoding='utf-8') as f:
-                return sum(1 for _ in f)
-        except Exception as e:
-            self.logger.warning(f"Warning: Could not read {file_path}: {e}")
-            return 0
-
     def _build_threshold_dict(self, exception: dict | None, base: dict) -> dict[str, float | None]:
         """Build threshold dict from exception overrides or base config."""
         def to_num(val):
@@ -146,37 +231,84 @@ class BaseRule(FilterScopeMixin, ABC):
 
     def _map_severity(self, severity_str: str) -> Severity:
         """Map severity string (INFO/WARNING/ERROR) to Severity enum."""
-        severity_map = {
-            'INFO': Severity.INFO,
-            'WARNING': Severity.WARNING,
-            'ERROR': Severity.ERROR,
-        }
-        return severity_map.get(severity_str.upper(), Severity.WARNING)
+        return _SEVERITY_NAMES.get(severity_str.upper(), Severity.WARNING)
+
+    def _log_level_accepts(self, severity: Severity) -> bool:
+        """Check whether a violation of this severity passes the configured log level.
+
+        Lets parsers drop filtered-out diagnostics before building a Violation.
+        """
+        accepted = _ACCEPTED_SEVERITIES.get(self.log_level)
+        return accepted is None or severity in accepted
 
     def _filter_violations_by_log_level(self, violations: list[Violation]) -> list[Violation]:
         """Filter violations based on configured log level."""
         if self.log_level == LogLevel.ALL:
             return violations
+        return [v for v in violations if self._log_level_accepts(v.severity)]
 
-        filtered = []
-        for violation in violations:
-            if (
-                (self.log_level == LogLevel.ERROR and violation.severity != Severity.ERROR)
-                or (self.log_level == LogLevel.WARNING and violation.severity not in (Severity.ERROR, Severity.WARNING))
-            ):
-                continue
-            filtered.append(violation)
+    def _limit_violations(self, violations: Iterable[Violation]) -> list[Violation]:
+        """Filter by log level and keep the first max_errors, in a single pass.
 
-        return filtered
+        Stops consuming ``violations`` at the cap, so a lazy producer builds no
+        more violations than are returned.
+        """
+        if self.log_level != LogLevel.ALL:
+            violations = (v for v in violations if self._log_level_accepts(v.severity))
+        return list(islice(violations, self.max_errors or None))
 
-    def _run_subprocess(self, cmd: list[str], cwd: Path | None = None, timeout: int = 300) -> subprocess.CompletedProcess:
-        """Run subprocess with timeout and no stdin to prevent interactive prompts."""
+    def _run_subprocess(self, cmd: list[str], cwd: Path | None = None, timeout: int = 300,
+                        text: bool = True) -> subprocess.CompletedProcess:
+        """Run subprocess with timeout and no stdin to prevent interactive prompts.
+
+        With text=False stdout/stderr are returned as raw bytes, for parsers
+        (e.g. JSON) that accept bytes and would otherwise pay for a full decode.
+        """
+        if not text:
+            return subprocess.run(
+                cmd, cwd=cwd, capture_output=True, check=False,
+                stdin=subprocess.DEVNULL, timeout=timeout
+            )
         return subprocess.run(
             cmd, cwd=cwd, capture_output=True,
             encoding='utf-8', errors='replace', check=False,
             stdin=subprocess.DEVNULL, timeout=timeout
         )
 
+    @contextmanager
+    def _stream_subprocess(self, cmd: list[str], cwd: Path | None = None,
+                           timeout: int = 300) -> Iterator[subprocess.Popen]:
+        """Run subprocess with stdout and stderr merged into one line-buffered text pipe.
+
+        Lets callers parse output while the tool is still running instead of
+        buffering it all. The process is killed on exit from the block (e.g.
+        when the caller stops reading early) and after `timeout` seconds, in
+        which case subprocess.TimeoutExpired is raised like `_run_subprocess`.
+        """
+        proc = subprocess.Popen(
+            cmd, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+            encoding='utf-8', errors='replace', bufsize=1,
+            stdin=subprocess.DEVNULL
+        )
+        timed_out = threading.Event()
+
+        def kill_on_timeout():
+            timed_out.set()
+            proc.kill()
+
+        timer = threading.Timer(timeout, kill_on_timeout)
+        timer.start()
+        try:
+            yield proc
+        finally:
+            timer.cancel()
+            if proc.poll() is None:
+                proc.kill()
+            proc.stdout.close()
+            proc.wait()
+        if timed_out.is_set():
+            raise subprocess.TimeoutExpired(cmd, timeout)
+
     def _get_tool_path(self, tool_name: str, settings_name: str | None = None) -> str | None:
         """Get tool path from PATH, local node_modules, settings, or prompt user.
 
@@ -184,6 +316,16 @@ class BaseRule(FilterScopeMixin, ABC):
         is the Settings key; defaults to `tool_name` when they match (most tools).
         """
         settings_name = settings_name or tool_name
+        key = (tool_name, settings_name, self.base_path)
+        tool_path = _TOOL_PATH_CACHE.get(key)
+        if tool_path is None:
+            tool_path = self._resolve_tool_path(tool_name, settings_name)
+            if tool_path:
+                _TOOL_PATH_CACHE[key] = tool_path
+        return tool_path
+
+    def _resolve_tool_path(self, tool_name: str, settings_name: str) -> str | None:
+        """Uncached lookup behind _get_tool_path."""
         tool_in_path = shutil.which(tool_name)
         if tool_in_path:
             return tool_in_path
@@ -197,15 +339,18 @@ class BaseRule(FilterScopeMixin, ABC):
 
         tool_path = self.settings.get_path(settings_name)
         if not tool_path:
-            tool_path = self.settings.prompt_and_save(settings_name)
+            with _PROMPT_LOCK:
+                # Another rule may have saved a path while this one waited; reloading also
+                # keeps this instance's save from dropping what the other rule wrote
+                self.settings.reload()
+                tool_path = self.settings.get_path(settings_name) or self.settings.prompt_and_save(settings_name)
             if not tool_path:
                 return None
 
         tool_path_obj = Path(tool_path)
         if not tool_path_obj.is_absolute():
             # Resolve relative paths relative to cli-code-analyzer directory
-            script_dir = Path(__file__).parent.parent
-            tool_path_obj = script_dir / tool_path
+            tool_path_obj = _SCRIPT_DIR / tool_path
             tool_path = str(tool_path_obj)
 
         if not tool_path_obj.exists():
@@ -232,14 +377,14 @@ class BaseRule(FilterScopeMixin, ABC):
 
     def _get_flutter_command(self) -> list[str]:
         """Get flutter command, using FVM prefix if detected."""
-        if self._is_fvm_project() and shutil.which('fvm'):
+        if self._is_fvm_project() and _which('fvm'):
             return ['fvm', 'flutter']
         path = self._get_tool_path('flutter')
         return [path] if path else []
 
     def _get_dart_command(self) -> list[str]:
         """Get dart command, using FVM prefix if detected."""
-        if self._is_fvm_project() and shutil.which('fvm'):
+        if self._is_fvm_project() and _which('fvm'):
             return ['fvm', 'dart']
         path = self._get_tool_path('dart')
         return [path] if path else []
@@ -250,18 +395,20 @@ class BaseRule(FilterScopeMixin, ABC):
         if not violations:
             return
 
-        severity_order = {Severity.ERROR: 0, Severity.WARNING: 1, Severity.INFO: 2}
-        sorted_violations = sorted(violations, key=lambda v: severity_order.get(v.severity, 3))
+        def sort_key(v: Violation) -> int:
+            return SEVERITY_ORDER.get(v.severity, 3)
 
-        if self.max_errors and len(sorted_violations) > self.max_errors:
-            sorted_violations = sorted_violations[:self.max_errors]
+        if self.max_errors and len(violations) > self.max_errors:
+            # Same result as sorted(...)[:max_errors] without sorting the tail
+            sorted_violations = heapq.nsmallest(self.max_errors, violations, key=sort_key)
+        else:
+            sorted_violations = sorted(violations, key=sort_key)
 
         try:
-            with open(output_file, 'w', encoding='utf-8', newline='') as f:
+            with open(output_file, 'w', encoding='utf-8', newline='', buffering=CSV_WRITE_BUFFER_SIZE) as f:
                 writer = csv.writer(f)
                 writer.writerow(headers)
-                for v in sorted_violations:
-                    writer.writerow(row_mapper(v))
+                writer.writerows(map(row_mapper, sorted_violations))
             self.logger.info(f"Report saved to: {output_file}")
         except Exception as e:
             self.logger.error(f"Error writing CSV: {e}")
@@ -272,24 +419,35 @@ class ProjectWideRule(BaseRule):
 
     Subclasses implement `_run(file_path)`; this class handles the once-only
     guard. The first call to `check()` runs the body and caches; subsequent
-    calls return an empty list.
+    calls return an empty list. The guard is thread-safe: concurrent callers
+    block until the first run finishes instead of running the body twice.
     """
 
+    # Whether the rule may run alongside other project-wide rules when
+    # "parallel_rules" is set. Rules that share on-disk artifacts with another
+    # rule (e.g. coverage output) opt out and run on their own.
+    parallel_safe = True
+
     def __init__(self, ctx: RuleContext):
         super().__init__(ctx)
         self._executed = False
+        self._exec_lock = threading.Lock()
 
     def check(self, file_path: Path) -> RuleResult:
         if self._executed:
             return self._ok([])
-        self._executed = True
-        try:
-            return self._run(file_path)
-        except Exception as e:
-            # Safety net: a rule that forgets to catch an error fails loudly
-            # rather than crashing the run or silently returning nothing.
-            self.logger.error(f"Error running {self._result_name()}: {e}")
-            return self._failed(f"unexpected error: {e}")
+        with self._exec_lock:
+            if self._executed:
+                return self._ok([])
+            try:
+                return self._run(file_path)
+            except Exception as e:
+                # Safety net: a rule that forgets to catch an error fails loudly
+                # rather than crashing the run or silently returning nothing.
+                self.logger.error(f"Error running {self._result_name()}: {e}")
+                return self._failed(f"unexpected error: {e}")
+            finally:
+                self._executed = True
 
     @abstractmethod
     def _run(self, file_path: Path) -> RuleResult:
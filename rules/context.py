@@ -4,6 +4,7 @@ from pathlib import Path
 
 from logger import Logger
 from models import LogLevel
+from rules.project_files import ProjectFileIndex
 
 
 @dataclass(frozen=True)
@@ -17,3 +18,5 @@ class RuleContext:
     logger: Logger | None = None
     language: str | None = None
     filter_files: set[str] | None = None  # base-relative posix paths, or None for whole-project
+    file_index: ProjectFileIndex | None = None  # shared per run; rules build their own if None
+    run_cache: dict | None = None  # results memoized for one run (see pmd_base); rules keep their own if None
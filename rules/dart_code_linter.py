@@ -9,11 +9,13 @@ import shutil
 from pathlib import Path
 from typing import Any, ClassVar
 
-import yaml
-
 from models import RuleResult, Severity, Violation
 from rules.base import ProjectWideRule
 from rules.context import RuleContext
+from rules.dart_utils import load_yaml
+
+# "metric = value >= threshold (threshold) in context" violation messages
+_METRIC_MESSAGE_RE = re.compile(r'^(.+?) = ([\d.]+) [<>]= ([\d.]+) \(threshold\)(?: in (.+))?$')
 
 
 class DartCodeLinterRule(ProjectWideRule):
@@ -51,7 +53,7 @@ class DartCodeLinterRule(ProjectWideRule):
 
         try:
             with open(self.project_root / 'pubspec.yaml', encoding='utf-8') as f:
-                pubspec_data = yaml.safe_load(f)
+                pubspec_data = load_yaml(f)
             dev_deps = pubspec_data.get('dev_dependencies', {}) if pubspec_data else {}
             return 'dart_code_linter' in dev_deps
         except Exception as e:
@@ -191,10 +193,9 @@ class DartCodeLinterRule(ProjectWideRule):
     def _write_csv_output(self, output_file: Path, violations: list[Violation], _report_json: Path):
         """Write dart_code_linter results to CSV, sorted by severity, limited by max_errors."""
         try:
-            pattern = r'^(.+?) = ([\d.]+) [<>]= ([\d.]+) \(threshold\)(?: in (.+))?$'
             csv_rows = []
             for v in violations:
-                if m := re.match(pattern, v.message):
+                if m := _METRIC_MESSAGE_RE.match(v.message):
                     csv_rows.append({'file_path': v.file_path, 'metric': m.group(1), 'value': float(m.group(2)),
                                      'threshold': float(m.group(3)), 'severity': v.severity.value, 'context': m.group(4) or ''})
 
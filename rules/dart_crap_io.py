@@ -9,6 +9,8 @@ import contextlib
 import json
 from pathlib import Path
 
+from rules.dart_utils import LCOV_LINE_RE
+
 
 class DartCrapIOMixin:
     """dart_code_linter metrics parsing and LCOV coverage reading."""
@@ -172,21 +174,17 @@ class DartCrapIOMixin:
             self.logger.error(f"Error reading LCOV: {e}")
             return coverage
 
-        for line in content.split('\n'):
-            line = line.strip()
-            if line.startswith('SF:'):
-                current_file = line[3:]
+        for match in LCOV_LINE_RE.finditer(content):
+            source_file, line_no, hits, end_of_record = match.groups()
+            if source_file is not None:
+                current_file = source_file
                 current_lines = {}
-            elif line.startswith('DA:') and current_file is not None:
-                parts = line[3:].split(',')
-                if len(parts) >= 2:
-                    try:
-                        ln = int(parts[0])
-                        hits = int(parts[1])
-                        current_lines[ln] = hits
-                    except ValueError:
-                        pass
-            elif line == 'end_of_record' and current_file is not None:
+            elif hits is not None and current_file is not None:
+                try:
+                    current_lines[int(line_no)] = int(hits)
+                except ValueError:
+                    pass
+            elif end_of_record and current_file is not None:
                 try:
                     key = str(Path(current_file).resolve())
                 except Exception:
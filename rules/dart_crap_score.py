@@ -15,13 +15,12 @@ coverage/violation logic in CrapScoreMixin.
 import shutil
 from pathlib import Path
 
-import yaml
-
 from models import RuleResult, Violation
 from rules._crap import CrapScoreMixin, crap_score
 from rules.base import ProjectWideRule
 from rules.context import RuleContext
 from rules.dart_crap_io import DartCrapIOMixin
+from rules.dart_utils import load_yaml
 
 DEFAULT_EXCLUDE = ['*.g.dart', '*.freezed.dart']
 
@@ -30,6 +29,8 @@ class DartCrapScoreRule(CrapScoreMixin, DartCrapIOMixin, ProjectWideRule):
     """Per-function CRAP score for Dart/Flutter projects."""
 
     rule_name = 'dart_crap_score'
+    # Writes coverage/lcov.info, which dart_test_coverage also produces
+    parallel_safe = False
 
     def __init__(self, ctx: RuleContext):
         super().__init__(ctx)
@@ -94,7 +95,7 @@ class DartCrapScoreRule(CrapScoreMixin, DartCrapIOMixin, ProjectWideRule):
     def _dart_code_linter_in_pubspec(self) -> bool:
         try:
             with open(self.project_root / 'pubspec.yaml', encoding='utf-8') as f:
-                pubspec = yaml.safe_load(f) or {}
+                pubspec = load_yaml(f) or {}
             return 'dart_code_linter' in (pubspec.get('dev_dependencies') or {})
         except Exception as e:
             self.logger.error(f"Error reading pubspec.yaml: {e}")
@@ -3,6 +3,7 @@ Dart import rules analyzer - enforces architecture layer boundaries via configur
 """
 
 import contextlib
+from dataclasses import dataclass
 from fnmatch import fnmatch
 from pathlib import Path
 
@@ -10,12 +11,24 @@ from models import RuleResult, Violation
 from rules.base import ProjectWideRule
 from rules.dart_utils import (
     collect_dart_files,
+    dart_source_cache,
     get_package_name,
     parse_imports,
+    resolve_path,
     resolve_relative_import,
 )
 
 
+@dataclass(slots=True)
+class ResolvedImport:
+    """An import/export statement with its target resolved relative to analyze_dir."""
+    file_rel: str                # importing file, relative to base_path (for output)
+    rel_path: str                # importing file, relative to analyze_dir (for 'from' matching)
+    uri: str
+    resolved_rel: str | None     # imported file relative to analyze_dir, if local
+    line: int
+
+
 class DartImportRulesRule(ProjectWideRule):
     """Enforce architecture layer boundaries via configurable forbidden import rules."""
 
@@ -49,65 +62,31 @@ class DartImportRulesRule(ProjectWideRule):
             self.logger.info("No Dart files found to analyze")
             return self._skipped("no Dart files found to analyze")
 
-        violations = []
-
-        for dart_file in all_dart_files:
-            # Get relative path from analyze_dir for rule matching
-            try:
-                rel_path = str(dart_file.relative_to(analyze_dir)).replace('\\', '/')
-            except ValueError:
-                continue
+        # Phase 1: parse and resolve every import exactly once per file.
+        resolved_imports = self._resolve_imports(all_dart_files, analyze_dir, package_name)
 
-            # Check which rules apply to this file
-            for rule in forbidden_imports:
-                from_pattern = rule.get('from', '')
-                if not fnmatch(rel_path, from_pattern):
+        # Phase 2: match the resolved imports against each forbidden-import rule.
+        violations = []
+        for rule in forbidden_imports:
+            from_pattern = rule.get('from', '')
+            cannot_import = rule.get('cannot_import', [])
+            rule_severity = self._map_severity(rule.get('severity', 'error'))
+            rule_message = rule.get('message', 'Architecture violation')
+
+            for ri in resolved_imports:
+                if not fnmatch(ri.rel_path, from_pattern):
                     continue
-
-                cannot_import = rule.get('cannot_import', [])
-                rule_severity = self._map_severity(rule.get('severity', 'error'))
-                rule_message = rule.get('message', 'Architecture violation')
-
-                # Parse imports for this file
-                imports = parse_imports(dart_file)
-                for imp in imports:
-                    if imp['type'] not in ('import', 'export'):
-                        continue
-
-                    uri = imp['uri']
-                    import_rel_path = None
-
-                    # Resolve the import to a relative path within analyze_dir
-                    if uri.startswith('package:') and package_name:
-                        prefix = f'package:{package_name}/'
-                        if uri.startswith(prefix):
-                            import_rel_path = uri[len(prefix):]
-                    elif not uri.startswith('dart:') and not uri.startswith('package:'):
-                        resolved = resolve_relative_import(uri, dart_file)
-                        if resolved:
-                            with contextlib.suppress(ValueError):
-                                import_rel_path = str(resolved.relative_to(analyze_dir.resolve())).replace('\\', '/')
-
-                    # Check against forbidden patterns
-                    for pattern in cannot_import:
-                        matched = False
-                        if (import_rel_path and fnmatch(import_rel_path, pattern)) or (
-                            uri.startswith('package:') and fnmatch(uri, pattern)
-                        ):
-                            matched = True
-
-                        if matched:
-                            try:
-                                file_rel = self._get_relative_path(dart_file)
-                            except Exception:
-                                file_rel = str(dart_file)
-
-                            violations.append(Violation(
-                                file_path=file_rel,
-                                rule_name='dart_import_rules',
-                                severity=rule_severity,
-                                message=f"Architecture violation: {file_rel} imports '{uri}' - {rule_message} (line {imp['line']})"
-                            ))
+                is_package = ri.uri.startswith('package:')
+                for pattern in cannot_import:
+                    if (ri.resolved_rel and fnmatch(ri.resolved_rel, pattern)) or (
+                        is_package and fnmatch(ri.uri, pattern)
+                    ):
+                        violations.append(Violation(
+                            file_path=ri.file_rel,
+                            rule_name='dart_import_rules',
+                            severity=rule_severity,
+                            message=f"Architecture violation: {ri.file_rel} imports '{ri.uri}' - {rule_message} (line {ri.line})"
+                        ))
 
         violations = self._filter_violations_by_log_level(violations)
 
@@ -118,6 +97,49 @@ class DartImportRulesRule(ProjectWideRule):
 
         return self._ok(violations)
 
+    def _resolve_imports(self, dart_files: list[Path], analyze_dir: Path,
+                         package_name: str | None) -> list[ResolvedImport]:
+        """Parse each file's imports/exports and resolve them relative to analyze_dir."""
+        analyze_dir_resolved = resolve_path(analyze_dir)
+        package_prefix = f'package:{package_name}/' if package_name else None
+        resolved_imports = []
+        sources = dart_source_cache(self.run_cache)
+
+        for dart_file in dart_files:
+            # Relative path from analyze_dir is what the 'from' patterns match against
+            try:
+                rel_path = str(dart_file.relative_to(analyze_dir)).replace('\\', '/')
+            except ValueError:
+                continue
+
+            imports = [imp for imp in parse_imports(dart_file, sources) if imp['type'] in ('import', 'export')]
+            if not imports:
+                continue
+
+            try:
+                file_rel = self._get_relative_path(dart_file)
+            except Exception:
+                file_rel = str(dart_file)
+
+            for imp in imports:
+                uri = imp['uri']
+                import_rel_path = None
+                if uri.startswith('package:'):
+                    if package_prefix and uri.startswith(package_prefix):
+                        import_rel_path = uri[len(package_prefix):]
+                elif not uri.startswith('dart:'):
+                    resolved = resolve_relative_import(uri, dart_file)
+                    if resolved:
+                        with contextlib.suppress(ValueError):
+                            import_rel_path = str(resolved.relative_to(analyze_dir_resolved)).replace('\\', '/')
+
+                resolved_imports.append(ResolvedImport(
+                    file_rel=file_rel, rel_path=rel_path, uri=uri,
+                    resolved_rel=import_rel_path, line=imp['line'],
+                ))
+
+        return resolved_imports
+
     @staticmethod
     def _extract_line(message: str) -> str:
         if '(line ' in message:
@@ -3,11 +3,19 @@ Dart missing dispose analyzer - detects controllers/subscriptions/timers created
 Uses dart-lsp-mcp for accurate type analysis.
 """
 
+from collections.abc import Mapping
 from pathlib import Path
+from types import MappingProxyType
 
 from models import RuleResult, Violation
 from rules.base import ProjectWideRule
-from rules.dart_utils import collect_dart_files
+from rules.context import RuleContext
+from rules.dart_utils import (
+    collect_dart_files,
+    dart_source_cache,
+    get_document_symbols_cached,
+    read_dart_source,
+)
 
 # Optional dependency: dart-lsp-mcp
 try:
@@ -36,6 +44,18 @@ class DartMissingDisposeRule(ProjectWideRule):
 
     rule_name = 'dart_missing_dispose'
 
+    def __init__(self, ctx: RuleContext):
+        super().__init__(ctx)
+        self._disposable_types = self._build_disposable_types()
+
+    def _build_disposable_types(self) -> Mapping[str, str]:
+        """Merge default, configured and custom disposable types into one read-only map."""
+        return MappingProxyType({
+            **DEFAULT_DISPOSABLE_TYPES,
+            **(self.config.get('disposable_types') or {}),
+            **(self.config.get('custom_disposable_types') or {}),
+        })
+
     def _run(self, _file_path: Path) -> RuleResult:
         self.logger.info("\nRunning dart missing dispose check...")
 
@@ -59,15 +79,6 @@ class DartMissingDisposeRule(ProjectWideRule):
         severity_str = self.config.get('severity', 'warning')
         severity = self._map_severity(severity_str)
 
-        # Build disposable types map from config
-        disposable_types = dict(DEFAULT_DISPOSABLE_TYPES)
-        config_types = self.config.get('disposable_types', {})
-        if config_types:
-            disposable_types.update(config_types)
-        custom_types = self.config.get('custom_disposable_types', {})
-        if custom_types:
-            disposable_types.update(custom_types)
-
         all_dart_files = collect_dart_files(analyze_dir, exclude_patterns)
         if not all_dart_files:
             self.logger.info("No Dart files found to analyze")
@@ -77,7 +88,7 @@ class DartMissingDisposeRule(ProjectWideRule):
         self.logger.info(f"Scanning {len(all_dart_files)} files for missing dispose calls...")
 
         for dart_file in all_dart_files:
-            file_violations = self._check_file_dispose(dart_file, disposable_types, severity)
+            file_violations = self._check_file_dispose(dart_file, self._disposable_types, severity)
             violations.extend(file_violations)
 
         violations = self._filter_violations_by_log_level(violations)
@@ -89,12 +100,14 @@ class DartMissingDisposeRule(ProjectWideRule):
 
         return self._ok(violations)
 
-    def _check_file_dispose(self, dart_file: Path, disposable_types: dict, severity) -> list[Violation]:
+    def _check_file_dispose(self, dart_file: Path, disposable_types: Mapping[str, str], severity) -> list[Violation]:
         """Check a single file for fields that need disposal."""
         violations = []
+        source = None
+        source_loaded = False
 
         try:
-            symbols = get_document_symbols(str(dart_file))
+            symbols = get_document_symbols_cached(dart_file, get_document_symbols)
         except Exception as e:
             self.logger.warning(f"Warning: Could not get symbols for {dart_file}: {e}")
             return []
@@ -141,8 +154,14 @@ class DartMissingDisposeRule(ProjectWideRule):
                 if not matched_type:
                     continue
 
+                # Read the file once, and only when a disposable field is found
+                if not source_loaded:
+                    source = self._read_source(dart_file)
+                    source_loaded = True
+
                 # Check if the field is properly disposed
-                disposed = self._is_field_disposed(dart_file, field_name, field_line, field_col, cleanup_method)
+                disposed = self._is_field_disposed(dart_file, field_name, field_line, field_col,
+                                                   cleanup_method, source)
 
                 if not disposed:
                     try:
@@ -159,7 +178,8 @@ class DartMissingDisposeRule(ProjectWideRule):
 
         return violations
 
-    def _is_field_disposed(self, dart_file: Path, field_name: str, field_line: int, field_col: int, cleanup_method: str) -> bool:
+    def _is_field_disposed(self, dart_file: Path, field_name: str, field_line: int, field_col: int,
+                           cleanup_method: str, source: tuple[bytes, list[int]] | None) -> bool:
         """Check if a field has its cleanup method called somewhere."""
         try:
             refs = find_references(str(dart_file), field_line, field_col)
@@ -169,27 +189,44 @@ class DartMissingDisposeRule(ProjectWideRule):
         if not refs:
             return False
 
-        # Read file content to check if any reference includes .dispose()/.cancel()/.close()
-        try:
-            content = dart_file.read_text(encoding='utf-8', errors='replace')
-            lines = content.split('\n')
-        except Exception:
-            return True
+        if source is None:
+            return True  # File unreadable, assume it's ok
+        data, line_offsets = source
+        line_total = len(line_offsets) - 1
+
+        # field.dispose(), field?.dispose(), field!.dispose() (or cancel/close)
+        name = field_name.encode('utf-8')
+        method = cleanup_method.encode('utf-8')
+        needles = (name + b'.' + method, name + b'?.' + method, name + b'!.' + method)
 
         for ref in refs:
             ref_line = ref.get('line', 0)
-            if ref_line <= 0 or ref_line > len(lines):
+            if ref_line <= 0 or ref_line > line_total:
                 continue
-            line_text = lines[ref_line - 1]
-            # Check if this line contains field.dispose() or field.cancel() etc.
-            if f'{field_name}.{cleanup_method}' in line_text:
-                return True
-            # Also check patterns like: field?.dispose(), field!.dispose()
-            if f'{field_name}?.{cleanup_method}' in line_text or f'{field_name}!.{cleanup_method}' in line_text:
+            start, end = line_offsets[ref_line - 1], line_offsets[ref_line]
+            if any(data.find(needle, start, end) != -1 for needle in needles):
                 return True
 
         return False
 
+    def _read_source(self, dart_file: Path) -> tuple[bytes, list[int]] | None:
+        """Read a file as bytes with the start offset of every line.
+
+        The offsets list ends with a len(data) sentinel, so line N (1-based)
+        spans data[offsets[N - 1]:offsets[N]]. Returns None if unreadable.
+        """
+        data = read_dart_source(dart_file, dart_source_cache(self.run_cache))
+        if data is None:
+            return None
+
+        offsets = [0]
+        pos = data.find(b'\n')
+        while pos != -1:
+            offsets.append(pos + 1)
+            pos = data.find(b'\n', pos + 1)
+        offsets.append(len(data))
+        return data, offsets
+
     def _parse_violation_data(self, v: Violation) -> list:
         """Parse violation message back into CSV columns."""
         msg = v.message
@@ -210,13 +247,6 @@ class DartMissingDisposeRule(ProjectWideRule):
             line = line.split(')')[0]
 
         # Determine cleanup method from type
-        all_types = dict(DEFAULT_DISPOSABLE_TYPES)
-        config_types = self.config.get('disposable_types', {})
-        if config_types:
-            all_types.update(config_types)
-        custom_types = self.config.get('custom_disposable_types', {})
-        if custom_types:
-            all_types.update(custom_types)
-        cleanup = all_types.get(field_type, 'dispose')
+        cleanup = self._disposable_types.get(field_type, 'dispose')
 
         return [v.file_path, line, class_name, field_name, field_type, cleanup, v.severity.name]
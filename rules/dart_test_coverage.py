@@ -7,12 +7,18 @@ from pathlib import Path
 
 from models import RuleResult, Severity, Violation
 from rules.base import ProjectWideRule
+from rules.dart_utils import LCOV_LINE_RE
+
+_PCT_RE = re.compile(r'(\d+\.\d+)%')
+_THRESHOLD_RE = re.compile(r'threshold: (\d+)%')
 
 
 class DartTestCoverageRule(ProjectWideRule):
     """Run Flutter tests and check coverage against configurable thresholds."""
 
     rule_name = 'dart_test_coverage'
+    # Writes coverage/lcov.info, which dart_crap_score also produces
+    parallel_safe = False
 
     def _run(self, _file_path: Path) -> RuleResult:
         self.logger.info("\nRunning dart test coverage check...")
@@ -147,23 +153,21 @@ class DartTestCoverageRule(ProjectWideRule):
             self.logger.error(f"Error reading LCOV file: {e}")
             return {}
 
-        for line in content.split('\n'):
-            line = line.strip()
+        for match in LCOV_LINE_RE.finditer(content):
+            source_file, _line_no, hits, end_of_record = match.groups()
 
-            if line.startswith('SF:'):
-                current_file = line[3:]
+            if source_file is not None:
+                current_file = source_file
                 current_total = 0
                 current_covered = 0
-            elif line.startswith('DA:'):
-                parts = line[3:].split(',')
-                if len(parts) >= 2:
-                    current_total += 1
-                    try:
-                        if int(parts[1]) > 0:
-                            current_covered += 1
-                    except ValueError:
-                        pass
-            elif line == 'end_of_record' and current_file:
+            elif hits is not None:
+                current_total += 1
+                try:
+                    if int(hits) > 0:
+                        current_covered += 1
+                except ValueError:
+                    pass
+            elif end_of_record and current_file:
                 # Check exclusions
                 excluded = False
                 for pattern in exclude_patterns:
@@ -200,11 +204,11 @@ class DartTestCoverageRule(ProjectWideRule):
             total = data['total']
             covered = data['covered']
 
-        pct_match = re.search(r'(\d+\.\d+)%', msg)
+        pct_match = _PCT_RE.search(msg)
         if pct_match:
             pct = float(pct_match.group(1))
 
-        threshold_match = re.search(r'threshold: (\d+)%', msg)
+        threshold_match = _THRESHOLD_RE.search(msg)
         if threshold_match:
             threshold = threshold_match.group(1)
 
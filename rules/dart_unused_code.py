@@ -2,11 +2,22 @@
 Dart unused code analyzer - finds unused classes, functions, enums, etc. using dart-lsp-mcp.
 """
 
+import asyncio
+from collections import Counter
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-from models import RuleResult, Violation
+from models import RuleResult, Severity, Violation
 from rules.base import ProjectWideRule
-from rules.dart_utils import collect_dart_files
+from rules.context import RuleContext
+from rules.dart_utils import (
+    build_identifier_index,
+    collect_dart_files,
+    dart_source_cache,
+    get_document_symbols_cached,
+    get_document_symbols_cached_async,
+)
 
 # Optional dependency: dart-lsp-mcp
 try:
@@ -15,12 +26,33 @@ try:
 except ImportError:
     HAS_DART_LSP = False
 
+# Batched reference queries (one round trip per file) in newer dart-lsp-mcp versions
+try:
+    from dart_lsp_watcher.api import find_references_batch
+except ImportError:
+    find_references_batch = None
+
+# Async client API: symbol and reference queries can be pipelined on one event loop
+try:
+    from dart_lsp_watcher.api import find_references_async, get_document_symbols_async
+except ImportError:
+    find_references_async = None
+    get_document_symbols_async = None
+
+# Concurrent LSP queries; kept modest so the language server is not flooded.
+DEFAULT_MAX_WORKERS = 4
+
 
 class DartUnusedCodeRule(ProjectWideRule):
     """Find unused classes, functions, enums, mixins, typedefs, extensions across the project using LSP."""
 
     rule_name = 'dart_unused_code'
 
+    def __init__(self, ctx: RuleContext):
+        super().__init__(ctx)
+        self._identifier_index: dict[Path, set[str]] = {}
+        self._identifier_file_counts: Counter[str] = Counter()
+
     def _run(self, _file_path: Path) -> RuleResult:
         self.logger.info("\nRunning dart unused code check...")
 
@@ -50,77 +82,212 @@ class DartUnusedCodeRule(ProjectWideRule):
             self.logger.info("No Dart files found to analyze")
             return self._skipped("no Dart files found to analyze")
 
+        if self.config.get('use_identifier_index', True):
+            self._build_identifier_index(project_root, all_dart_files, exclude_patterns)
+
+        max_workers = max(1, int(self.config.get('max_workers', DEFAULT_MAX_WORKERS)))
+        self.logger.info(f"Scanning {len(all_dart_files)} files for unused code...")
+
+        if get_document_symbols_async is not None and find_references_async is not None:
+            # Pipeline symbol and reference queries; results come back in file order.
+            scans = asyncio.run(self._scan_files_async(all_dart_files, ignore_names, severity, max_workers))
+            return self._report(scans)
+
+        # LSP queries are IPC-bound, so overlap them across files with threads.
+        # executor.map keeps results in file order for deterministic output.
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return self._report(executor.map(lambda f: self._scan_file(f, ignore_names, severity), all_dart_files))
+
+    def _report(self, scans: Iterable[tuple[list[Violation], int, int]]) -> RuleResult:
+        """Combine per-file scan results into the rule result."""
         violations = []
         total_symbols = 0
         checked_symbols = 0
+        for file_violations, file_total, file_checked in scans:
+            violations.extend(file_violations)
+            total_symbols += file_total
+            checked_symbols += file_checked
 
-        self.logger.info(f"Scanning {len(all_dart_files)} files for unused code...")
+        violations = self._filter_violations_by_log_level(violations)
+
+        if violations:
+            self.logger.info(f"Dart unused code found {len(violations)} unused declaration(s) (checked {checked_symbols}/{total_symbols} symbols)")
+        else:
+            self.logger.info(f"Dart unused code: No unused declarations found (checked {checked_symbols}/{total_symbols} symbols)")
+
+        return self._ok(violations)
+
+    def _scan_file(self, dart_file: Path, ignore_names: set[str],
+                   severity: Severity) -> tuple[list[Violation], int, int]:
+        """Check one file's top-level symbols for references.
+
+        Returns:
+            Tuple of (violations, total top-level symbols, symbols checked)
+        """
+        try:
+            symbols = get_document_symbols_cached(dart_file, get_document_symbols)
+        except Exception as e:
+            self.logger.warning(f"Warning: Could not get symbols for {dart_file}: {e}")
+            return [], 0, 0
+
+        candidates = self._collect_candidates(symbols, ignore_names)
+        candidates_total = len(candidates)
+        pre_checked, candidates = self._split_by_identifier_index(dart_file, candidates)
+
+        all_refs = self._batch_find_references(dart_file, [(line, col) for _, _, line, col in candidates])
+        violations, checked_symbols = self._violations_from_refs(dart_file, candidates, all_refs, severity)
+        return violations, candidates_total, pre_checked + checked_symbols
+
+    async def _scan_files_async(self, dart_files: list[Path], ignore_names: set[str], severity: Severity,
+                                max_concurrent: int) -> list[tuple[list[Violation], int, int]]:
+        """Scan all files on one event loop, with at most max_concurrent LSP queries in flight."""
+        semaphore = asyncio.Semaphore(max_concurrent)
+        return await asyncio.gather(*(
+            self._scan_file_async(dart_file, ignore_names, severity, semaphore) for dart_file in dart_files
+        ))
 
-        for dart_file in all_dart_files:
+    async def _scan_file_async(self, dart_file: Path, ignore_names: set[str], severity: Severity,
+                               semaphore: asyncio.Semaphore) -> tuple[list[Violation], int, int]:
+        """Async counterpart of _scan_file: a file's reference queries are issued together."""
+        try:
+            async with semaphore:
+                symbols = await get_document_symbols_cached_async(dart_file, get_document_symbols_async)
+        except Exception as e:
+            self.logger.warning(f"Warning: Could not get symbols for {dart_file}: {e}")
+            return [], 0, 0
+
+        candidates = self._collect_candidates(symbols, ignore_names)
+        candidates_total = len(candidates)
+        pre_checked, candidates = self._split_by_identifier_index(dart_file, candidates)
+
+        async def references(line: int, col: int) -> list[dict] | None:
             try:
-                symbols = get_document_symbols(str(dart_file))
-            except Exception as e:
-                self.logger.warning(f"Warning: Could not get symbols for {dart_file}: {e}")
+                async with semaphore:
+                    return await find_references_async(str(dart_file), line, col) or []
+            except Exception:
+                return None
+
+        all_refs = await asyncio.gather(*(references(line, col) for _, _, line, col in candidates))
+        violations, checked_symbols = self._violations_from_refs(dart_file, candidates, all_refs, severity)
+        return violations, candidates_total, pre_checked + checked_symbols
+
+    @staticmethod
+    def _collect_candidates(symbols: list[dict] | None, ignore_names: set[str]) -> list[tuple[str, str, int, int]]:
+        """Collect the top-level public declarations as (name, kind, line, col)."""
+        candidates = []
+        for symbol in symbols or []:
+            name = symbol.get('name', '')
+            kind = symbol.get('kind', '')
+
+            # Skip private symbols (start with _), ignored names, and constructors
+            if name.startswith('_') or name in ignore_names:
                 continue
 
-            if not symbols:
+            # Only check top-level declarations
+            if kind not in ('class', 'function', 'enum', 'mixin', 'typedef', 'extension', 'topLevelVariable'):
                 continue
 
-            for symbol in symbols:
-                name = symbol.get('name', '')
-                kind = symbol.get('kind', '')
-                line = symbol.get('line', 0)
-                col = symbol.get('col', symbol.get('column', 0))
+            line = symbol.get('line', 0)
+            col = symbol.get('col', symbol.get('column', 0))
+            candidates.append((name, kind, line, col))
+        return candidates
+
+    def _split_by_identifier_index(self, dart_file: Path, candidates: list) -> tuple[int, list]:
+        """Split off candidates whose name appears in another file.
 
-                # Skip private symbols (start with _), ignored names, and constructors
-                if name.startswith('_') or name in ignore_names:
-                    continue
+        Such names are treated as used without an LSP round trip; only the
+        remaining (ambiguous) symbols need a reference query.
 
-                # Only check top-level declarations
-                if kind not in ('class', 'function', 'enum', 'mixin', 'typedef', 'extension', 'topLevelVariable'):
-                    continue
+        Returns:
+            Tuple of (number of candidates settled by the index, ambiguous candidates)
+        """
+        own_identifiers = self._identifier_index.get(dart_file, set())
+        settled = 0
+        ambiguous = []
+        for candidate in candidates:
+            name = candidate[0]
+            if self._identifier_file_counts[name] > (1 if name in own_identifiers else 0):
+                settled += 1
+            else:
+                ambiguous.append(candidate)
+        return settled, ambiguous
 
-                total_symbols += 1
+    def _violations_from_refs(self, dart_file: Path, candidates: list, all_refs: list[list[dict] | None],
+                              severity: Severity) -> tuple[list[Violation], int]:
+        """Report candidates with no reference besides their declaration.
 
+        Returns:
+            Tuple of (violations, number of candidates whose query succeeded)
+        """
+        decl_file = str(dart_file)
+        violations = []
+        checked_symbols = 0
+        for (name, kind, line, _col), refs in zip(candidates, all_refs, strict=True):
+            if refs is None:
+                continue
+
+            checked_symbols += 1
+
+            # Any reference other than the declaration itself is a usage; stop at the first
+            used = any(
+                ref.get('file', '') != decl_file or ref.get('line', 0) != line
+                for ref in refs
+            )
+
+            if not used:
                 try:
-                    refs = find_references(str(dart_file), line, col)
+                    rel_path = self._get_relative_path(dart_file)
                 except Exception:
-                    continue
-
-                checked_symbols += 1
-
-                # Filter out the declaration itself - only count usages
-                usage_count = 0
-                if refs:
-                    for ref in refs:
-                        ref_file = ref.get('file', '')
-                        ref_line = ref.get('line', 0)
-                        # Skip the declaration itself
-                        if ref_file == str(dart_file) and ref_line == line:
-                            continue
-                        usage_count += 1
-
-                if usage_count == 0:
-                    try:
-                        rel_path = self._get_relative_path(dart_file)
-                    except Exception:
-                        rel_path = str(dart_file)
-
-                    violations.append(Violation(
-                        file_path=rel_path,
-                        rule_name='dart_unused_code',
-                        severity=severity,
-                        message=f"Unused {kind} '{name}' declared at line {line} - no references found in project"
-                    ))
+                    rel_path = str(dart_file)
 
-        violations = self._filter_violations_by_log_level(violations)
+                violations.append(Violation(
+                    file_path=rel_path,
+                    rule_name='dart_unused_code',
+                    severity=severity,
+                    message=f"Unused {kind} '{name}' declared at line {line} - no references found in project"
+                ))
 
-        if violations:
-            self.logger.info(f"Dart unused code found {len(violations)} unused declaration(s) (checked {checked_symbols}/{total_symbols} symbols)")
-        else:
-            self.logger.info(f"Dart unused code: No unused declarations found (checked {checked_symbols}/{total_symbols} symbols)")
+        return violations, checked_symbols
 
-        return self._ok(violations)
+    def _build_identifier_index(self, project_root: Path, dart_files: list[Path],
+                                exclude_patterns: list[str]) -> None:
+        """Index identifiers of the analyzed files (and test/ if configured)."""
+        index_files = list(dart_files)
+        if self.config.get('scan_test_references', True):
+            index_files.extend(collect_dart_files(project_root / 'test', exclude_patterns))
+        self._identifier_index = build_identifier_index(index_files, dart_source_cache(self.run_cache))
+        self._identifier_file_counts = Counter(
+            name for identifiers in self._identifier_index.values() for name in identifiers
+        )
+
+    @staticmethod
+    def _batch_find_references(dart_file: Path, positions: list[tuple[int, int]]) -> list[list[dict] | None]:
+        """Find references for several positions in one file.
+
+        Uses dart-lsp-mcp's batched query when available (one round trip per
+        file), otherwise queries each position in turn.
+
+        Returns:
+            One entry per position: the reference list, or None if the query failed
+        """
+        if not positions:
+            return []
+
+        if find_references_batch is not None:
+            try:
+                batch = [refs or [] for refs in find_references_batch(str(dart_file), positions)]
+                if len(batch) == len(positions):
+                    return batch
+            except Exception:
+                pass  # Fall back to per-symbol queries
+
+        results: list[list[dict] | None] = []
+        for line, col in positions:
+            try:
+                results.append(find_references(str(dart_file), line, col) or [])
+            except Exception:
+                results.append(None)
+        return results
 
     @staticmethod
     def _extract_line(message: str) -> str:
@@ -2,13 +2,14 @@
 Dart unused dependencies analyzer - finds packages in pubspec.yaml never imported in code.
 """
 
+import re
 from pathlib import Path
 
-import yaml
-
 from models import RuleResult, Violation
 from rules.base import ProjectWideRule
-from rules.dart_utils import collect_dart_files, parse_imports
+from rules.dart_utils import collect_dart_files, dart_source_cache, load_yaml, parse_imports
+
+_PACKAGE_NAME_RE = re.compile(r'package:([^/]+)')
 
 
 class DartUnusedDependenciesRule(ProjectWideRule):
@@ -27,7 +28,7 @@ class DartUnusedDependenciesRule(ProjectWideRule):
         pubspec_path = project_root / 'pubspec.yaml'
         try:
             with open(pubspec_path, encoding='utf-8') as f:
-                pubspec_data = yaml.safe_load(f)
+                pubspec_data = load_yaml(f)
         except Exception as e:
             self.logger.error(f"Error reading pubspec.yaml: {e}")
             return self._failed(f"error parsing pubspec.yaml: {e}")
@@ -54,27 +55,33 @@ class DartUnusedDependenciesRule(ProjectWideRule):
         deps_to_check = {name for name in deps if name not in ignore_packages}
         dev_deps_to_check = {name for name in dev_deps if name not in ignore_packages} if check_dev else set()
 
-        # Scan source files for package imports
-        def collect_used_packages(paths: list[str]) -> set[str]:
+        # Scan source files for package imports, stopping once every target is seen
+        sources = dart_source_cache(self.run_cache)
+
+        def collect_used_packages(paths: list[str], targets: set[str]) -> set[str]:
             used = set()
+            if not targets:
+                return used
             for scan_path in paths:
                 scan_dir = project_root / scan_path
                 if not scan_dir.exists():
                     continue
                 for dart_file in collect_dart_files(scan_dir):
-                    for imp in parse_imports(dart_file):
-                        uri = imp['uri']
-                        if uri.startswith('package:'):
-                            # Extract package name: package:foo/bar.dart -> foo
-                            pkg_name = uri.split(':')[1].split('/')[0]
-                            used.add(pkg_name)
+                    for imp in parse_imports(dart_file, sources):
+                        # Extract package name: package:foo/bar.dart -> foo
+                        match = _PACKAGE_NAME_RE.match(imp['uri'])
+                        if match:
+                            used.add(match.group(1))
+                    if targets <= used:
+                        return used
             return used
 
         dep_scan_paths = scan_paths.get('dependencies', ['lib'])
         dev_scan_paths = scan_paths.get('dev_dependencies', ['test', 'integration_test'])
 
-        used_in_lib = collect_used_packages(dep_scan_paths)
-        used_in_test = collect_used_packages(dev_scan_paths) if check_dev else set()
+        # A dev dependency imported from lib also counts as used, so lib looks for both
+        used_in_lib = collect_used_packages(dep_scan_paths, deps_to_check | dev_deps_to_check)
+        used_in_test = collect_used_packages(dev_scan_paths, dev_deps_to_check - used_in_lib) if check_dev else set()
 
         violations = []
         severity = self._map_severity(severity_str)
@@ -9,13 +9,41 @@ from models import RuleResult, Severity, Violation
 from rules.base import ProjectWideRule
 from rules.dart_utils import (
     collect_dart_files,
+    dart_source_cache,
     get_package_name,
     parse_imports,
     resolve_package_import,
+    resolve_path,
     resolve_relative_import,
 )
 
 
+class _ImportGraph:
+    """Directed import graph over integer node ids, one per resolved file path.
+
+    Keeps Path hashing out of the traversal: paths are interned to ids once
+    and edges are plain int adjacency lists.
+    """
+
+    def __init__(self):
+        self.ids: dict[Path, int] = {}
+        self.paths: list[Path] = []
+        self.edges: list[list[int]] = []
+
+    def node(self, path: Path) -> int:
+        """Return the id for a path, adding a new node on first sight."""
+        node_id = self.ids.get(path)
+        if node_id is None:
+            node_id = len(self.paths)
+            self.ids[path] = node_id
+            self.paths.append(path)
+            self.edges.append([])
+        return node_id
+
+    def add_edge(self, source: int, target: int) -> None:
+        self.edges[source].append(target)
+
+
 class DartUnusedFilesRule(ProjectWideRule):
     """Find .dart files that are never imported/exported by any other file in the project."""
 
@@ -46,75 +74,66 @@ class DartUnusedFilesRule(ProjectWideRule):
             self.logger.info("No Dart files found to analyze")
             return self._skipped("no Dart files found to analyze")
 
-        # Build import graph: file -> set of files it imports
-        import_graph: dict[Path, set[Path]] = {}
+        # Build import graph over integer node ids; lib files take ids 0..lib_count-1
+        # (fewer than the files listed when several resolve to one file, e.g. symlinks)
+        graph = _ImportGraph()
         for dart_file in all_dart_files:
-            resolved = dart_file.resolve()
-            import_graph[resolved] = set()
-            for imp in parse_imports(dart_file):
+            graph.node(resolve_path(dart_file))
+        lib_count = len(graph.paths)
+
+        sources = dart_source_cache(self.run_cache)
+        for dart_file in all_dart_files:
+            source = graph.ids[resolve_path(dart_file)]
+            for imp in parse_imports(dart_file, sources):
                 if imp['type'] in ('import', 'export', 'part'):
-                    target = None
-                    if imp['uri'].startswith('package:') and package_name:
-                        target = resolve_package_import(imp['uri'], package_name, project_root)
-                    elif not imp['uri'].startswith('dart:') and not imp['uri'].startswith('package:'):
-                        target = resolve_relative_import(imp['uri'], dart_file)
+                    target = self._resolve_target(imp['uri'], dart_file, package_name, project_root)
                     if target:
-                        import_graph[resolved].add(target.resolve())
+                        graph.add_edge(source, graph.node(resolve_path(target)))
 
-        # Optionally scan test/ directory for imports
+        # Optionally scan test/ directory once: lib files imported by tests count as used
+        test_targets = []
         if include_test_imports:
             test_dir = project_root / 'test'
             if test_dir.exists():
                 test_files = collect_dart_files(test_dir, exclude_patterns)
                 for dart_file in test_files:
-                    for imp in parse_imports(dart_file):
-                        target = None
-                        if imp['uri'].startswith('package:') and package_name:
-                            target = resolve_package_import(imp['uri'], package_name, project_root)
-                        elif not imp['uri'].startswith('dart:') and not imp['uri'].startswith('package:'):
-                            target = resolve_relative_import(imp['uri'], dart_file)
+                    for imp in parse_imports(dart_file, sources):
+                        target = self._resolve_target(imp['uri'], dart_file, package_name, project_root)
                         if target:
-                            resolved_target = target.resolve()
-                            if resolved_target in import_graph:
-                                # Mark as imported by adding a synthetic entry
-                                if dart_file.resolve() not in import_graph:
-                                    import_graph[dart_file.resolve()] = set()
-                                import_graph[dart_file.resolve()].add(resolved_target)
+                            target_id = graph.ids.get(resolve_path(target))
+                            if target_id is not None and target_id < lib_count:
+                                test_targets.append(target_id)
 
         # BFS from entry points to find reachable files
-        entry_files = set()
+        entry_ids = set()
         for ep in entry_points_cfg:
-            ep_path = (project_root / ep).resolve()
+            ep_path = resolve_path(project_root / ep)
             if ep_path.exists():
-                entry_files.add(ep_path)
+                entry_ids.add(graph.node(ep_path))
 
         # If no entry points exist, skip analysis
-        if not entry_files:
+        if not entry_ids:
             self.logger.warning("Warning: No entry points found, skipping unused files check")
             return self._skipped("no entry points found")
 
-        reachable = set()
-        queue = deque(entry_files)
+        # Nodes are marked when enqueued, so each id enters the queue at most once
+        reachable = bytearray(len(graph.paths))
+        queue = deque(entry_ids)
+        for entry_id in entry_ids:
+            reachable[entry_id] = 1
+        edges = graph.edges
         while queue:
-            current = queue.popleft()
-            if current in reachable:
-                continue
-            reachable.add(current)
-            for target in import_graph.get(current, set()):
-                if target not in reachable:
+            for target in edges[queue.popleft()]:
+                if not reachable[target]:
+                    reachable[target] = 1
                     queue.append(target)
 
         # Also consider reverse: files imported by test files are reachable
-        if include_test_imports:
-            test_dir = project_root / 'test'
-            if test_dir.exists():
-                for dart_file in collect_dart_files(test_dir, exclude_patterns):
-                    for target in import_graph.get(dart_file.resolve(), set()):
-                        reachable.add(target)
+        for target in test_targets:
+            reachable[target] = 1
 
         # Find unreachable files within analyze_dir
-        all_resolved = {f.resolve() for f in all_dart_files}
-        unreachable = all_resolved - reachable
+        unreachable = [graph.paths[i] for i in range(lib_count) if not reachable[i]]
 
         violations = []
         for unreachable_file in sorted(unreachable):
@@ -138,3 +157,13 @@ class DartUnusedFilesRule(ProjectWideRule):
             self.logger.info("Dart unused files: No unused files found")
 
         return self._ok(violations)
+
+    @staticmethod
+    def _resolve_target(uri: str, importing_file: Path, package_name: str | None,
+                        project_root: Path) -> Path | None:
+        """Resolve a directive URI to a local file, or None for SDK/external/missing."""
+        if uri.startswith('package:'):
+            return resolve_package_import(uri, package_name, project_root) if package_name else None
+        if uri.startswith('dart:'):
+            return None
+        return resolve_relative_import(uri, importing_file)
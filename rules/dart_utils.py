@@ -2,11 +2,44 @@
 Shared Dart/Flutter utilities for import parsing and file collection.
 """
 
+import fnmatch
+import functools
+import os
 import re
+from collections.abc import Awaitable, Callable, Iterator
 from pathlib import Path
 
 import yaml
 
+try:
+    from yaml import CSafeLoader as _YamlSafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _YamlSafeLoader
+
+# Optional dependency: google-re2 (DFA-based, no backtracking) for the directive scan
+try:
+    import re2 as _directive_re_module
+except ImportError:
+    _directive_re_module = re
+
+# Inline (?m) rather than re.MULTILINE so the pattern compiles under both engines
+_DIRECTIVE_RE = _directive_re_module.compile(rb"(?m)^\s*(import|export|part)\s+'([^']+)'\s*;")
+_IDENTIFIER_RE = re.compile(rb'[A-Za-z_$][A-Za-z0-9_$]*')
+
+# LCOV lines the coverage readers use: groups are (SF: path, DA: line, DA: hits, end_of_record).
+# Iterate with finditer so other record types (FN:, BRDA:, LF:, ...) are skipped inside the
+# regex engine instead of being split, stripped and compared one by one in Python.
+LCOV_LINE_RE = re.compile(
+    r'^[ \t]*(?:SF:(.*?)|DA:([^,\r\n]*),([^,\r\n]*)(?:,[^\r\n]*)?|(end_of_record))[ \t\r]*$', re.MULTILINE)
+
+# Document symbols keyed by (path, mtime_ns, size); shared by every Dart rule in the run
+_SYMBOL_CACHE: dict[tuple[str, int, int], list] = {}
+
+
+def load_yaml(stream):
+    """yaml.safe_load() using the libyaml-backed loader when it is available."""
+    return yaml.load(stream, Loader=_YamlSafeLoader)
+
 
 def get_package_name(project_root: Path) -> str | None:
     """Read the package name from pubspec.yaml.
@@ -22,39 +55,88 @@ def get_package_name(project_root: Path) -> str | None:
         return None
     try:
         with open(pubspec_path, encoding='utf-8') as f:
-            data = yaml.safe_load(f)
+            data = load_yaml(f)
         return data.get('name') if data else None
     except Exception:
         return None
 
 
-def parse_imports(file_path: Path) -> list[dict]:
+def dart_source_cache(run_cache: dict) -> dict:
+    """Return the read_dart_source cache kept in an analyzer run's run_cache."""
+    return run_cache.setdefault('dart_sources', {})
+
+
+def read_dart_source(file_path: Path, sources: dict | None = None) -> bytes | None:
+    """Read a file's raw bytes, reusing the copy in ``sources`` while the file is unchanged.
+
+    ``sources`` is the run's dart_source_cache, so Dart rules in one analyzer
+    run share one read per file. Entries are checked against the file's
+    mtime and size and replaced when it changes; failed reads are not cached.
+    Without ``sources`` the file is simply read.
+
+    Args:
+        file_path: Path to the .dart file
+        sources: Per-run cache of {path: (mtime_ns, size, bytes)}
+
+    Returns:
+        File contents, or None if the file cannot be read
+    """
+    try:
+        if sources is None:
+            with open(file_path, 'rb') as f:
+                return f.read()
+        stat = os.stat(file_path)
+        key = str(file_path)
+        cached = sources.get(key)
+        if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+            return cached[2]
+        with open(file_path, 'rb') as f:
+            data = f.read()
+    except OSError:
+        return None
+    sources[key] = (stat.st_mtime_ns, stat.st_size, data)
+    return data
+
+
+def parse_imports(file_path: Path, sources: dict | None = None) -> list[dict]:
     """Parse import/export/part statements from a Dart file.
 
     Args:
         file_path: Path to the .dart file
+        sources: Optional per-run source cache (see read_dart_source)
 
     Returns:
         List of dicts with keys: type ('import'|'export'|'part'), uri, line
     """
     results = []
-    pattern = re.compile(
-        r"^\s*(import|export|part)\s+'([^']+)'\s*;", re.MULTILINE
-    )
-    try:
-        content = file_path.read_text(encoding='utf-8', errors='replace')
-    except Exception:
+    content = read_dart_source(file_path, sources)
+    if content is None:
         return results
 
-    for match in pattern.finditer(content):
-        stmt_type = match.group(1)
-        uri = match.group(2)
-        line = content[:match.start()].count('\n') + 1
-        results.append({'type': stmt_type, 'uri': uri, 'line': line})
+    # Line numbers are counted incrementally between matches rather than by
+    # rescanning the file prefix for every directive.
+    line = 1
+    last_pos = 0
+    for match in _DIRECTIVE_RE.finditer(content):
+        # Count up to the keyword itself: the leading \s* can swallow blank lines
+        keyword_pos = match.start(1)
+        line += content.count(b'\n', last_pos, keyword_pos)
+        last_pos = keyword_pos
+        results.append({
+            'type': match.group(1).decode('ascii'),
+            'uri': match.group(2).decode('utf-8', errors='replace'),
+            'line': line,
+        })
 
     return results
 
 
+@functools.lru_cache(maxsize=None)
+def resolve_path(path: Path) -> Path:
+    """Memoized Path.resolve(); each call otherwise stats every path component."""
+    return path.resolve()
+
+
 def resolve_package_import(uri: str, package_name: str, project_root: Path) -> Path | None:
     """Resolve a package: import URI to a local file path.
 
@@ -88,7 +170,7 @@ def resolve_relative_import(uri: str, importing_file: Path) -> Path | None:
     """
     if uri.startswith('dart:') or uri.startswith('package:'):
         return None
-    resolved = (importing_file.parent / uri).resolve()
+    resolved = resolve_path(importing_file.parent / uri)
     return resolved if resolved.exists() else None
 
 
@@ -105,16 +187,129 @@ def collect_dart_files(directory: Path, exclude_patterns: list[str] | None = Non
     if not directory.exists():
         return []
 
-    exclude_patterns = exclude_patterns or []
+    name_re, path_patterns = _compile_exclude_patterns(exclude_patterns or [])
     files = []
 
-    for dart_file in directory.rglob('*.dart'):
-        excluded = False
-        for pattern in exclude_patterns:
-            if dart_file.match(pattern):
-                excluded = True
-                break
-        if not excluded:
-            files.append(dart_file)
+    for entry in _walk_dart_entries(str(directory)):
+        if name_re and name_re.match(entry.name):
+            continue
+        dart_file = Path(entry.path)
+        if any(dart_file.match(pattern) for pattern in path_patterns):
+            continue
+        files.append(dart_file)
 
     return sorted(files)
+
+
+def _walk_dart_entries(directory: str) -> Iterator[os.DirEntry]:
+    """Yield DirEntry objects for *.dart files below directory.
+
+    Uses os.scandir so directory entries are typed from the readdir result
+    instead of a stat per path. Symlinked directories are not descended
+    into, matching Path.rglob.
+    """
+    try:
+        with os.scandir(directory) as it:
+            subdirs = []
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                elif entry.name.endswith('.dart'):
+                    yield entry
+    except OSError:
+        return
+    for subdir in subdirs:
+        yield from _walk_dart_entries(subdir)
+
+
+def _compile_exclude_patterns(exclude_patterns: list[str]) -> tuple[re.Pattern | None, list[str]]:
+    """Split exclude globs into one combined file-name regex plus path globs.
+
+    Slash-free patterns (the common '*.g.dart' kind) only ever match the file
+    name, so they are OR'd into a single regex. Patterns containing a '/' keep
+    Path.match semantics.
+
+    Returns:
+        Tuple of (combined name regex or None, remaining path patterns)
+    """
+    name_patterns = [p for p in exclude_patterns if '/' not in p and '\\' not in p]
+    path_patterns = [p for p in exclude_patterns if p not in name_patterns]
+    if not name_patterns:
+        return None, path_patterns
+    # Path.match is case-insensitive on Windows; mirror that
+    flags = re.IGNORECASE if os.name == 'nt' else 0
+    combined = '|'.join(f'(?:{fnmatch.translate(p)})' for p in name_patterns)
+    return re.compile(combined, flags), path_patterns
+
+
+def build_identifier_index(files: list[Path], sources: dict | None = None) -> dict[Path, set[str]]:
+    """Collect the set of identifier-like tokens appearing in each file.
+
+    A purely textual scan (comments and strings included), so presence of a
+    name is a cheap over-approximation of "referenced in this file".
+
+    Args:
+        files: Dart files to index
+        sources: Optional per-run source cache (see read_dart_source)
+
+    Returns:
+        Dict mapping each readable file to the identifiers it contains
+    """
+    index = {}
+    for file_path in files:
+        data = read_dart_source(file_path, sources)
+        if data is None:
+            continue
+        # Identifiers are ASCII, so scan the raw bytes and decode only the distinct tokens
+        index[file_path] = {token.decode('ascii') for token in set(_IDENTIFIER_RE.findall(data))}
+    return index
+
+
+def get_document_symbols_cached(file_path: Path, fetch: Callable[[str], list]) -> list:
+    """Return LSP document symbols for a file, reusing results for unchanged files.
+
+    Entries are keyed by path, modification time and size, so an edited file
+    is queried again. Errors from ``fetch`` propagate and are not cached.
+
+    Args:
+        file_path: Path to the .dart file
+        fetch: The LSP query, e.g. dart_lsp_watcher.api.get_document_symbols
+
+    Returns:
+        The symbol list returned by ``fetch``
+    """
+    key = _symbol_cache_key(file_path)
+    symbols = _SYMBOL_CACHE.get(key) if key else None
+    if symbols is None:
+        symbols = fetch(str(file_path))
+        if key and symbols is not None:
+            _SYMBOL_CACHE[key] = symbols
+    return symbols
+
+
+async def get_document_symbols_cached_async(file_path: Path, fetch: Callable[[str], Awaitable[list]]) -> list:
+    """Async counterpart of get_document_symbols_cached, sharing its cache.
+
+    Args:
+        file_path: Path to the .dart file
+        fetch: The async LSP query, e.g. dart_lsp_watcher.api.get_document_symbols_async
+
+    Returns:
+        The symbol list returned by ``fetch``
+    """
+    key = _symbol_cache_key(file_path)
+    symbols = _SYMBOL_CACHE.get(key) if key else None
+    if symbols is None:
+        symbols = await fetch(str(file_path))
+        if key and symbols is not None:
+            _SYMBOL_CACHE[key] = symbols
+    return symbols
+
+
+def _symbol_cache_key(file_path: Path) -> tuple[str, int, int] | None:
+    """_SYMBOL_CACHE key of a file, or None when it cannot be stat'ed (not cached)."""
+    try:
+        stat = file_path.stat()
+    except OSError:
+        return None
+    return str(file_path), stat.st_mtime_ns, stat.st_size
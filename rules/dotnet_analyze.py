@@ -2,6 +2,7 @@
 
 import csv
 import re
+from collections.abc import Iterable
 from pathlib import Path
 
 from models import RuleResult, Severity, Violation
@@ -21,6 +22,9 @@ class DotnetAnalyzeRule(ProjectWideRule):
         re.IGNORECASE
     )
 
+    # Suffix appended by _parse_msbuild_output: " (CS0168) at line 10, column 5"
+    MESSAGE_SUFFIX_PATTERN = re.compile(r'\s*\((?P<code>\w+)\) at line \d+, column \d+$')
+
     def _run(self, _file_path: Path) -> RuleResult:
         self.logger.info("\nRunning dotnet build analysis...")
 
@@ -51,22 +55,11 @@ class DotnetAnalyzeRule(ProjectWideRule):
             cmd.append(target_path)
 
         try:
-            result = self._run_subprocess(cmd, self.base_path)
-
-            # Combine stdout and stderr - MSBuild outputs to both
-            output = result.stdout + '\n' + result.stderr
-
-            violations = self._parse_msbuild_output(output)
-
-            # Filter by ignore_codes config
-            ignore_codes = self.config.get('ignore_codes', [])
-            if ignore_codes:
-                violations = [v for v in violations if not any(code in v.message for code in ignore_codes)]
-
-            violations = self._filter_violations_by_log_level(violations)
-
-            if self.max_errors and len(violations) > self.max_errors:
-                violations = violations[:self.max_errors]
+            # Parse diagnostics as MSBuild emits them; it writes to both
+            # stdout and stderr, which the stream merges.
+            # Leaving the block stops the build early once max_errors is reached.
+            with self._stream_subprocess(cmd, self.base_path) as proc:
+                violations = self._parse_msbuild_output(proc.stdout, self.max_errors)
 
             if violations:
                 self.logger.info(f"Dotnet build found {len(violations)} issue(s)")
@@ -97,14 +90,16 @@ class DotnetAnalyzeRule(ProjectWideRule):
         else:
             return Severity.INFO
 
-    def _parse_msbuild_output(self, output: str) -> list[Violation]:
-        """Parse MSBuild diagnostic output into violations."""
-        violations = []
+    def _parse_msbuild_output(self, lines: Iterable[str], max_errors: int | None = None) -> list[Violation]:
+        """Parse MSBuild diagnostic output lines into violations.
 
-        if not output or not output.strip():
-            return violations
+        Diagnostics matching `ignore_codes` or below the log level are dropped
+        as they are parsed; parsing stops once `max_errors` violations are kept.
+        """
+        violations = []
+        ignore_codes = self.config.get('ignore_codes', [])
 
-        for line in output.split('\n'):
+        for line in lines:
             line = line.strip()
             match = self.MSBUILD_PATTERN.match(line)
             if match:
@@ -115,22 +110,32 @@ class DotnetAnalyzeRule(ProjectWideRule):
                 code = match.group('code')
                 message = match.group('message')
 
+                severity = self._map_severity(severity_str)
+                if not self._log_level_accepts(severity):
+                    continue
+
+                # Build detailed message
+                detailed_message = f"{message} ({code}) at line {line_num}, column {col_num}"
+                if any(ignored in detailed_message for ignored in ignore_codes):
+                    continue
+
                 # Get relative path
                 try:
                     rel_path = self._get_relative_path(Path(file_path))
                 except Exception:
                     rel_path = file_path
 
-                # Build detailed message
-                detailed_message = f"{message} ({code}) at line {line_num}, column {col_num}"
-
                 violation = Violation(
                     file_path=rel_path,
                     rule_name='dotnet_analyze',
-                    severity=self._map_severity(severity_str),
-                    message=detailed_message
+                    severity=severity,
+                    message=detailed_message,
+                    line=int(line_num),
+                    column=int(col_num)
                 )
                 violations.append(violation)
+                if max_errors and len(violations) >= max_errors:
+                    break
 
         return violations
 
@@ -145,21 +150,14 @@ class DotnetAnalyzeRule(ProjectWideRule):
                 writer.writerow(['file', 'line', 'column', 'severity', 'code', 'message'])
 
                 for v in violations:
-                    # Parse message to extract components
-                    msg = v.message
-                    code_match = re.search(r'\((\w+)\)', msg)
-                    code = code_match.group(1) if code_match else ''
-
-                    line_match = re.search(r'at line (\d+)', msg)
-                    line = line_match.group(1) if line_match else ''
-
-                    col_match = re.search(r'column (\d+)', msg)
-                    col = col_match.group(1) if col_match else ''
-
-                    # Remove parsed parts from message for cleaner output
-                    clean_msg = re.sub(r'\s*\(\w+\)\s*at line \d+, column \d+', '', msg).strip()
-
-                    writer.writerow([v.file_path, line, col, v.severity.value, code, clean_msg])
+                    # Line/column are carried on the violation; split the code off the message
+                    suffix = self.MESSAGE_SUFFIX_PATTERN.search(v.message)
+                    code = suffix.group('code') if suffix else ''
+                    clean_msg = v.message[:suffix.start()] if suffix else v.message
+                    line = v.line if v.line is not None else ''
+                    col = v.column if v.column is not None else ''
+
+                    writer.writerow([v.file_path, line, col, v.severity.value, code, clean_msg.strip()])
 
             self.logger.info(f"Dotnet analyze report saved to: {output_file}")
 
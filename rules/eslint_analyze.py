@@ -3,12 +3,17 @@ ESLint analyze rule for JavaScript/TypeScript code analysis
 """
 
 import json
+import re
 from pathlib import Path
 
 from models import RuleResult
 from rules.base import ProjectWideRule
 from rules.context import RuleContext
-from rules.eslint_report import parse_eslint_json, write_eslint_csv
+from rules.eslint_report import parse_eslint_messages, violations_from_messages, write_eslint_csv_from_messages
+
+# First ESLint release with built-in multithreaded linting (--concurrency)
+ESLINT_CONCURRENCY_MIN_VERSION = (9, 34)
+_VERSION_RE = re.compile(r'v?(\d+)\.(\d+)')
 
 
 class ESLintAnalyzeRule(ProjectWideRule):
@@ -16,13 +21,22 @@ class ESLintAnalyzeRule(ProjectWideRule):
 
     rule_name = 'eslint_analyze'
 
+    DEFAULT_EXTENSIONS = ('.js', '.mjs', '.cjs', '.ts', '.tsx', '.jsx')
+
     def __init__(self, ctx: RuleContext):
         super().__init__(ctx)
-        self._svelte_files_cache = None
+        self._project_config_cache: bool | None = None
+        self._eslint_versions: dict[str, tuple[int, int] | None] = {}
 
     def _run(self, _file_path: Path) -> RuleResult:
         self.logger.info("\nRunning ESLint check...")
 
+        # Starting Node and loading the config costs hundreds of ms; skip it
+        # outright when there is nothing to lint (filter runs scope themselves).
+        if self.filter_files is None and not self._has_lintable_files():
+            self.logger.info("ESLint: No JavaScript/TypeScript files found")
+            return self._skipped("no JavaScript/TypeScript files found")
+
         # Check for local node_modules eslint first
         eslint_path = self._find_local_eslint()
         if not eslint_path:
@@ -67,6 +81,8 @@ class ESLintAnalyzeRule(ProjectWideRule):
         """
         # Build command with JSON format
         cmd = [eslint_path, '--format', 'json']
+        cmd += self._concurrency_args(eslint_path)
+        cmd += self._cache_args()
 
         # Handle config mode
         config_mode = self.config.get('config_mode', 'auto')
@@ -101,7 +117,7 @@ class ESLintAnalyzeRule(ProjectWideRule):
         if 'extensions' in self.config:
             extensions = self.config['extensions']
         else:
-            extensions = ['.js', '.mjs', '.cjs', '.ts', '.tsx', '.jsx']
+            extensions = list(self.DEFAULT_EXTENSIONS)
             # Auto-include .svelte if eslint-plugin-svelte is available
             if self._has_svelte_eslint_plugin():
                 extensions.append('.svelte')
@@ -119,20 +135,16 @@ class ESLintAnalyzeRule(ProjectWideRule):
 
         # Execute eslint using base utility
         try:
-            result = self._run_subprocess(cmd, self.base_path)
-
-            # ESLint outputs JSON to stdout
+            # ESLint outputs JSON to stdout; keep it as bytes, the JSON parsers take them directly
+            result = self._run_subprocess(cmd, self.base_path, text=False)
             output = result.stdout
 
-            # Parse JSON output
-            violations = parse_eslint_json(output, self._get_relative_path, self.logger)
+            # Parse JSON output once; violations and the CSV report share the records
+            messages = parse_eslint_messages(output, self.logger)
+            violations = violations_from_messages(messages, self._get_relative_path)
 
-            # Apply log level filter to violations
-            violations = self._filter_violations_by_log_level(violations)
-
-            # Apply max_errors limit to returned violations
-            if self.max_errors and len(violations) > self.max_errors:
-                violations = violations[:self.max_errors]
+            # Apply log level filter and max_errors limit to returned violations
+            violations = self._limit_violations(violations)
 
             # Print summary
             if violations:
@@ -143,8 +155,8 @@ class ESLintAnalyzeRule(ProjectWideRule):
             # Write to CSV file if output folder is specified and violations found
             if self.output_folder and violations:
                 output_file = self.output_folder / 'eslint_analyze.csv'
-                write_eslint_csv(output_file, output, self.log_level, self.max_errors,
-                                 self._get_relative_path, self.logger)
+                write_eslint_csv_from_messages(output_file, messages, self.log_level, self.max_errors,
+                                               self._get_relative_path, self.logger)
 
             return self._ok(violations)
 
@@ -156,12 +168,79 @@ class ESLintAnalyzeRule(ProjectWideRule):
             self.logger.error(f"Error running eslint check: {e}")
             return self._failed(f"error running eslint check: {e}")
 
+    def _concurrency_args(self, eslint_path: str) -> list[str]:
+        """Build the --concurrency argument when the installed ESLint supports it.
+
+        Skipped for --file / --only-changed runs: linting a handful of files
+        finishes before worker threads would pay off.
+
+        Returns:
+            ['--concurrency', value] or an empty list
+        """
+        concurrency = self.config.get('concurrency', 'auto')
+        if concurrency in (None, False, 'off') or self.filter_files is not None:
+            return []
+        version = self._get_eslint_version(eslint_path)
+        if version is None or version < ESLINT_CONCURRENCY_MIN_VERSION:
+            return []
+        return ['--concurrency', str(concurrency)]
+
+    def _cache_args(self) -> list[str]:
+        """Build the --cache arguments so unchanged files are not re-linted on the next run.
+
+        The cache file defaults to .eslintcache in the output folder (or the
+        base path when there is none); ``cache_location`` overrides it.
+
+        Returns:
+            Extra eslint arguments (empty when caching is disabled)
+        """
+        if not self.config.get('cache', False):
+            return []
+        cache_location = self.config.get('cache_location')
+        if cache_location:
+            cache_path = Path(cache_location)
+            if not cache_path.is_absolute():
+                cache_path = self.base_path / cache_path
+        else:
+            cache_path = (self.output_folder or self.base_path) / '.eslintcache'
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+        except OSError as e:
+            self.logger.warning(f"Warning: Could not create ESLint cache directory, running without cache: {e}")
+            return []
+        # content strategy: a checkout that only touches mtimes does not invalidate entries
+        return ['--cache', '--cache-location', str(cache_path), '--cache-strategy', 'content']
+
+    def _get_eslint_version(self, eslint_path: str) -> tuple[int, int] | None:
+        """Return (major, minor) of the ESLint executable, cached per path.
+
+        Returns:
+            Version tuple, or None if it could not be determined
+        """
+        if eslint_path not in self._eslint_versions:
+            version = None
+            try:
+                result = self._run_subprocess([eslint_path, '--version'], self.base_path, timeout=30)
+                match = _VERSION_RE.search(result.stdout or '')
+                if match:
+                    version = (int(match.group(1)), int(match.group(2)))
+            except Exception:
+                pass
+            self._eslint_versions[eslint_path] = version
+        return self._eslint_versions[eslint_path]
+
     def _has_project_config(self) -> bool:
-        """Check if project has ESLint configuration.
+        """Check if project has ESLint configuration (cached after first call).
 
         Returns:
             True if project config exists
         """
+        if self._project_config_cache is None:
+            self._project_config_cache = self._find_project_config()
+        return self._project_config_cache
+
+    def _find_project_config(self) -> bool:
+        """Look for an ESLint config file or an eslintConfig key in package.json."""
         config_files = [
             'eslint.config.js',
             'eslint.config.mjs',
@@ -201,17 +280,21 @@ class ESLintAnalyzeRule(ProjectWideRule):
         return (self.base_path / 'node_modules' / 'eslint-plugin-svelte').is_dir()
 
     def _has_svelte_files(self) -> bool:
-        """Check if the project contains any .svelte files (cached after first call).
+        """Check if the project contains any .svelte files, via the shared file index.
 
-        Skips node_modules to avoid expensive traversal.
+        Dependency and build directories (ProjectFileIndex.SKIP_DIRS) are
+        pruned, so node_modules is never walked.
 
         Returns:
             True if at least one .svelte file exists under base_path
         """
-        if self._svelte_files_cache is None:
-            self._svelte_files_cache = False
-            for path in self.base_path.rglob('*.svelte'):
-                if 'node_modules' not in path.parts:
-                    self._svelte_files_cache = True
-                    break
-        return self._svelte_files_cache
+        return self.file_index.has_extension('.svelte')
+
+    def _has_lintable_files(self) -> bool:
+        """Check if base_path contains any file ESLint would lint, via the shared file index.
+
+        Returns:
+            True if a file with a configured/default extension (or .svelte) exists
+        """
+        extensions = tuple(self.config.get('extensions', self.DEFAULT_EXTENSIONS))
+        return self.file_index.has_extension(*extensions, '.svelte')
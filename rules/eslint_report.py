@@ -6,10 +6,21 @@ and execution. The functions take a ``get_relative_path`` callable (the rule's
 """
 
 import csv
+import heapq
 import json
+from collections.abc import Callable, Iterator
 from pathlib import Path
 
 from models import LogLevel, Severity, Violation
+from rules.base import CSV_WRITE_BUFFER_SIZE, SEVERITY_ORDER
+
+# Optional dependency: orjson parses the whole report (bytes or str) faster than json.loads.
+# orjson.JSONDecodeError subclasses json.JSONDecodeError.
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
 
 
 def map_eslint_severity(severity: int) -> Severity:
@@ -21,86 +32,139 @@ def map_eslint_severity(severity: int) -> Severity:
     return Severity.INFO
 
 
-def parse_eslint_json(output: str, get_relative_path, logger) -> list[Violation]:
-    """Parse ESLint --format json output into violations."""
-    violations: list[Violation] = []
+def iter_eslint_messages(output: str | bytes) -> Iterator[tuple[str, dict]]:
+    """Yield (file_path, message) for every message in ESLint JSON output.
+
+    Accepts the raw stdout bytes as well as text. The output is already fully
+    buffered, so it is loaded in one piece with orjson (if installed) or
+    json.loads. Malformed JSON raises json.JSONDecodeError.
+    """
+    for file_result in _json_loads(output):
+        file_path = file_result.get('filePath', 'unknown')
+        for message in file_result.get('messages', []):
+            yield file_path, message
+
+
+def parse_eslint_messages(output: str | bytes, logger) -> list[dict]:
+    """Parse ESLint --format json output once into message records.
+
+    Each record is {'file_path', 'message', 'severity'}, with the ESLint
+    severity already mapped. Both the violation list and the CSV report are
+    built from these records, so the report is only parsed once. Output that
+    cannot be parsed or processed as a whole yields no records.
+    """
+    records: list[dict] = []
     if not output or not output.strip():
-        return violations
+        return records
 
     try:
-        data = json.loads(output)
-        for file_result in data:
-            file_path = file_result.get('filePath', 'unknown')
-            for message in file_result.get('messages', []):
-                rule_id = message.get('ruleId', 'unknown')
-                msg = message.get('message', '')
-                line_num = message.get('line', 0)
-                col_num = message.get('column', 0)
-                severity = map_eslint_severity(message.get('severity', 1))
-                try:
-                    rel_path = get_relative_path(Path(file_path))
-                except Exception:
-                    rel_path = file_path
-                violations.append(Violation(
-                    file_path=rel_path,
-                    rule_name='eslint_analyze',
-                    severity=severity,
-                    message=f"{msg} ({rule_id}) at line {line_num}, column {col_num}",
-                    line=line_num,
-                    column=col_num,
-                ))
+        for file_path, message in iter_eslint_messages(output):
+            records.append({
+                'file_path': file_path,
+                'message': message,
+                'severity': map_eslint_severity(message.get('severity', 1)),
+            })
     except json.JSONDecodeError as e:
+        records = []
         logger.error(f"Error parsing eslint JSON output: {e}")
-        logger.error(f"Output was: {output[:200]}...")
+        snippet = output[:200]
+        if isinstance(snippet, bytes):
+            snippet = snippet.decode('utf-8', errors='replace')
+        logger.error(f"Output was: {snippet}...")
     except Exception as e:
+        records = []
         logger.error(f"Error processing eslint results: {e}")
 
+    return records
+
+
+def violations_from_messages(records: list[dict], get_relative_path) -> list[Violation]:
+    """Build violations from parse_eslint_messages records."""
+    relative = _cached_relative_path(get_relative_path)
+    violations: list[Violation] = []
+    for item in records:
+        message = item['message']
+        rule_id = message.get('ruleId', 'unknown')
+        msg = message.get('message', '')
+        line_num = message.get('line', 0)
+        col_num = message.get('column', 0)
+        violations.append(Violation(
+            file_path=relative(item['file_path']),
+            rule_name='eslint_analyze',
+            severity=item['severity'],
+            message=f"{msg} ({rule_id}) at line {line_num}, column {col_num}",
+            line=line_num,
+            column=col_num,
+        ))
     return violations
 
 
+def parse_eslint_json(output: str, get_relative_path, logger) -> list[Violation]:
+    """Parse ESLint --format json output into violations."""
+    return violations_from_messages(parse_eslint_messages(output, logger), get_relative_path)
+
+
 def write_eslint_csv(output_file: Path, json_content: str, log_level: LogLevel,
                      max_errors: int | None, get_relative_path, logger) -> None:
     """Write ESLint results to CSV, filtered by log level and limited by max_errors."""
-    try:
-        data = json.loads(json_content)
-        if not data:
-            return
+    write_eslint_csv_from_messages(output_file, parse_eslint_messages(json_content, logger),
+                                   log_level, max_errors, get_relative_path, logger)
 
-        filtered_messages = []
-        for file_result in data:
-            file_path = file_result.get('filePath', 'unknown')
-            for message in file_result.get('messages', []):
-                severity = map_eslint_severity(message.get('severity', 1))
-                if (log_level == LogLevel.ERROR and severity != Severity.ERROR) or \
-                   (log_level == LogLevel.WARNING and severity not in (Severity.ERROR, Severity.WARNING)):
-                    continue
-                filtered_messages.append({'file_path': file_path, 'message': message, 'severity': severity})
+
+def write_eslint_csv_from_messages(output_file: Path, records: list[dict], log_level: LogLevel,
+                                   max_errors: int | None, get_relative_path, logger) -> None:
+    """Write parse_eslint_messages records to CSV, filtered by log level and limited by max_errors."""
+    try:
+        filtered_messages = [
+            item for item in records
+            if not ((log_level == LogLevel.ERROR and item['severity'] != Severity.ERROR) or
+                    (log_level == LogLevel.WARNING and item['severity'] not in (Severity.ERROR, Severity.WARNING)))
+        ]
 
         if max_errors and len(filtered_messages) > max_errors:
-            severity_order = {Severity.ERROR: 0, Severity.WARNING: 1, Severity.INFO: 2}
-            filtered_messages.sort(key=lambda m: severity_order.get(m['severity'], 3))
-            filtered_messages = filtered_messages[:max_errors]
+            # Partial sort: only the first max_errors entries are needed (stable, like sorted()[:n])
+            filtered_messages = heapq.nsmallest(max_errors, filtered_messages,
+                                                key=lambda m: SEVERITY_ORDER.get(m['severity'], 3))
 
         if not filtered_messages:
             return
 
-        with open(output_file, 'w', encoding='utf-8', newline='') as f:
+        relative = _cached_relative_path(get_relative_path)
+        with open(output_file, 'w', encoding='utf-8', newline='', buffering=CSV_WRITE_BUFFER_SIZE) as f:
             writer = csv.writer(f)
             writer.writerow(['file', 'line', 'column', 'severity', 'rule', 'message'])
-            for item in filtered_messages:
-                message = item['message']
-                try:
-                    rel_path = get_relative_path(Path(item['file_path']))
-                except Exception:
-                    rel_path = item['file_path']
-                writer.writerow([
-                    rel_path, message.get('line', 0), message.get('column', 0),
-                    item['severity'].value, message.get('ruleId', 'unknown'), message.get('message', ''),
-                ])
+            writer.writerows(_csv_row(item, relative) for item in filtered_messages)
 
         logger.info(f"ESLint report saved to: {output_file}")
 
-    except json.JSONDecodeError as e:
-        logger.error(f"Error parsing JSON for CSV output: {e}")
     except Exception as e:
         logger.error(f"Error writing eslint CSV file: {e}")
+
+
+def _csv_row(item: dict, relative: Callable[[str], str]) -> list:
+    message = item['message']
+    return [
+        relative(item['file_path']),
+        message.get('line', 0), message.get('column', 0),
+        item['severity'].value, message.get('ruleId', 'unknown'), message.get('message', ''),
+    ]
+
+
+def _cached_relative_path(get_relative_path) -> Callable[[str], str]:
+    """Wrap _relative_path with a per-call cache; ESLint reports many messages per file."""
+    cache: dict[str, str] = {}
+
+    def relative(file_path: str) -> str:
+        rel_path = cache.get(file_path)
+        if rel_path is None:
+            rel_path = cache[file_path] = _relative_path(file_path, get_relative_path)
+        return rel_path
+
+    return relative
+
+
+def _relative_path(file_path: str, get_relative_path) -> str:
+    try:
+        return get_relative_path(Path(file_path))
+    except Exception:
+        return file_path
@@ -3,15 +3,167 @@ Flutter analyze rule for Flutter code analysis
 """
 
 import csv
+import heapq
+import io
+import itertools
+import operator
+import os
 import re
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
-
-import yaml
 
 from models import RuleResult, Severity, Violation
-from rules.base import ProjectWideRule
+from rules.base import CSV_WRITE_BUFFER_SIZE, SEVERITY_ORDER, ProjectWideRule
 from rules.context import RuleContext
+from rules.dart_utils import load_yaml
+
+# Regex fallback for lines the str-split parsers below reject. One match classifies a line as
+# an issue ("severity - message - path:line:col - code") or as a wrapped message line that
+# continues the previous issue ("  severity - text -"); issue lines take precedence.
+# The lookahead rejects lines without a "path:line:col - code" tail in one linear pass, before
+# the lazy message/path groups can retry every " - " split.
+_LINE_RE = re.compile(
+    r'^(?:\s*(?P<severity>warning|info|error)\s+-\s+'
+    r'(?=.*:\d+:\d+\s+-\s+\S+\s*$)'
+    r'(?P<message>.+?)\s+-\s+(?P<path>.+?):(?P<line>\d+):(?P<column>\d+)\s+-\s+(?P<code>\S+)\s*'
+    r'|\s+(?:info|warning|error)\s+-\s+(?P<continuation>.+?)\s+-\s*)$',
+    re.IGNORECASE)
+_SEVERITIES = ('info', 'warning', 'error')
+
+# CSV report ordering: (severity rank, file, line) precomputed per row, read by a C-level getter
+_CSV_SORT_KEY = operator.itemgetter(0, 1, 2)
+_CSV_HEADER = ['file', 'line', 'column', 'severity', 'code', 'message']
+
+# Block-style pubspec scan used by _pubspec_depends_on_flutter
+_TOP_LEVEL_KEY_RE = re.compile(rb'([A-Za-z_][\w-]*)\s*:\s*(?:#.*)?$')
+_FLUTTER_KEY_RE = re.compile(rb'(["\']?)flutter\1\s*:')
+_DEPENDENCY_SECTIONS = (b'dependencies', b'dev_dependencies')
+
+
+def _pubspec_depends_on_flutter(data: bytes) -> bool | None:
+    """Check the dependency sections of a block-style pubspec.yaml for flutter.
+
+    Scans lines instead of building the whole YAML document, and stops as
+    soon as both dependency sections have ended, so trailing sections such as
+    long ``flutter: assets:`` lists are never read. Returns None when the file
+    uses something the scan does not model (flow mappings, tabs, document
+    markers), so the caller can fall back to a YAML parse.
+    """
+    section = None
+    child_indent = None
+    finished_sections = set()
+    for raw_line in io.BytesIO(data):
+        line = raw_line.rstrip()
+        stripped = line.lstrip(b' ')
+        if not stripped or stripped.startswith(b'#'):
+            continue
+        # Lines are split on b'\n' only, so a bare '\r' left inside means old Mac line endings
+        if stripped.startswith(b'\t') or line.startswith((b'---', b'...')) or b'\r' in line:
+            return None
+        indent = len(line) - len(stripped)
+        if indent == 0:
+            if section in _DEPENDENCY_SECTIONS:
+                finished_sections.add(section)
+                if len(finished_sections) == len(_DEPENDENCY_SECTIONS):
+                    return False
+            match = _TOP_LEVEL_KEY_RE.match(line)
+            if match:
+                section = match.group(1)
+                child_indent = None
+            elif line.startswith(_DEPENDENCY_SECTIONS):
+                return None  # e.g. "dependencies: {flutter: {sdk: flutter}}"
+            else:
+                section = None
+            continue
+        if section not in _DEPENDENCY_SECTIONS:
+            continue
+        if child_indent is None:
+            child_indent = indent
+        if indent == child_indent and _FLUTTER_KEY_RE.match(stripped):
+            return True
+    return False
+
+
+def _split_issue_line(stripped: str) -> tuple[str, str, str, int, int, str] | None:
+    """Split a stripped "severity - message - path:line:col - code" line without a regex.
+
+    Only handles the exact single-space separators flutter prints; returns
+    None for anything else so the caller can try _LINE_RE. The message is
+    everything between the severity and the location, so a " - " inside a
+    message stays in the message.
+    """
+    severity, sep, rest = stripped.partition(' - ')
+    if not sep or severity.lower() not in _SEVERITIES:
+        return None
+    head, sep, code = rest.rpartition(' - ')
+    if not sep or not code or ' ' in code or '\t' in code:
+        return None
+    message, sep, location = head.rpartition(' - ')
+    if not sep:
+        return None
+    parts = location.rsplit(':', 2)
+    if len(parts) != 3:
+        return None
+    path, line_num, col_num = parts
+    message = message.strip()
+    if not (message and path and line_num.isascii() and line_num.isdigit()
+            and col_num.isascii() and col_num.isdigit()):
+        return None
+    return severity, message, path, int(line_num), int(col_num), code
+
+
+def _split_continuation_line(line: str, stripped: str) -> str | None:
+    """Return the text of a wrapped "  severity - text -" line split without a regex, or None."""
+    if not line[:1].isspace():
+        return None
+    severity, sep, rest = stripped.partition(' - ')
+    if sep and rest.endswith(' -') and severity.lower() in _SEVERITIES:
+        return rest[:-2].strip() or None
+    return None
+
+
+def _parse_output_line(line: str) -> tuple[str, str, str, int, int, str] | str | None:
+    """Classify a line of flutter analyze output.
+
+    Returns (severity, message, path, line, column, code) for an issue line,
+    the message text for a continuation line, or None for anything else.
+    """
+    stripped = line.strip()
+    if not stripped[:7].lower().startswith(_SEVERITIES):
+        return None
+    parsed = _split_issue_line(stripped) or _split_continuation_line(line, stripped)
+    if parsed is not None:
+        return parsed
+    match = _LINE_RE.match(line)
+    if not match:
+        return None
+    if match.group('continuation') is not None:
+        return match.group('continuation').strip()
+    return (match.group('severity'), match.group('message').strip(), match.group('path'),
+            int(match.group('line')), int(match.group('column')), match.group('code'))
+
+
+@dataclass(slots=True)
+class _Issue:
+    """One parsed flutter analyze issue; kept next to its Violation as the CSV fields."""
+    severity: Severity
+    message: str                 # without the "(code) at line ..." suffix of the violation message
+    file_path: str               # as printed by flutter
+    line: int
+    column: int
+    code: str
+
+
+def _join_message(issue: _Issue, continued_parts: list[str] | None) -> _Issue:
+    """Set the issue message to its first line joined with any continuation lines."""
+    if continued_parts is not None:
+        issue.message = ' '.join(continued_parts)
+    return issue
+
+
+def _csv_row(violation: Violation, issue: _Issue) -> list:
+    return [violation.file_path, issue.line, issue.column, violation.severity.name, issue.code, issue.message]
 
 
 class FlutterAnalyzeRule(ProjectWideRule):
@@ -22,6 +174,9 @@ class FlutterAnalyzeRule(ProjectWideRule):
     def __init__(self, ctx: RuleContext):
         super().__init__(ctx)
         self.project_root = None
+        # Resolved project root plus separator; absolute paths under it are made relative by slicing
+        self._project_root_prefix: str | None = None
+        self._is_flutter_cache: bool | None = None
 
     def _run(self, _file_path: Path) -> RuleResult:
         self.logger.info("\nRunning flutter analyze...")
@@ -37,15 +192,28 @@ class FlutterAnalyzeRule(ProjectWideRule):
         return self._run_flutter_analyze(flutter_cmd)
 
     def _is_flutter_project(self) -> bool:
-        """Check if project has flutter dependency in pubspec.yaml."""
+        """Check if project has flutter dependency in pubspec.yaml (cached after first call)."""
+        if self._is_flutter_cache is None:
+            self._is_flutter_cache = self._detect_flutter_project()
+        return self._is_flutter_cache
+
+    def _detect_flutter_project(self) -> bool:
         self.project_root = self._find_pubspec()
         if not self.project_root:
             self.logger.warning(f"Warning: pubspec.yaml not found in {self.base_path} or parent")
             return False
+        self._project_root_prefix = os.path.join(str(self.project_root.resolve()), '')
 
         try:
-            with open(self.project_root / 'pubspec.yaml', encoding='utf-8') as f:
-                pubspec_data = yaml.safe_load(f)
+            data = (self.project_root / 'pubspec.yaml').read_bytes()
+            # A pubspec that never mentions flutter cannot depend on it; skip the YAML parse
+            if b'flutter' not in data:
+                return False
+            depends = _pubspec_depends_on_flutter(data)
+            if depends is not None:
+                return depends
+            # libyaml decodes the UTF-8 bytes itself; no Python-level decode needed
+            pubspec_data = load_yaml(data)
             if not pubspec_data:
                 return False
             deps = pubspec_data.get('dependencies', {})
@@ -61,14 +229,21 @@ class FlutterAnalyzeRule(ProjectWideRule):
             scope = self._scope_args(('.dart',))
             if scope is None:
                 return self._ok([])
-            result = self._run_subprocess([*flutter_cmd, 'analyze', *scope], self.project_root or self.base_path)
-            output = result.stdout if result.stdout.strip() else result.stderr
-            violations = self._filter_violations_by_log_level(self._parse_flutter_text_output(output))
+            # Parse issues while flutter is still analyzing; stderr is merged into the stream
+            with self._stream_subprocess([*flutter_cmd, 'analyze', *scope], self.project_root or self.base_path) as proc:
+                records = self._iter_flutter_records(proc.stdout)
+                if self.output_folder and not self.max_errors:
+                    # Nothing to sort or truncate: write each row as soon as its issue is complete
+                    violations = self._stream_csv_output(self.output_folder / 'flutter_analyze.csv', records)
+                    records = []  # already written
+                else:
+                    records = list(records)
+                    violations = [v for v, _ in records]
 
             self.logger.info(f"Flutter analyze found {len(violations)} issue(s)" if violations else "Flutter analyze: No issues found")
 
-            if self.output_folder and violations:
-                self._write_csv_output(self.output_folder / 'flutter_analyze.csv', violations)
+            if self.output_folder and records:
+                self._write_csv_output(self.output_folder / 'flutter_analyze.csv', records)
 
             return self._ok(violations)
         except Exception as e:
@@ -78,87 +253,134 @@ class FlutterAnalyzeRule(ProjectWideRule):
 
     def _parse_flutter_text_output(self, output: str) -> list[Violation]:
         """Parse flutter analyze text output (severity - message - path:line:col - code) into violations."""
-        violations = []
-        if not output or not output.strip():
-            return violations
+        return [v for v, _ in self._parse_flutter_records(output)]
 
-        main_pattern = re.compile(
-            r'^\s*(warning|info|error)\s+-\s+(.+?)\s+-\s+(.+?):(\d+):(\d+)\s+-\s+(\S+)\s*$', re.IGNORECASE)
-        continuation_pattern = re.compile(
-            r'^\s+(info|warning|error)\s+-\s+(.+?)\s+-\s*$', re.IGNORECASE)
-
-        current_violation = None
-        current_message_parts = []
-
-        for line in output.split('\n'):
-            main_match = main_pattern.match(line)
-            if main_match:
-                if current_violation:
-                    current_violation['message'] = ' '.join(current_message_parts)
-                    violations.append(self._create_violation(current_violation))
-                severity_str, message, file_path, line_num, col_num, code = main_match.groups()
-                current_violation = {
-                    'severity': severity_str, 'message': message, 'file_path': file_path,
-                    'line': int(line_num), 'column': int(col_num), 'code': code
-                }
-                current_message_parts = [message.strip()]
+    def _parse_flutter_records(self, output: str) -> list[tuple[Violation, _Issue]]:
+        """Parse flutter analyze text output into (violation, _Issue) pairs."""
+        if not output or not output.strip():
+            return []
+        # splitlines() also drops the '\r' of Windows line endings and the trailing empty line
+        return self._parse_flutter_lines(output.splitlines())
+
+    def _parse_flutter_lines(self, lines: Iterable[str]) -> list[tuple[Violation, _Issue]]:
+        """Parse flutter analyze output lines into (violation, _Issue) pairs."""
+        return list(self._iter_flutter_records(lines))
+
+    def _iter_flutter_records(self, lines: Iterable[str]) -> Iterator[tuple[Violation, _Issue]]:
+        """Yield (violation, _Issue) pairs from flutter analyze output lines.
+
+        Accepts any iterable of lines, e.g. a subprocess pipe, so parsing can
+        overlap with the analysis. An issue is yielded once the next issue line
+        (or the end of the output) shows it has no more continuation lines.
+        Issues below the configured log level are dropped, along with their
+        continuation lines, before any Violation is built for them. The
+        _Issue carries line, column, code and the bare message so the CSV
+        writer does not have to read them back out of the violation message.
+        """
+        rel_paths: dict[str, str] = {}
+        issue = None
+        # Message parts of the pending issue, only allocated once it gets a continuation line
+        continued_parts = None
+
+        for line in lines:
+            parsed = _parse_output_line(line)
+            if isinstance(parsed, tuple):
+                if issue is not None:
+                    yield self._create_violation(_join_message(issue, continued_parts), rel_paths)
+                continued_parts = None
+                severity = self._map_severity(parsed[0])
+                issue = _Issue(severity, *parsed[1:]) if self._log_level_accepts(severity) else None
                 continue
 
-            continuation_match = continuation_pattern.match(line)
-            if continuation_match and current_violation:
-                current_message_parts.append(continuation_match.group(2).strip())
-
-        if current_violation:
-            current_violation['message'] = ' '.join(current_message_parts)
-            violations.append(self._create_violation(current_violation))
-
-        return violations
-
-    def _create_violation(self, data: dict[str, Any]) -> Violation:
-        """Create a Violation object from parsed data dict."""
-        try:
-            file_path = Path(data['file_path'])
-            rel_path = str(file_path.resolve().relative_to(self.project_root)) if self.project_root else self._get_relative_path(file_path)
-        except (ValueError, Exception):
-            rel_path = data['file_path']
-
-        return Violation(
+            if parsed and issue is not None:
+                if continued_parts is None:
+                    continued_parts = [issue.message]
+                continued_parts.append(parsed)
+
+        if issue is not None:
+            yield self._create_violation(_join_message(issue, continued_parts), rel_paths)
+
+    def _create_violation(self, issue: _Issue,
+                          rel_paths: dict[str, str] | None = None) -> tuple[Violation, _Issue]:
+        """Create a Violation for a parsed issue; returns it paired with the issue.
+
+        ``rel_paths`` memoizes the relative path per raw issue path; flutter
+        usually reports many issues per file.
+        """
+        raw_path = issue.file_path
+        rel_path = rel_paths.get(raw_path) if rel_paths is not None else None
+        if rel_path is None:
+            rel_path = self._relative_issue_path(raw_path)
+            if rel_paths is not None:
+                rel_paths[raw_path] = rel_path
+
+        violation = Violation(
             file_path=rel_path, rule_name='flutter_analyze',
-            severity=self._map_severity(data['severity']),
-            message=f"{data['message']} ({data['code']}) at line {data['line']}, column {data['column']}"
+            severity=issue.severity,
+            message=f"{issue.message} ({issue.code}) at line {issue.line}, column {issue.column}",
+            line=issue.line, column=issue.column,
         )
+        return violation, issue
 
-    def _write_csv_output(self, output_file: Path, violations: list[Violation]):
+    def _relative_issue_path(self, raw_path: str) -> str:
+        """Make an issue path relative to the project root (or base path)."""
+        prefix = self._project_root_prefix
+        if prefix and raw_path.startswith(prefix):
+            return raw_path[len(prefix):]
+        try:
+            file_path = Path(raw_path)
+            return str(file_path.resolve().relative_to(self.project_root)) if self.project_root else self._get_relative_path(file_path)
+        except Exception:
+            return raw_path
+
+    def _write_csv_output(self, output_file: Path, records: list[tuple[Violation, _Issue]]):
         """Write flutter analyze results to CSV, sorted by severity, limited by max_errors."""
         try:
-            if not violations:
+            if not records:
                 return
 
-            violation_data = []
-            for v in violations:
-                line_m = re.search(r'at line (\d+)', v.message)
-                col_m = re.search(r'column (\d+)', v.message)
-                code_m = re.search(r'\(([^)]+)\) at line', v.message)
-                code = code_m.group(1) if code_m else 'unknown'
-                base_msg = v.message.split(f'({code})')[0].strip() if code_m else v.message
-                sev_order = {Severity.ERROR: 0, Severity.WARNING: 1}.get(v.severity, 2)
-                violation_data.append({
-                    'file': v.file_path, 'line': int(line_m.group(1)) if line_m else 0,
-                    'column': int(col_m.group(1)) if col_m else 0, 'severity': v.severity.name,
-                    'code': code, 'message': base_msg, 'severity_order': sev_order
-                })
-
-            if self.max_errors and len(violation_data) > self.max_errors:
-                violation_data.sort(key=lambda x: (x['severity_order'], x['file'], x['line']))
-                violation_data = violation_data[:self.max_errors]
-
-            with open(output_file, 'w', encoding='utf-8', newline='') as f:
+            # Each row carries its sort key, computed once per record instead of per comparison
+            rows = [(SEVERITY_ORDER.get(v.severity, 3), v.file_path, d.line, _csv_row(v, d))
+                    for v, d in records]
+            if self.max_errors and len(rows) > self.max_errors:
+                rows = heapq.nsmallest(self.max_errors, rows, key=_CSV_SORT_KEY)
+
+            with open(output_file, 'w', encoding='utf-8', newline='', buffering=CSV_WRITE_BUFFER_SIZE) as f:
                 writer = csv.writer(f)
-                writer.writerow(['file', 'line', 'column', 'severity', 'code', 'message'])
-                for d in violation_data:
-                    writer.writerow([d['file'], d['line'], d['column'], d['severity'], d['code'], d['message']])
+                writer.writerow(_CSV_HEADER)
+                writer.writerows(row for *_, row in rows)
 
             self.logger.info(f"Flutter analyze report saved to: {output_file}")
 
         except Exception as e:
             self.logger.error(f"Error writing flutter analyze CSV file: {e}")
+
+    def _stream_csv_output(self, output_file: Path,
+                           records: Iterable[tuple[Violation, _Issue]]) -> list[Violation]:
+        """Write records to CSV as they arrive and return their violations.
+
+        Used when max_errors does not apply, so rows need no sorting and only
+        the violations are kept in memory. Like _write_csv_output, no file is
+        created when there are no records. A write error is logged and the
+        remaining records are still collected.
+        """
+        violations: list[Violation] = []
+        records = iter(records)
+        first = next(records, None)
+        if first is None:
+            return violations
+
+        try:
+            with open(output_file, 'w', encoding='utf-8', newline='', buffering=CSV_WRITE_BUFFER_SIZE) as f:
+                writer = csv.writer(f)
+                writer.writerow(_CSV_HEADER)
+                for violation, issue in itertools.chain((first,), records):
+                    violations.append(violation)
+                    writer.writerow(_csv_row(violation, issue))
+            self.logger.info(f"Flutter analyze report saved to: {output_file}")
+        except (OSError, csv.Error) as e:
+            self.logger.error(f"Error writing flutter analyze CSV file: {e}")
+            if not violations:
+                violations.append(first[0])
+        violations.extend(v for v, _ in records)
+        return violations
@@ -1,10 +1,16 @@
 """Intelephense analyze rule for PHP code analysis using LSP."""
 
 import csv
+import operator
+from itertools import islice
 from pathlib import Path
 
 from models import RuleResult, Severity, Violation
-from rules.base import ProjectWideRule
+from rules.base import CSV_WRITE_BUFFER_SIZE, ProjectWideRule
+
+# CSV columns and the Diagnostic attributes that fill them, read in C by attrgetter
+_CSV_HEADER = ["file", "line", "column", "severity", "message"]
+_CSV_ROW = operator.attrgetter("file_path", "line", "column", "severity", "message")
 
 
 class IntelephenseAnalyzeRule(ProjectWideRule):
@@ -12,6 +18,13 @@ class IntelephenseAnalyzeRule(ProjectWideRule):
 
     rule_name = 'intelephense_analyze'
 
+    _SEVERITY_MAP = {
+        "error": Severity.ERROR,
+        "warning": Severity.WARNING,
+        "info": Severity.INFO,
+        "hint": Severity.INFO,  # Map hint to INFO
+    }
+
     def _map_severity(self, intelephense_severity: str) -> Severity:
         """Map Intelephense severity to cli-code-analyzer Severity.
 
@@ -21,13 +34,11 @@ class IntelephenseAnalyzeRule(ProjectWideRule):
         Returns:
             Mapped Severity enum value.
         """
-        severity_map = {
-            "error": Severity.ERROR,
-            "warning": Severity.WARNING,
-            "info": Severity.INFO,
-            "hint": Severity.INFO,  # Map hint to INFO
-        }
-        return severity_map.get(intelephense_severity.lower(), Severity.WARNING)
+        severity = self._SEVERITY_MAP.get(intelephense_severity)
+        if severity is None:
+            # Intelephense reports lowercase names; other casings take the slower path
+            severity = self._SEVERITY_MAP.get(intelephense_severity.lower(), Severity.WARNING)
+        return severity
 
     def _run(self, _file_path: Path) -> RuleResult:
         self.logger.info("\nRunning Intelephense check...")
@@ -65,23 +76,18 @@ class IntelephenseAnalyzeRule(ProjectWideRule):
                 timeout=timeout,
             )
 
-            violations = []
-            for diag in diagnostics:
-                severity = self._map_severity(diag.severity)
-                message = f"{diag.message} at line {diag.line}:{diag.column}"
-
-                violation = Violation(
+            # Filter by log level and stop at max_errors before building any Violation
+            mapped = ((diag, self._map_severity(diag.severity)) for diag in diagnostics)
+            accepted = ((diag, severity) for diag, severity in mapped if self._log_level_accepts(severity))
+            violations = [
+                Violation(
                     file_path=diag.file_path,
-                    rule_name="intelephense_analyze",
+                    rule_name=self.rule_name,
                     severity=severity,
-                    message=message,
+                    message=f"{diag.message} at line {diag.line}:{diag.column}",
                 )
-                violations.append(violation)
-
-            violations = self._filter_violations_by_log_level(violations)
-
-            if self.max_errors and len(violations) > self.max_errors:
-                violations = violations[: self.max_errors]
+                for diag, severity in islice(accepted, self.max_errors or None)
+            ]
 
             if violations:
                 self.logger.info(f"Intelephense found {len(violations)} issue(s)")
@@ -115,19 +121,13 @@ class IntelephenseAnalyzeRule(ProjectWideRule):
             return False
 
         try:
-            # Apply max_errors limit
-            limited_diagnostics = diagnostics
-            if self.max_errors and len(limited_diagnostics) > self.max_errors:
-                limited_diagnostics = limited_diagnostics[: self.max_errors]
+            # Apply max_errors limit without copying the diagnostics list
+            limited_diagnostics = islice(diagnostics, self.max_errors or None)
 
-            with open(output_file, "w", encoding="utf-8", newline="") as f:
+            with open(output_file, "w", encoding="utf-8", newline="", buffering=CSV_WRITE_BUFFER_SIZE) as f:
                 writer = csv.writer(f)
-                writer.writerow(["file", "line", "column", "severity", "message"])
-
-                for diag in limited_diagnostics:
-                    writer.writerow(
-                        [diag.file_path, diag.line, diag.column, diag.severity, diag.message]
-                    )
+                writer.writerow(_CSV_HEADER)
+                writer.writerows(map(_CSV_ROW, limited_diagnostics))
 
             self.logger.info(f"Intelephense report saved to: {output_file}")
             return True
@@ -2,12 +2,53 @@
 Max lines per file rule
 """
 
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
 
 from models import RuleResult, Severity, Violation
-from rules.base import BaseRule
+from rules.base import BaseRule, count_file_lines
 from rules.context import RuleContext
 
+# Below this many files, starting the worker processes costs more than counting serially
+PARALLEL_MIN_FILES = 256
+# Files per task sent to a worker, so IPC is paid per batch rather than per file
+PARALLEL_CHUNK_SIZE = 64
+# Default cache file name (in the output folder) when "cache" is enabled
+CACHE_FILE_NAME = '.max_lines_cache.json'
+
+# Line counts by file path as (st_mtime_ns, st_size, line_count), shared by every MaxLinesRule
+# in the process. An entry is only used while the file's mtime and size still match.
+_LINE_COUNT_CACHE: dict[str, tuple[int, int, int]] = {}
+
+
+def _stat_key(file_path: Path) -> tuple[int, int] | None:
+    """Return (st_mtime_ns, st_size) for cache validation, or None if the file cannot be stat'ed."""
+    try:
+        st = os.stat(file_path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _count_lines_worker(file_path: Path) -> tuple[int, str | None]:
+    """Process pool worker: return (line count, error message) for one file."""
+    try:
+        return count_file_lines(file_path), None
+    except Exception as e:
+        return 0, str(e)
+
+
+def _cached_count(file_path: Path, key: tuple[int, int] | None) -> int | None:
+    """Return the cached line count of an unchanged file, or None."""
+    entry = _LINE_COUNT_CACHE.get(str(file_path))
+    if entry is None or key is None or entry[:2] != key:
+        return None
+    return entry[2]
+
 
 class MaxLinesRule(BaseRule):
     """Rule to check maximum lines per file"""
@@ -18,6 +59,8 @@ class MaxLinesRule(BaseRule):
         super().__init__(ctx)
         self.warning_threshold = ctx.config.get('warning', 300)
         self.error_threshold = ctx.config.get('error', 500)
+        self._cache_path = self._resolve_cache_path()
+        self._cache_loaded = False
 
     def check(self, file_path: Path) -> RuleResult:
         """
@@ -29,8 +72,115 @@ class MaxLinesRule(BaseRule):
         Returns:
             RuleResult (OK; violations empty if within thresholds)
         """
+        return self._check_line_count(file_path, self._line_counts([file_path])[0])
+
+    def check_many(self, files: list[Path]) -> list[RuleResult]:
+        """
+        Check a batch of files, counting lines in parallel for large batches
+
+        Files whose mtime and size match a cached count are not read again.
+        With "cache" enabled the counts are saved after each batch, so the
+        next run can reuse them too.
+
+        Args:
+            files: Paths of the files to check
+
+        Returns:
+            One RuleResult per file, in the order of files
+        """
+        results = [self._check_line_count(file_path, line_count)
+                   for file_path, line_count in zip(files, self._line_counts(files))]
+        if self._cache_path:
+            self._save_cache(files)
+        return results
+
+    def _line_counts(self, files: list[Path]) -> list[int]:
+        """Return the line count of each file (0 if unreadable), using and filling the cache."""
+        self._load_cache()
+        keys = [_stat_key(file_path) for file_path in files]
+        cached = [_cached_count(file_path, key) for file_path, key in zip(files, keys)]
+        pending = [file_path for file_path, count in zip(files, cached) if count is None]
+        counted = iter(self._count_files(pending))
+
+        counts = []
+        for file_path, key, count in zip(files, keys, cached):
+            if count is None:
+                count, error = next(counted)
+                if error is not None:
+                    self.logger.warning(f"Warning: Could not read {file_path}: {error}")
+                elif key is not None:
+                    _LINE_COUNT_CACHE[str(file_path)] = (*key, count)
+            counts.append(count)
+        return counts
+
+    def _count_files(self, files: list[Path]) -> list[tuple[int, str | None]]:
+        """Count lines as (line count, error) pairs, in a process pool for large batches.
+
+        Line counting reads and decodes every file, so large batches are
+        spread over a spawn-context process pool; small batches (and
+        single-CPU machines) are counted serially.
+        """
+        workers = os.cpu_count() or 1
+        if workers < 2 or len(files) < PARALLEL_MIN_FILES:
+            return [_count_lines_worker(file_path) for file_path in files]
+
+        try:
+            with ProcessPoolExecutor(max_workers=workers,
+                                     mp_context=multiprocessing.get_context('spawn')) as executor:
+                return list(executor.map(_count_lines_worker, files, chunksize=PARALLEL_CHUNK_SIZE))
+        except (OSError, BrokenProcessPool) as e:
+            self.logger.warning(f"Warning: Parallel line counting failed ({e}); counting serially")
+            return [_count_lines_worker(file_path) for file_path in files]
+
+    def _resolve_cache_path(self) -> Path | None:
+        """Return the persistent cache file, or None when "cache" is not enabled.
+
+        Defaults to .max_lines_cache.json in the output folder (or the base
+        path when there is none); ``cache_location`` overrides it.
+        """
+        if not self.config.get('cache', False):
+            return None
+        cache_location = self.config.get('cache_location')
+        if cache_location:
+            cache_path = Path(cache_location)
+            if not cache_path.is_absolute() and self.base_path:
+                cache_path = self.base_path / cache_path
+            return cache_path
+        folder = self.output_folder or self.base_path
+        return folder / CACHE_FILE_NAME if folder else None
+
+    def _load_cache(self) -> None:
+        """Merge the persistent cache into _LINE_COUNT_CACHE once per rule instance."""
+        if self._cache_loaded or not self._cache_path:
+            return
+        self._cache_loaded = True
+        try:
+            with open(self._cache_path, encoding='utf-8') as f:
+                entries = json.load(f)
+            for path, (mtime_ns, size, line_count) in entries.items():
+                _LINE_COUNT_CACHE.setdefault(path, (mtime_ns, size, line_count))
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, TypeError, AttributeError) as e:
+            self.logger.warning(f"Warning: Ignoring unreadable max lines cache {self._cache_path}: {e}")
+
+    def _save_cache(self, files: list[Path]) -> None:
+        """Write the cached counts of the given files to the persistent cache."""
+        entries = {}
+        for file_path in files:
+            entry = _LINE_COUNT_CACHE.get(str(file_path))
+            if entry is not None:
+                entries[str(file_path)] = entry
+        try:
+            self._cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self._cache_path, 'w', encoding='utf-8') as f:
+                json.dump(entries, f, separators=(',', ':'))
+        except OSError as e:
+            self.logger.warning(f"Warning: Could not write max lines cache {self._cache_path}: {e}")
+
+    def _check_line_count(self, file_path: Path, line_count: int) -> RuleResult:
+        """Build the result for a file with a known line count."""
         violations = []
-        line_count = self._count_lines(file_path)
         relative_path = self._get_relative_path(file_path)
 
         # Get thresholds for this specific file (may use exceptions)
@@ -3,9 +3,9 @@
 import re
 from pathlib import Path
 
-from models import RuleResult
-from rules.base import ProjectWideRule
-from rules.php_cs_fixer_report import parse_fixer_json, write_fixer_csv
+from models import RuleResult, Severity
+from rules.base import ProjectWideRule, find_bundled_php_tool
+from rules.php_cs_fixer_report import iter_fixer_violations, load_fixer_json, write_fixer_csv_from_data
 
 # Default paths to exclude if none specified
 DEFAULT_EXCLUDE_PATHS = ['vendor', '.git']
@@ -20,16 +20,8 @@ class PHPCSFixerAnalyzeRule(ProjectWideRule):
     rule_name = 'php_cs_fixer'
 
     def _get_bundled_fixer_path(self) -> str | None:
-        """Get PHP-CS-Fixer path from bundled php/vendor/bin folder."""
-        script_dir = Path(__file__).parent.parent
-        paths = [
-            script_dir / 'php' / 'vendor' / 'bin' / 'php-cs-fixer.bat',
-            script_dir / 'php' / 'vendor' / 'bin' / 'php-cs-fixer',
-        ]
-        for p in paths:
-            if p.exists():
-                return str(p)
-        return None
+        """Get PHP-CS-Fixer path from bundled php/vendor/bin folder (probed once per process)."""
+        return find_bundled_php_tool('php-cs-fixer')
 
     def _get_exclude_paths(self) -> list[str]:
         """Get exclude paths from config, with defaults if not specified."""
@@ -203,26 +195,31 @@ return (new PhpCsFixer\\Config())
         self.logger.info(f"  Rules: {rules}")
 
         try:
-            result = self._run_subprocess(cmd, self.base_path)
+            # Keep the JSON on stdout as bytes, the JSON parsers take them directly
+            result = self._run_subprocess(cmd, self.base_path, text=False)
             output = result.stdout
+            stderr = result.stderr.decode('utf-8', errors='replace')
 
             # Show stderr for progress info (PHP-CS-Fixer outputs progress there)
-            if result.stderr and 'legend:' not in result.stderr.lower():
+            if stderr and 'legend:' not in stderr.lower():
                 # Filter out the legend and empty lines, show actual progress
                 stderr_lines = [
                     line
-                    for line in result.stderr.strip().split('\n')
+                    for line in stderr.strip().split('\n')
                     if line.strip() and 'legend:' not in line.lower() and line.strip() != '.'
                 ]
                 if stderr_lines:
                     for line in stderr_lines[:5]:  # Show first few lines of progress
                         self.logger.info(f"  {line}")
 
-            violations = parse_fixer_json(output, self._get_relative_path, self.logger)
-            violations = self._filter_violations_by_log_level(violations)
-
-            if self.max_errors and len(violations) > self.max_errors:
-                violations = violations[:self.max_errors]
+            # Parsed once; the violations and the CSV report are both built from this
+            data = load_fixer_json(output, self.logger)
+            # Every fixer violation is a WARNING, so an error-only log level needs none of them
+            if data is not None and self._log_level_accepts(Severity.WARNING):
+                violations = self._limit_violations(
+                    iter_fixer_violations(data, self._get_relative_path, self.logger))
+            else:
+                violations = []
 
             if violations:
                 self.logger.info(f"PHP-CS-Fixer found {len(violations)} issue(s)")
@@ -231,7 +228,7 @@ return (new PhpCsFixer\\Config())
 
             if self.output_folder and violations:
                 output_file = self.output_folder / 'php_cs_fixer.csv'
-                write_fixer_csv(output_file, output, self.max_errors, self._get_relative_path, self.logger)
+                write_fixer_csv_from_data(output_file, data, self.max_errors, self._get_relative_path, self.logger)
 
             return self._ok(violations)
 
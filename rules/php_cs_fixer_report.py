@@ -7,19 +7,39 @@ rule's ``_get_relative_path``) and a ``logger`` rather than depending on the rul
 
 import csv
 import json
+from collections.abc import Iterator
 from pathlib import Path
 
 from models import Severity, Violation
+from rules.base import CSV_WRITE_BUFFER_SIZE
 
+# Optional dependency: orjson parses the report faster than json.loads.
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so the handlers below cover it.
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
 
-def parse_fixer_json(output: str, get_relative_path, logger) -> list[Violation]:
-    """Parse PHP-CS-Fixer JSON into one violation per file (listing the fixers)."""
-    violations: list[Violation] = []
+
+def load_fixer_json(output: str | bytes, logger) -> dict | None:
+    """Parse PHP-CS-Fixer JSON output (text or raw bytes) once; None (logged) if empty or malformed."""
     if not output or not output.strip():
-        return violations
+        return None
+    try:
+        return _json_loads(output)
+    except json.JSONDecodeError as e:
+        logger.error(f"Error parsing PHP-CS-Fixer JSON output: {e}")
+        snippet = output[:200]
+        if isinstance(snippet, bytes):
+            snippet = snippet.decode('utf-8', errors='replace')
+        logger.error(f"Output was: {snippet}...")
+        return None
+
 
+def iter_fixer_violations(data: dict, get_relative_path, logger) -> Iterator[Violation]:
+    """Yield the violations of parsed PHP-CS-Fixer JSON lazily, so a max_errors cap stops early."""
     try:
-        data = json.loads(output)
         for file_info in data.get('files', []):
             fixers = file_info.get('appliedFixers', [])
             if not fixers:
@@ -28,26 +48,20 @@ def parse_fixer_json(output: str, get_relative_path, logger) -> list[Violation]:
                 rel_path = get_relative_path(Path(file_info.get('name', 'unknown')))
             except Exception:
                 rel_path = file_info.get('name', 'unknown')
-            violations.append(Violation(
+            yield Violation(
                 file_path=rel_path,
                 rule_name='php_cs_fixer',
                 severity=Severity.WARNING,
                 message=f"Code style issues found. Would apply fixers: {', '.join(fixers)}",
-            ))
-    except json.JSONDecodeError as e:
-        logger.error(f"Error parsing PHP-CS-Fixer JSON output: {e}")
-        logger.error(f"Output was: {output[:200]}...")
+            )
     except Exception as e:
         logger.error(f"Error processing PHP-CS-Fixer results: {e}")
 
-    return violations
 
-
-def write_fixer_csv(output_file: Path, json_content: str, max_errors: int | None,
-                    get_relative_path, logger) -> None:
-    """Write PHP-CS-Fixer results to CSV (one row per file with its fixers)."""
+def write_fixer_csv_from_data(output_file: Path, data: dict, max_errors: int | None,
+                              get_relative_path, logger) -> None:
+    """Write parsed PHP-CS-Fixer JSON to CSV (one row per file with its fixers)."""
     try:
-        data = json.loads(json_content)
         rows = []
         for file_info in data.get('files', []):
             fixers = file_info.get('appliedFixers', [])
@@ -65,15 +79,12 @@ def write_fixer_csv(output_file: Path, json_content: str, max_errors: int | None
         if not rows:
             return
 
-        with open(output_file, 'w', encoding='utf-8', newline='') as f:
+        with open(output_file, 'w', encoding='utf-8', newline='', buffering=CSV_WRITE_BUFFER_SIZE) as f:
             writer = csv.writer(f)
             writer.writerow(['file', 'severity', 'fixers', 'fixer_count'])
-            for v in rows:
-                writer.writerow([v['file'], v['severity'], v['fixers'], v['fixer_count']])
+            writer.writerows([v['file'], v['severity'], v['fixers'], v['fixer_count']] for v in rows)
 
         logger.info(f"PHP-CS-Fixer report saved to: {output_file}")
 
-    except json.JSONDecodeError as e:
-        logger.error(f"Error parsing JSON for CSV output: {e}")
     except Exception as e:
         logger.error(f"Error writing PHP-CS-Fixer CSV file: {e}")
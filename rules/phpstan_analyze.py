@@ -2,10 +2,27 @@
 
 import csv
 import json
+from collections.abc import Iterator
+from itertools import islice
 from pathlib import Path
 
 from models import RuleResult, Severity, Violation
-from rules.base import ProjectWideRule
+from rules.base import CSV_WRITE_BUFFER_SIZE, ProjectWideRule, find_bundled_php_tool
+from rules.context import RuleContext
+
+# Optional dependency: orjson parses the report faster than json.loads.
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so the handlers below cover it.
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+
+def _snippet(output: str | bytes) -> str:
+    """First 200 characters of tool output for error messages; decodes only that slice."""
+    snippet = output[:200]
+    return snippet.decode('utf-8', errors='replace') if isinstance(snippet, bytes) else snippet
 
 
 class PHPStanAnalyzeRule(ProjectWideRule):
@@ -13,17 +30,25 @@ class PHPStanAnalyzeRule(ProjectWideRule):
 
     rule_name = 'phpstan_analyze'
 
+    def __init__(self, ctx: RuleContext):
+        super().__init__(ctx)
+        # --exclude arguments, built once from the configured exclude_patterns
+        self._exclude_args = self._build_exclude_args(self.config.get('exclude_patterns') or [])
+
+    @staticmethod
+    def _build_exclude_args(patterns: list[str]) -> list[str]:
+        """Turn glob-style exclude patterns into PHPStan --exclude arguments."""
+        args = []
+        for pattern in patterns:
+            # PHPStan uses --exclude for directory exclusion
+            if '**' in pattern:
+                pattern = pattern.replace('/**', '').replace('**/', '')
+            args.extend(['--exclude', pattern])
+        return args
+
     def _get_bundled_phpstan_path(self) -> str | None:
-        """Get PHPStan path from bundled php/vendor/bin folder."""
-        script_dir = Path(__file__).parent.parent
-        paths = [
-            script_dir / 'php' / 'vendor' / 'bin' / 'phpstan.bat',
-            script_dir / 'php' / 'vendor' / 'bin' / 'phpstan',
-        ]
-        for p in paths:
-            if p.exists():
-                return str(p)
-        return None
+        """Get PHPStan path from bundled php/vendor/bin folder (probed once per process)."""
+        return find_bundled_php_tool('phpstan')
 
     def _run(self, _file_path: Path) -> RuleResult:
         self.logger.info("\nRunning PHPStan check...")
@@ -46,12 +71,7 @@ class PHPStanAnalyzeRule(ProjectWideRule):
         cmd.extend(['--level', str(level)])
 
         # Add exclude patterns as --exclude options
-        if self.config.get('exclude_patterns'):
-            for pattern in self.config['exclude_patterns']:
-                # PHPStan uses --exclude for directory exclusion
-                if '**' in pattern:
-                    pattern = pattern.replace('/**', '').replace('**/', '')
-                cmd.extend(['--exclude', pattern])
+        cmd.extend(self._exclude_args)
 
         # Add path to analyze: changed files when filtering, else the configured analyze_path.
         analyze_path = self.config.get('analyze_path', str(self.base_path))
@@ -63,7 +83,8 @@ class PHPStanAnalyzeRule(ProjectWideRule):
         cmd += scope
 
         try:
-            result = self._run_subprocess(cmd, self.base_path)
+            # PHPStan writes JSON to stdout; keep it as bytes, the JSON parsers take them directly
+            result = self._run_subprocess(cmd, self.base_path, text=False)
             output = result.stdout
         except FileNotFoundError:
             self.logger.error(f"Error: PHPStan executable not found: {phpstan_path}")
@@ -75,19 +96,17 @@ class PHPStanAnalyzeRule(ProjectWideRule):
 
         # Conservative guard: non-empty output that is not valid JSON means PHPStan
         # emitted a fatal/non-JSON message — treat as a failure, not "clean".
+        # Parsed once; the violations and the CSV report are both built from data.
+        data = None
         if output and output.strip():
             try:
-                json.loads(output)
+                data = _json_loads(output)
             except json.JSONDecodeError as e:
                 self.logger.error(f"Error parsing PHPStan JSON output: {e}")
-                self.logger.error(f"Output was: {output[:200]}...")
+                self.logger.error(f"Output was: {_snippet(output)}...")
                 return self._failed(f"could not parse PHPStan JSON output: {e}")
 
-        violations = self._parse_phpstan_json(output)
-        violations = self._filter_violations_by_log_level(violations)
-
-        if self.max_errors and len(violations) > self.max_errors:
-            violations = violations[:self.max_errors]
+        violations = self._limit_violations(self._iter_violations(data) if data is not None else [])
 
         if violations:
             self.logger.info(f"PHPStan found {len(violations)} issue(s)")
@@ -96,7 +115,7 @@ class PHPStanAnalyzeRule(ProjectWideRule):
 
         if self.output_folder and violations:
             output_file = self.output_folder / 'phpstan_analyze.csv'
-            if self._write_csv_output(output_file, output):
+            if self._write_csv_data(output_file, data):
                 self.logger.info(f"PHPStan report saved to: {output_file}")
 
         return self._ok(violations)
@@ -108,8 +127,11 @@ class PHPStanAnalyzeRule(ProjectWideRule):
         # For now, treat all PHPStan errors as errors since they're static analysis issues
         return Severity.ERROR
 
-    def _parse_phpstan_json(self, output: str) -> list[Violation]:
-        """Parse PHPStan JSON output into violations.
+    def _iter_violations(self, data: dict) -> Iterator[Violation]:
+        """Yield violations from parsed PHPStan JSON lazily.
+
+        Lets _limit_violations stop at max_errors without building the
+        violations (and resolving the paths) of the remaining messages.
 
         PHPStan JSON format:
         {
@@ -125,120 +147,81 @@ class PHPStanAnalyzeRule(ProjectWideRule):
             "errors": []
         }
         """
-        violations = []
-
-        if not output or not output.strip():
-            return violations
-
         try:
-            data = json.loads(output)
-            files = data.get('files', {})
-
-            for file_path, file_data in files.items():
-                messages = file_data.get('messages', [])
+            for file_path, file_data in data.get('files', {}).items():
+                rel_path = None
+                for msg in file_data.get('messages', []):
+                    if rel_path is None:
+                        try:
+                            rel_path = self._get_relative_path(Path(file_path))
+                        except Exception:
+                            rel_path = file_path
 
-                for msg in messages:
                     message_text = msg.get('message', '')
                     line_num = msg.get('line', 0)
                     identifier = msg.get('identifier', '')
 
-                    try:
-                        rel_path = self._get_relative_path(Path(file_path))
-                    except Exception:
-                        rel_path = file_path
-
-                    detailed_message = f"{message_text}"
+                    # One f-string per message instead of growing it with +=
                     if identifier:
-                        detailed_message += f" [{identifier}]"
-                    detailed_message += f" at line {line_num}"
+                        detailed_message = f"{message_text} [{identifier}] at line {line_num}"
+                    else:
+                        detailed_message = f"{message_text} at line {line_num}"
 
-                    violation = Violation(
+                    yield Violation(
                         file_path=rel_path,
-                        rule_name='phpstan_analyze',
+                        rule_name=self.rule_name,
                         severity=Severity.ERROR,
                         message=detailed_message
                     )
-                    violations.append(violation)
 
             # Also process general errors (not file-specific)
             for error in data.get('errors', []):
-                violation = Violation(
+                yield Violation(
                     file_path='<project>',
-                    rule_name='phpstan_analyze',
+                    rule_name=self.rule_name,
                     severity=Severity.ERROR,
                     message=str(error)
                 )
-                violations.append(violation)
 
-        except json.JSONDecodeError as e:
-            self.logger.error(f"Error parsing PHPStan JSON output: {e}")
-            self.logger.error(f"Output was: {output[:200]}...")
         except Exception as e:
             self.logger.error(f"Error processing PHPStan results: {e}")
 
-        return violations
-
-    def _write_csv_output(self, output_file: Path, json_content: str) -> bool:
-        """Write PHPStan results to CSV file.
+    def _write_csv_data(self, output_file: Path, data: dict) -> bool:
+        """Write parsed PHPStan JSON to CSV file.
 
         Returns:
             True if CSV was written successfully, False otherwise.
         """
         try:
-            data = json.loads(json_content)
-            files = data.get('files', {})
-
-            if not files and not data.get('errors', []):
-                return False
-
-            all_violations = []
-
-            for file_path, file_data in files.items():
-                for msg in file_data.get('messages', []):
-                    try:
-                        rel_path = self._get_relative_path(Path(file_path))
-                    except Exception:
-                        rel_path = file_path
-
-                    all_violations.append({
-                        'file': rel_path,
-                        'line': msg.get('line', 0),
-                        'severity': 'error',
-                        'identifier': msg.get('identifier', ''),
-                        'message': msg.get('message', ''),
-                        'ignorable': msg.get('ignorable', True)
-                    })
-
-            # Also process general errors (not file-specific)
-            for error in data.get('errors', []):
-                all_violations.append({
-                    'file': '<project>',
-                    'line': 0,
-                    'severity': 'error',
-                    'identifier': '',
-                    'message': str(error),
-                    'ignorable': False
-                })
-
-            # Apply max_errors limit
-            if self.max_errors and len(all_violations) > self.max_errors:
-                all_violations = all_violations[:self.max_errors]
-
-            if not all_violations:
+            # Rows are generated lazily and capped by max_errors; nothing is buffered
+            rows = islice(self._csv_rows(data), self.max_errors or None)
+            first_row = next(rows, None)
+            if first_row is None:
                 return False
 
-            with open(output_file, 'w', encoding='utf-8', newline='') as f:
+            with open(output_file, 'w', encoding='utf-8', newline='', buffering=CSV_WRITE_BUFFER_SIZE) as f:
                 writer = csv.writer(f)
                 writer.writerow(['file', 'line', 'severity', 'identifier', 'message', 'ignorable'])
-
-                for v in all_violations:
-                    writer.writerow([v['file'], v['line'], v['severity'], v['identifier'], v['message'], v['ignorable']])
+                writer.writerow(first_row)
+                writer.writerows(rows)
 
             return True
 
-        except json.JSONDecodeError as e:
-            self.logger.error(f"Error parsing JSON for CSV output: {e}")
-            return False
         except Exception as e:
             self.logger.error(f"Error writing PHPStan CSV file: {e}")
             return False
+
+    def _csv_rows(self, data: dict) -> Iterator[list]:
+        """Yield CSV rows (file, line, severity, identifier, message, ignorable) from PHPStan JSON data."""
+        for file_path, file_data in data.get('files', {}).items():
+            try:
+                rel_path = self._get_relative_path(Path(file_path))
+            except Exception:
+                rel_path = file_path
+            for msg in file_data.get('messages', []):
+                yield [rel_path, msg.get('line', 0), 'error', msg.get('identifier', ''),
+                       msg.get('message', ''), msg.get('ignorable', True)]
+
+        # Also process general errors (not file-specific)
+        for error in data.get('errors', []):
+            yield ['<project>', 0, 'error', '', str(error), False]
@@ -6,12 +6,18 @@ class common to :class:`~rules.pmd_duplicates.PMDDuplicatesRule` and
 """
 
 import contextlib
+import functools
+import heapq
+import operator
+import os
+import re
 import tempfile
 from dataclasses import dataclass
 from pathlib import Path
 
-from models import RuleResult
+from models import RuleResult, Violation
 from rules.base import ProjectWideRule
+from rules.pmd_cache import cpd_cache_path, load_cpd_cache, save_cpd_cache, source_fingerprint
 
 # Default exclude patterns per language (glob patterns)
 DEFAULT_EXCLUDE_PATTERNS = {
@@ -43,9 +49,28 @@ LANGUAGE_TO_PMD = {
 # Windows reserved device names that cause errors when PMD tries to scan them
 WINDOWS_RESERVED_NAMES = {'nul', 'con', 'prn', 'aux'}
 
+# A reserved name as a path component (optionally with an extension, e.g. "\nul.txt"),
+# or as the last word of a line
+_RESERVED_NAMES_ALT = '|'.join(sorted(WINDOWS_RESERVED_NAMES))
+_WINDOWS_RESERVED_RE = re.compile(
+    rf'[\\/](?:{_RESERVED_NAMES_ALT})(?![a-z0-9_])|\b(?:{_RESERVED_NAMES_ALT})$', re.IGNORECASE)
+
+# pathlib globbing (which the exclude patterns follow) is case-insensitive on Windows
+_IGNORE_CASE = os.name == 'nt'
+
+# Sort key of keep_largest_duplications records
+_RECORD_LINES = operator.itemgetter(0)
+
+# Most excluded directories passed to PMD as --exclude arguments; files in any further ones
+# go into the --exclude-file-list instead, so the command line stays short
+MAX_EXCLUDE_DIR_ARGS = 64
+
+# PMD CPD exit codes for a completed scan: 0 without duplications, 4 with some
+_CPD_SUCCESS_CODES = (0, 4)
+
 
 def write_temp_path_list(paths, prefix: str, logger) -> Path | None:
-    """Write a set/list of paths (one resolved absolute path per line) to a temp file.
+    """Write absolute paths to a temp file, one per line, as given (duplicates dropped).
 
     Shared by both the exclude-file-list and the --file-list builders. Returns
     None when there is nothing to write or the temp file cannot be created.
@@ -55,8 +80,9 @@ def write_temp_path_list(paths, prefix: str, logger) -> Path | None:
     try:
         fd, temp_path = tempfile.mkstemp(suffix='.txt', prefix=prefix)
         with open(fd, 'w', encoding='utf-8') as f:
-            for p in sorted({Path(x).resolve() for x in paths}):
-                f.write(f"{p}\n")
+            # One write of the joined list instead of a formatted write per path
+            f.write('\n'.join(dict.fromkeys(map(os.fspath, paths))))
+            f.write('\n')
         return Path(temp_path)
     except Exception as e:
         logger.warning(f"Warning: Could not create temp path list: {e}")
@@ -98,21 +124,180 @@ def get_exclude_patterns(config, language: str | None) -> list[str]:
     return DEFAULT_EXCLUDE_PATTERNS.get(lang, DEFAULT_EXCLUDE_PATTERNS.get(pmd_lang, []))
 
 
-def generate_exclude_file_list(base_path, exclude_patterns: list[str], logger) -> Path | None:
-    """Write a temp file listing every project file matching exclude_patterns."""
-    if not exclude_patterns or not base_path:
+def _glob_segment_regex(segment: str) -> str:
+    """Regex for one glob path segment: '*' and '?' never cross '/', [...] classes as in fnmatch."""
+    out = []
+    i = 0
+    while i < len(segment):
+        c = segment[i]
+        i += 1
+        if c == '*':
+            out.append('[^/]*')
+        elif c == '?':
+            out.append('[^/]')
+        elif c == '[':
+            j = i
+            if j < len(segment) and segment[j] == '!':
+                j += 1
+            if j < len(segment) and segment[j] == ']':
+                j += 1
+            j = segment.find(']', j)
+            if j < 0:
+                out.append('\\[')
+                continue
+            body = segment[i:j].replace('\\', '\\\\')
+            i = j + 1
+            if body.startswith('!'):
+                body = '^/' + body[1:]
+            elif body.startswith('^'):
+                body = '\\' + body
+            out.append(f'[{body}]')
+        else:
+            out.append(re.escape(c))
+    return ''.join(out)
+
+
+def _rglob_regex(pattern: str) -> str | None:
+    """Regex matching the relative file paths that ``base_path.rglob(pattern)`` yields.
+
+    rglob anchors the pattern below any directory, i.e. it matches '**/<pattern>',
+    and '**' spans zero or more whole directories. None for patterns that can only
+    match directories (trailing '**').
+    """
+    segments = [seg for seg in pattern.split('/') if seg not in ('', '.')]
+    if not segments or segments[-1] == '**':
+        return None
+    parts = ['(?:[^/]+/)*']
+    for seg in segments[:-1]:
+        parts.append('(?:[^/]+/)*' if seg == '**' else _glob_segment_regex(seg) + '/')
+    parts.append(_glob_segment_regex(segments[-1]))
+    return ''.join(parts)
+
+
+def _excluded_dir_name(pattern: str) -> str | None:
+    """Directory name for patterns that exclude whole directories ('**/NAME/**' or 'NAME/**').
+
+    rglob anchors patterns below any directory, so both forms exclude every
+    directory called NAME. None for any other pattern (or a NAME with wildcards).
+    """
+    if pattern.startswith('**/'):
+        pattern = pattern[3:]
+    if not pattern.endswith('/**'):
+        return None
+    name = pattern[:-3]
+    if not name or any(c in name for c in '/*?[') or name in ('.', '..'):
         return None
-    excluded_files = set()
-    for pattern in exclude_patterns:
+    return name
+
+
+def _walk_files(dir_path: str):
+    """Yield the paths of all files below dir_path (symlinked directories are not followed)."""
+    pending = [dir_path]
+    while pending:
+        try:
+            with os.scandir(pending.pop()) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(entry.path)
+                    elif entry.is_file():
+                        yield entry.path
+        except OSError:
+            continue
+
+
+@functools.lru_cache(maxsize=32)
+def _compile_exclude_patterns(patterns: tuple[str, ...]) -> tuple[frozenset[str], re.Pattern | None, tuple[str, ...]]:
+    """Compile exclude patterns once per pattern set (rules are re-created for every run).
+
+    Returns the names of wholly excluded directories (see _excluded_dir_name), one
+    regex matching the relative paths of all other excluded files (None if there
+    are no such patterns), and the unsupported (absolute) patterns.
+    """
+    dir_names = set()
+    regexes = []
+    unsupported = []
+    for pattern in patterns:
+        if pattern.startswith('/') or (len(pattern) > 1 and pattern[1] == ':'):
+            unsupported.append(pattern)
+            continue
+        pattern = pattern.replace('\\', '/')
+        dir_name = _excluded_dir_name(pattern)
+        if dir_name is not None:
+            dir_names.add(dir_name.lower() if _IGNORE_CASE else dir_name)
+            continue
         if pattern.endswith('/**'):
             pattern = pattern + '/*'
+        regex = _rglob_regex(pattern)
+        if regex is not None:
+            regexes.append(regex)
+    matcher = None
+    if regexes:
+        matcher = re.compile('|'.join(f'(?:{r})' for r in regexes), re.IGNORECASE if _IGNORE_CASE else 0)
+    return frozenset(dir_names), matcher, tuple(unsupported)
+
+
+def find_excluded_paths(base_path, exclude_patterns: list[str], logger) -> tuple[list[str], list[str]]:
+    """Return the (directories, files) under base_path excluded by exclude_patterns.
+
+    Matches like ``base_path.rglob(pattern)`` for each pattern ('dir/**' also
+    covers files in subdirectories), but walks the tree once with os.scandir and
+    tests every file against all patterns in one compiled regex, instead of one
+    full rglob walk per pattern. Directories excluded as a whole ('**/NAME/**')
+    are returned as directories and not descended into, so e.g. node_modules is
+    never read. Symlinked directories are not descended into either. Paths are
+    absolute strings straight from the walk (base_path is made absolute once;
+    nothing is resolve()d per file).
+    """
+    dir_names, matcher, unsupported = _compile_exclude_patterns(tuple(exclude_patterns))
+    for pattern in unsupported:
+        logger.warning(f"Warning: Could not process pattern '{pattern}': Non-relative patterns are unsupported")
+    if not dir_names and matcher is None:
+        return [], []
+    matches = matcher.fullmatch if matcher is not None else None
+
+    excluded_dirs = []
+    excluded_files = []
+    pending = [(os.path.abspath(base_path), '')]
+    while pending:
+        dir_path, rel_dir = pending.pop()
         try:
-            for file_path in base_path.rglob(pattern):
-                if file_path.is_file():
-                    excluded_files.add(file_path.resolve())
-        except Exception as e:
-            logger.warning(f"Warning: Could not process pattern '{pattern}': {e}")
-    return write_temp_path_list(excluded_files, 'pmd_exclude_', logger)
+            with os.scandir(dir_path) as it:
+                for entry in it:
+                    rel_path = rel_dir + entry.name
+                    if entry.is_dir(follow_symlinks=False):
+                        if (entry.name.lower() if _IGNORE_CASE else entry.name) in dir_names:
+                            excluded_dirs.append(entry.path)
+                        else:
+                            pending.append((entry.path, rel_path + '/'))
+                    elif matches is not None and entry.is_file() and matches(rel_path):
+                        excluded_files.append(entry.path)
+        except OSError:
+            continue
+    return excluded_dirs, excluded_files
+
+
+def keep_largest_duplications(records: list[tuple[int, Violation]], max_errors: int | None) -> list[Violation]:
+    """Return the violations of (duplicated lines, violation) records, capped at max_errors.
+
+    Over the cap, keeps the violations with the most duplicated lines (largest
+    first, ties in report order) using a bounded heap instead of a full sort.
+    """
+    if max_errors and len(records) > max_errors:
+        records = heapq.nlargest(max_errors, records, key=_RECORD_LINES)
+    return [violation for _, violation in records]
+
+
+def _shared_excluded_paths(rule, directory: Path, exclude_patterns: list[str]) -> tuple[list[str], list[str]]:
+    """find_excluded_paths, walked once per directory and pattern set in an analyzer run (returns copies).
+
+    Kept in ``rule.run_cache``, so the duplicate and similar-code rules (and
+    languages sharing exclude patterns) walk a tree once between them.
+    """
+    key = ('pmd_excluded_paths', os.path.abspath(directory), tuple(exclude_patterns))
+    found = rule.run_cache.get(key)
+    if found is None:
+        found = rule.run_cache[key] = find_excluded_paths(directory, exclude_patterns, rule.logger)
+    return list(found[0]), list(found[1])
 
 
 def filter_pmd_stderr(stderr: str) -> str:
@@ -122,12 +307,8 @@ def filter_pmd_stderr(stderr: str) -> str:
     """
     if not stderr:
         return stderr
-    filtered = []
-    for line in stderr.strip().splitlines():
-        line_lower = line.lower()
-        if not any(f'\\{name}' in line_lower or line_lower.endswith(name) for name in WINDOWS_RESERVED_NAMES):
-            filtered.append(line)
-    return '\n'.join(filtered)
+    search = _WINDOWS_RESERVED_RE.search
+    return '\n'.join(line for line in stderr.strip().splitlines() if not search(line))
 
 
 def run_cpd(rule, cmd_base: list[str], directory: Path, exclude_paths: list[str],
@@ -139,11 +320,39 @@ def run_cpd(rule, cmd_base: list[str], directory: Path, exclude_paths: list[str]
     otherwise scan the whole directory with the configured excludes. Handles
     temp-file cleanup, stderr filtering, and delegates parsing to the rule's
     ``_result_from_pmd_stdout``.
+
+    Reports of successful runs are reused by identical jobs later in the same
+    analyzer run (``rule.run_cache``). With the rule's "cache" option on, a
+    whole-directory run also stores the report with a fingerprint of the job
+    and its source files, and the next run reuses it without starting PMD when
+    nothing has changed.
     """
+    job_key = _cpd_job_key(cmd_base, directory, exclude_paths, exclude_patterns, filtered)
+    # Languages that map to the same PMD language (e.g. flutter and dart) ask for identical
+    # jobs; within one analyzer run the first report spares the repeats their JVM startup
+    run_key = ('pmd_cpd_output', job_key)
+    cached = rule.run_cache.get(run_key)
+    if cached is not None:
+        rule.logger.info("Reusing PMD CPD report from an identical run.")
+        return rule._result_from_pmd_stdout(cached)
+
+    cache_path = cpd_cache_path(rule) if filtered is None else None
+    fingerprint = None
+    if cache_path:
+        ignored = [cache_path] + ([rule.output_folder] if rule.output_folder else [])
+        # Directories excluded by '**/NAME/**' patterns are skipped like exclude_paths
+        dir_names = _compile_exclude_patterns(tuple(exclude_patterns))[0]
+        fingerprint = source_fingerprint(job_key, directory, exclude_paths, dir_names, ignored)
+        stored = load_cpd_cache(cache_path, fingerprint, rule.logger)
+        if stored is not None:
+            rule.logger.info("Sources unchanged since the last run, reusing its PMD CPD report.")
+            rule.run_cache[run_key] = stored
+            return rule._result_from_pmd_stdout(stored)
+
     cmd = list(cmd_base)
     temps: list[Path | None] = []
     if filtered is not None:
-        file_list = write_temp_path_list(filtered, 'pmd_files_', rule.logger)
+        file_list = write_temp_path_list(sorted({p.resolve() for p in filtered}), 'pmd_files_', rule.logger)
         temps.append(file_list)
         cmd.extend(['--file-list', str(file_list)])
     else:
@@ -152,7 +361,14 @@ def run_cpd(rule, cmd_base: list[str], directory: Path, exclude_paths: list[str]
             exclude_dir = directory / path
             if exclude_dir.exists():
                 cmd.extend(['--exclude', str(exclude_dir)])
-        exclude_file_list = generate_exclude_file_list(directory, exclude_patterns, rule.logger)
+        excluded_dirs, excluded_files = _shared_excluded_paths(rule, directory, exclude_patterns)
+        # Whole excluded directories go on the command line (PMD skips them without
+        # reading them), up to a cap that keeps it within Windows' length limit
+        for path in excluded_dirs[:MAX_EXCLUDE_DIR_ARGS]:
+            cmd.extend(['--exclude', path])
+        for path in excluded_dirs[MAX_EXCLUDE_DIR_ARGS:]:
+            excluded_files.extend(_walk_files(path))
+        exclude_file_list = write_temp_path_list(excluded_files, 'pmd_exclude_', rule.logger)
         temps.append(exclude_file_list)
         if exclude_file_list:
             cmd.extend(['--exclude-file-list', str(exclude_file_list)])
@@ -163,6 +379,10 @@ def run_cpd(rule, cmd_base: list[str], directory: Path, exclude_paths: list[str]
             filtered_stderr = filter_pmd_stderr(result.stderr)
             if filtered_stderr:
                 rule.logger.warning(f"PMD CPD warning: {filtered_stderr}")
+        if result.stdout and result.returncode in _CPD_SUCCESS_CODES:
+            rule.run_cache[run_key] = result.stdout
+            if cache_path:
+                save_cpd_cache(cache_path, fingerprint, result.stdout, rule.logger)
         return rule._result_from_pmd_stdout(result.stdout)
     except Exception as e:
         rule.logger.error(f"Error running PMD CPD: {e}")
@@ -174,6 +394,13 @@ def run_cpd(rule, cmd_base: list[str], directory: Path, exclude_paths: list[str]
                     tmp.unlink()
 
 
+def _cpd_job_key(cmd_base: list[str], directory: Path, exclude_paths: list[str],
+                 exclude_patterns: list[str], filtered: list[Path] | None) -> tuple:
+    """Identify a CPD run by its inputs; the temp list files get new names every run."""
+    return (tuple(cmd_base), str(directory), tuple(exclude_paths), tuple(exclude_patterns),
+            None if filtered is None else tuple(sorted(map(str, filtered))))
+
+
 @dataclass(frozen=True)
 class CpdParams:
     """Resolved inputs for a CPD run, produced by PMDCpdRule._prepare_cpd."""
@@ -0,0 +1,78 @@
+"""Persistent report cache for the PMD CPD rules.
+
+Split out of pmd_base.py to keep that module focused on building and running
+CPD jobs. With a rule's "cache" option on, run_cpd stores the PMD report next
+to a fingerprint of the job and its source files, and reuses it while that
+fingerprint is unchanged.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+# Directory names compare case-insensitively on Windows, as in pmd_base
+_IGNORE_CASE = os.name == 'nt'
+
+
+def source_fingerprint(job_key: tuple, directory: Path, exclude_paths: list[str],
+                       dir_names: frozenset[str], ignored: list[Path]) -> str:
+    """Hash a CPD job with the path, mtime and size of every file it could scan.
+
+    Directories excluded as a whole (exclude_paths, and any directory named in
+    ``dir_names``, lower-cased on Windows) are skipped, so e.g. node_modules is
+    neither walked nor able to invalidate the hash. So are the ``ignored``
+    paths (the reports and the cache file itself, which change on every run).
+    """
+    skipped = {os.path.normcase(os.path.abspath(directory / path)) for path in exclude_paths}
+    skipped.update(os.path.normcase(os.path.abspath(path)) for path in ignored)
+    entries = []
+    pending = [os.path.abspath(directory)]
+    while pending:
+        try:
+            with os.scandir(pending.pop()) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        name = entry.name.lower() if _IGNORE_CASE else entry.name
+                        if name not in dir_names and os.path.normcase(entry.path) not in skipped:
+                            pending.append(entry.path)
+                    elif entry.is_file() and os.path.normcase(entry.path) not in skipped:
+                        st = entry.stat()
+                        entries.append(f"{entry.path}\0{st.st_mtime_ns}\0{st.st_size}")
+        except OSError:
+            continue
+    digest = hashlib.blake2b(repr(job_key).encode('utf-8'), digest_size=16)
+    digest.update('\n'.join(sorted(entries)).encode('utf-8', errors='surrogateescape'))
+    return digest.hexdigest()
+
+
+def cpd_cache_path(rule) -> Path | None:
+    """Report cache file of a CPD rule, or None when its "cache" option is off."""
+    if not rule.config.get('cache', False):
+        return None
+    folder = rule.output_folder or rule.base_path
+    return folder / f'.{rule.rule_name}_{rule.language}_cache.json' if folder else None
+
+
+def load_cpd_cache(cache_path: Path, fingerprint: str, logger) -> str | None:
+    """Return the stored PMD report if it was made for this fingerprint."""
+    try:
+        with open(cache_path, encoding='utf-8') as f:
+            stored = json.load(f)
+        if stored.get('fingerprint') == fingerprint:
+            return stored.get('stdout')
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError, AttributeError) as e:
+        logger.warning(f"Warning: Ignoring unreadable PMD CPD cache {cache_path}: {e}")
+    return None
+
+
+def save_cpd_cache(cache_path: Path, fingerprint: str, stdout: str, logger) -> None:
+    """Store a PMD report with the fingerprint of the sources it was made from."""
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(cache_path, 'w', encoding='utf-8') as f:
+            json.dump({'fingerprint': fingerprint, 'stdout': stdout}, f)
+    except OSError as e:
+        logger.warning(f"Warning: Could not write PMD CPD cache {cache_path}: {e}")
@@ -4,7 +4,7 @@ import xml.etree.ElementTree as ET
 from pathlib import Path
 
 from models import RuleResult, Severity, Violation
-from rules.pmd_base import PMDCpdRule, run_cpd
+from rules.pmd_base import PMDCpdRule, keep_largest_duplications, run_cpd
 
 
 class PMDDuplicatesRule(PMDCpdRule):
@@ -61,7 +61,6 @@ class PMDDuplicatesRule(PMDCpdRule):
         files. Detection still runs for everything else, so a brand new
         duplication involving an excepted file is still reported.
         """
-        violations: list[Violation] = []
         try:
             root = ET.fromstring(xml_content)
             # PMD 7.x emits a default namespace on the report; match tags
@@ -69,10 +68,10 @@ class PMDDuplicatesRule(PMDCpdRule):
             duplications = root.findall('{*}duplication')
         except ET.ParseError as e:
             self.logger.error(f"Error parsing PMD XML output: {e}")
-            return violations
+            return []
         except Exception as e:
             self.logger.error(f"Error parsing PMD XML output: {e}")
-            return violations
+            return []
 
         exceptions = self._load_exceptions()
         suppressed_reasons: list[str] = []
@@ -118,29 +117,25 @@ class PMDDuplicatesRule(PMDCpdRule):
             for reason in unique:
                 self.logger.info(f"  - {reason}")
 
+        # (duplicated lines, violation), so max_errors can keep the largest duplications
+        records: list[tuple[int, Violation]] = []
         for lines, tokens, occurrences, emit in survivors:
+            line_count = self._safe_int(lines)
             for raw, line_num, others_display in emit:
                 also_in = ', '.join(
                     f"{other_raw}:{other_line if other_line is not None else '?'}"
                     for other_raw, other_line in others_display
                 )
                 msg = f"Duplicate code found: {lines} lines, {tokens} tokens, {occurrences} occurrences — also in: {also_in}"
-                violations.append(Violation(
+                records.append((line_count, Violation(
                     file_path=raw,
                     rule_name='pmd_duplicates',
                     severity=Severity.WARNING,
                     message=msg,
                     line=line_num,
-                ))
-
-        if self.max_errors and len(violations) > self.max_errors:
-            def get_lines(v):
-                parts = v.message.split()
-                return int(parts[3]) if len(parts) >= 4 and parts[3].isdigit() else 0
-            violations.sort(key=get_lines, reverse=True)
-            violations = violations[:self.max_errors]
+                )))
 
-        return violations
+        return keep_largest_duplications(records, self.max_errors)
 
     def _to_relative_raw(self, file_path_str: str) -> str:
         """Path relative to base_path (OS separators), or the input unchanged."""
@@ -4,7 +4,7 @@ import xml.etree.ElementTree as ET
 from pathlib import Path
 
 from models import RuleResult, Severity, Violation
-from rules.pmd_base import PMDCpdRule, run_cpd
+from rules.pmd_base import PMDCpdRule, keep_largest_duplications, run_cpd
 
 
 class PMDSimilarCodeRule(PMDCpdRule):
@@ -62,65 +62,53 @@ class PMDSimilarCodeRule(PMDCpdRule):
 
     def _parse_xml_output(self, xml_content: str) -> list[Violation]:
         """Parse PMD CPD XML output string into violations with actual file paths."""
-        violations = []
+        # (duplicated lines, violation), so max_errors can keep the largest duplications
+        records: list[tuple[int, Violation]] = []
         try:
             root = ET.fromstring(xml_content)
             # PMD 7.x emits a default namespace; match namespace-agnostically.
             duplications = root.findall('{*}duplication')
 
-            if duplications:
-                total_lines = sum(int(d.get('lines', 0)) for d in duplications)
-                self.logger.info(f"\n{'='*80}\nSIMILAR CODE DETECTION RESULTS\n{'='*80}")
-                self.logger.info(f"Total similar pattern groups found: {len(duplications)}")
-                self.logger.info(f"Total similar code lines: {total_lines}\n{'='*80}\n")
-
+            # One pass: build the violations and total the lines for the summary
+            total_lines = 0
             for dup in duplications:
                 lines = dup.get('lines', 'N/A')
                 tokens = dup.get('tokens', 'N/A')
+                line_count = int(dup.get('lines', 0))
+                total_lines += line_count
                 files = dup.findall('{*}file')
                 occurrences = len(files)
 
-                for i, file_elem in enumerate(files):
+                # Each file's relative path is computed once and reused in the other
+                # occurrences' "also in" lists
+                locations = []
+                for file_elem in files:
                     file_path = file_elem.get('path', 'unknown')
-                    line_num = int(file_elem.get('line', 0)) or None
-
-                    # Make path relative to base_path
                     try:
                         rel_path = str(Path(file_path).relative_to(self.base_path))
                     except ValueError:
                         rel_path = file_path
+                    locations.append((rel_path, file_elem.get('line', '?')))
 
-                    # Build list of other files in this duplication
-                    other_files = []
-                    for j, other in enumerate(files):
-                        if i != j:
-                            other_path = other.get('path', 'unknown')
-                            other_line = other.get('line', '?')
-                            try:
-                                other_rel = str(Path(other_path).relative_to(self.base_path))
-                            except ValueError:
-                                other_rel = other_path
-                            other_files.append(f"{other_rel}:{other_line}")
-
-                    also_in = ', '.join(other_files)
+                for i, (rel_path, line) in enumerate(locations):
+                    also_in = ', '.join(f"{other_rel}:{other_line}"
+                                        for j, (other_rel, other_line) in enumerate(locations) if i != j)
                     msg = f"Similar code found: {lines} lines, {tokens} tokens, {occurrences} occurrences — also in: {also_in}"
-                    violations.append(Violation(
+                    records.append((line_count, Violation(
                         file_path=rel_path,
                         rule_name='pmd_similar_code',
                         severity=Severity.WARNING,
                         message=msg,
-                        line=line_num,
-                    ))
+                        line=int(files[i].get('line', 0)) or None,
+                    )))
+
+            if duplications:
+                self.logger.info(f"\n{'='*80}\nSIMILAR CODE DETECTION RESULTS\n{'='*80}")
+                self.logger.info(f"Total similar pattern groups found: {len(duplications)}")
+                self.logger.info(f"Total similar code lines: {total_lines}\n{'='*80}\n")
         except ET.ParseError as e:
             self.logger.error(f"Error parsing PMD XML output: {e}")
         except Exception as e:
             self.logger.error(f"Error parsing PMD XML output: {e}")
 
-        if self.max_errors and len(violations) > self.max_errors:
-            def get_lines(v):
-                parts = v.message.split()
-                return int(parts[3]) if len(parts) >= 4 and parts[3].isdigit() else 0
-            violations.sort(key=get_lines, reverse=True)
-            violations = violations[:self.max_errors]
-
-        return violations
+        return keep_largest_duplications(records, self.max_errors)
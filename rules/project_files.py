@@ -0,0 +1,65 @@
+"""
+Shared index of the file extensions present in a project.
+
+Rules that only need to know whether a project contains files of some kind
+(e.g. ESLint's "anything to lint?" and ".svelte files?" probes) consult one
+ProjectFileIndex per run instead of each walking the tree themselves.
+"""
+
+import os
+import threading
+from collections import Counter
+from pathlib import Path
+
+
+class ProjectFileIndex:
+    """Per-extension file counts for a directory tree, built by one lazy walk.
+
+    The walk happens on first query and is guarded by a lock, so rules running
+    in parallel share a single scan. Dependency and build directories
+    (SKIP_DIRS) are pruned before descending.
+    """
+
+    SKIP_DIRS = frozenset({'node_modules', '.git', '.svelte-kit', 'dist', 'build', '.next', '.dart_tool'})
+
+    def __init__(self, root: Path | None):
+        self.root = root
+        self._counts: Counter[str] | None = None
+        self._lock = threading.Lock()
+
+    def has_extension(self, *extensions: str) -> bool:
+        """Return True if any file ends in one of the given extensions (e.g. '.svelte')."""
+        counts = self._get_counts()
+        return any(counts[_normalize(ext)] for ext in extensions)
+
+    def count(self, extension: str) -> int:
+        """Return the number of files with the given extension."""
+        return self._get_counts()[_normalize(extension)]
+
+    def _get_counts(self) -> Counter[str]:
+        if self._counts is None:
+            with self._lock:
+                if self._counts is None:
+                    self._counts = self._scan() if self.root else Counter()
+        return self._counts
+
+    def _scan(self) -> Counter[str]:
+        """Depth-first os.scandir walk counting regular files by extension."""
+        counts: Counter[str] = Counter()
+        pending = [str(self.root)]
+        while pending:
+            try:
+                with os.scandir(pending.pop()) as it:
+                    for entry in it:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in self.SKIP_DIRS:
+                                pending.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            counts[os.path.splitext(entry.name)[1]] += 1
+            except OSError:
+                continue
+        return counts
+
+
+def _normalize(extension: str) -> str:
+    return extension if extension.startswith('.') else f'.{extension}'
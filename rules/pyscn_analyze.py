@@ -15,7 +15,7 @@ from pathlib import Path
 from typing import Any
 
 from models import RuleResult, Severity, Violation
-from rules.base import ProjectWideRule
+from rules.base import SEVERITY_ORDER, ProjectWideRule
 
 # Mapping pyscn dead-code severity strings to our Severity enum
 _DEAD_CODE_SEVERITY_MAP = {
@@ -82,8 +82,7 @@ class PyscnAnalyzeRule(ProjectWideRule):
             self.logger.info("pyscn: no issues found")
 
         if self.max_errors and len(violations) > self.max_errors:
-            severity_order = {Severity.ERROR: 0, Severity.WARNING: 1, Severity.INFO: 2}
-            violations.sort(key=lambda v: severity_order.get(v.severity, 3))
+            violations.sort(key=lambda v: SEVERITY_ORDER.get(v.severity, 3))
             violations = violations[:self.max_errors]
 
         if self.output_folder and violations:
@@ -22,6 +22,8 @@ class PythonCrapScoreRule(CrapScoreMixin, ProjectWideRule):
     """Per-function CRAP score for Python projects."""
 
     rule_name = 'python_crap_score'
+    # Writes coverage.json, which python_test_coverage also produces
+    parallel_safe = False
 
     def _run(self, _file_path: Path) -> RuleResult:
         self.logger.info("\nRunning python_crap_score check...")
@@ -31,6 +31,8 @@ class PythonTestCoverageRule(ProjectWideRule):
     """Run pytest + coverage.py and check coverage thresholds."""
 
     rule_name = 'python_test_coverage'
+    # Writes coverage.json, which python_crap_score also produces
+    parallel_safe = False
 
     def _run(self, _file_path: Path) -> RuleResult:
         self.logger.info("\nRunning python_test_coverage check...")
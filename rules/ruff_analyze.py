@@ -7,7 +7,7 @@ import json
 from pathlib import Path
 
 from models import LogLevel, RuleResult, Severity, Violation
-from rules.base import ProjectWideRule
+from rules.base import SEVERITY_ORDER, ProjectWideRule
 
 
 class RuffAnalyzeRule(ProjectWideRule):
@@ -67,12 +67,8 @@ class RuffAnalyzeRule(ProjectWideRule):
             # Parse JSON output
             violations = self._parse_ruff_json(output)
 
-            # Apply log level filter to violations
-            violations = self._filter_violations_by_log_level(violations)
-
-            # Apply max_errors limit to returned violations
-            if self.max_errors and len(violations) > self.max_errors:
-                violations = violations[:self.max_errors]
+            # Apply log level filter and max_errors limit to returned violations
+            violations = self._limit_violations(violations)
 
             # Print summary
             if violations:
@@ -214,8 +210,7 @@ class RuffAnalyzeRule(ProjectWideRule):
                 def diagnostic_sort_key(d):
                     code = d.get('code', '')
                     severity = self._map_ruff_severity(code)
-                    severity_order = {Severity.ERROR: 0, Severity.WARNING: 1, Severity.INFO: 2}
-                    return (severity_order.get(severity, 3),)
+                    return (SEVERITY_ORDER.get(severity, 3),)
 
                 filtered_diagnostics.sort(key=diagnostic_sort_key)
                 filtered_diagnostics = filtered_diagnostics[:self.max_errors]
@@ -4,10 +4,18 @@ Svelte check rule for TypeScript/Svelte type checking
 
 import csv
 import re
+from collections.abc import Iterable
 from pathlib import Path
+from typing import Any
 
 from models import RuleResult, Severity, Violation
-from rules.base import ProjectWideRule
+from rules.base import CSV_WRITE_BUFFER_SIZE, ProjectWideRule
+
+# Pattern: TIMESTAMP SEVERITY "FILE" LINE:COL "MESSAGE"
+# Note: This pattern assumes single-line diagnostic messages, which matches
+# svelte-check's --output machine format in practice. Multi-line messages
+# (containing embedded newlines in quoted strings) would not be captured.
+_MACHINE_LINE_RE = re.compile(r'^\d+\s+(ERROR|WARNING|HINT)\s+"([^"]+)"\s+(\d+):(\d+)\s+"(.+)"$')
 
 
 class SvelteCheckRule(ProjectWideRule):
@@ -44,16 +52,14 @@ class SvelteCheckRule(ProjectWideRule):
             cmd.extend(['--compiler-warnings', ','.join(pairs)])
 
         try:
-            result = self._run_subprocess(cmd, self.base_path)
-
-            output = result.stdout if result.stdout.strip() else result.stderr
-
-            violations = self._parse_machine_output(output)
-
-            violations = self._filter_violations_by_log_level(violations)
+            # Parse diagnostics while svelte-check is still running; stderr is merged into the stream
+            with self._stream_subprocess(cmd, self.base_path) as proc:
+                records = [(v, fields) for v, fields in self._parse_machine_lines(proc.stdout)
+                           if self._log_level_accepts(v.severity)]
 
-            if self.max_errors and len(violations) > self.max_errors:
-                violations = violations[:self.max_errors]
+            if self.max_errors and len(records) > self.max_errors:
+                records = records[:self.max_errors]
+            violations = [v for v, _ in records]
 
             if violations:
                 self.logger.info(f"svelte-check found {len(violations)} issue(s)")
@@ -62,7 +68,7 @@ class SvelteCheckRule(ProjectWideRule):
 
             if self.output_folder and violations:
                 output_file = self.output_folder / 'svelte_check.csv'
-                self._write_csv_output(output_file, violations)
+                self._write_csv_output(output_file, records)
 
             return self._ok(violations)
 
@@ -92,7 +98,20 @@ class SvelteCheckRule(ProjectWideRule):
             return Severity.INFO
 
     def _parse_machine_output(self, output: str) -> list[Violation]:
-        """Parse svelte-check machine output into violations.
+        """Parse svelte-check machine output into violations."""
+        return [v for v, _ in self._parse_machine_records(output)]
+
+    def _parse_machine_records(self, output: str) -> list[tuple[Violation, dict[str, Any]]]:
+        """Parse svelte-check machine output text into (violation, CSV fields) pairs."""
+        if not output or not output.strip():
+            return []
+        return self._parse_machine_lines(output.splitlines())
+
+    def _parse_machine_lines(self, lines: Iterable[str]) -> list[tuple[Violation, dict[str, Any]]]:
+        """Parse svelte-check machine output lines (e.g. a subprocess pipe) into (violation, CSV fields) pairs.
+
+        The fields dict carries base_message (the message without the location
+        suffix) so the CSV writer does not have to strip it back off.
 
         Machine output format:
         TIMESTAMP SEVERITY "FILE" LINE:COL "MESSAGE"
@@ -101,28 +120,19 @@ class SvelteCheckRule(ProjectWideRule):
         1234567890 ERROR "src/routes/+page.svelte" 10:5 "Type 'string' is not assignable to type 'number'"
 
         Args:
-            output: Machine-format output from svelte-check
+            lines: Machine-format output lines from svelte-check
 
         Returns:
-            List of violations
+            List of (violation, fields) pairs
         """
-        violations = []
-
-        if not output or not output.strip():
-            return violations
+        records = []
 
-        # Pattern: TIMESTAMP SEVERITY "FILE" LINE:COL "MESSAGE"
-        # Note: This pattern assumes single-line diagnostic messages, which matches
-        # svelte-check's --output machine format in practice. Multi-line messages
-        # (containing embedded newlines in quoted strings) would not be captured.
-        pattern = re.compile(r'^\d+\s+(ERROR|WARNING|HINT)\s+"([^"]+)"\s+(\d+):(\d+)\s+"(.+)"$')
-
-        for line in output.splitlines():
+        for line in lines:
             line = line.strip()
             if not line:
                 continue
 
-            match = pattern.match(line)
+            match = _MACHINE_LINE_RE.match(line)
             if not match:
                 continue
 
@@ -149,29 +159,26 @@ class SvelteCheckRule(ProjectWideRule):
                 line=line_num,
                 column=col_num
             )
-            violations.append(violation)
+            records.append((violation, {'base_message': message}))
 
-        return violations
+        return records
 
-    def _write_csv_output(self, output_file: Path, violations: list[Violation]):
+    def _write_csv_output(self, output_file: Path, records: list[tuple[Violation, dict[str, Any]]]):
         """Write svelte-check results to CSV file.
 
         Args:
             output_file: Path to CSV output file
-            violations: List of violations to write
+            records: (violation, fields) pairs from _parse_machine_records
         """
         try:
-            with open(output_file, 'w', encoding='utf-8', newline='') as f:
+            with open(output_file, 'w', encoding='utf-8', newline='', buffering=CSV_WRITE_BUFFER_SIZE) as f:
                 writer = csv.writer(f)
                 writer.writerow(['file', 'line', 'column', 'severity', 'message'])
-
-                for v in violations:
-                    line_num = v.line if v.line is not None else 0
-                    col_num = v.column if v.column is not None else 0
-                    # Strip the "at line X, column Y" suffix from the message for CSV
-                    msg = re.sub(r' at line \d+, column \d+$', '', v.message)
-
-                    writer.writerow([v.file_path, line_num, col_num, v.severity.value, msg])
+                writer.writerows(
+                    [v.file_path, v.line if v.line is not None else 0, v.column if v.column is not None else 0,
+                     v.severity.value, fields['base_message']]
+                    for v, fields in records
+                )
 
             self.logger.info(f"svelte-check report saved to: {output_file}")
 
@@ -4,10 +4,24 @@ TypeScript type checking rule using tsc --noEmit
 
 import csv
 import re
+from collections.abc import Iterable
 from pathlib import Path
+from typing import Any
 
 from models import RuleResult, Severity, Violation
-from rules.base import ProjectWideRule
+from rules.base import CSV_WRITE_BUFFER_SIZE, ProjectWideRule
+
+# "file(line,col): error|warning TSxxxx: message" lines of tsc output
+_DIAGNOSTIC_RE = re.compile(r'^(.+)\((\d+),(\d+)\): (error|warning) (TS\d+): (.+)$')
+
+
+def _parse_diagnostic_line(line: str) -> tuple[str, int, int, str, str, str] | None:
+    """Parse a stripped tsc output line into (file, line, column, severity, code, message)."""
+    match = _DIAGNOSTIC_RE.match(line)
+    if not match:
+        return None
+    file_path, line_num, col_num, severity, code, message = match.groups()
+    return file_path, int(line_num), int(col_num), severity, code, message
 
 
 class TscAnalyzeRule(ProjectWideRule):
@@ -40,27 +54,27 @@ class TscAnalyzeRule(ProjectWideRule):
             cmd.extend(['--project', tsconfig])
 
         try:
-            result = self._run_subprocess(cmd, self.base_path)
-
-            output = result.stdout if result.stdout.strip() else result.stderr
-
-            violations = self._parse_tsc_output(output)
+            # Parse diagnostics while tsc is still checking; stderr is merged into the stream
+            with self._stream_subprocess(cmd, self.base_path) as proc:
+                records = self._parse_tsc_lines(proc.stdout)
 
             # Filter Svelte resolve false positives (TS2614 referencing *.svelte)
             if self.config.get('skip_svelte_resolve_errors', False):
-                violations = [v for v in violations if not (
+                records = [(v, fields) for v, fields in records if not (
                     'TS2614' in v.message and '*.svelte' in v.message
                 )]
 
             # Filter by ignore_codes config
             ignore_codes = self.config.get('ignore_codes', [])
             if ignore_codes:
-                violations = [v for v in violations if not any(code in v.message for code in ignore_codes)]
+                records = [(v, fields) for v, fields in records
+                           if not any(code in v.message for code in ignore_codes)]
 
-            violations = self._filter_violations_by_log_level(violations)
+            records = [(v, fields) for v, fields in records if self._log_level_accepts(v.severity)]
 
-            if self.max_errors and len(violations) > self.max_errors:
-                violations = violations[:self.max_errors]
+            if self.max_errors and len(records) > self.max_errors:
+                records = records[:self.max_errors]
+            violations = [v for v, _ in records]
 
             if violations:
                 self.logger.info(f"tsc found {len(violations)} issue(s)")
@@ -69,7 +83,7 @@ class TscAnalyzeRule(ProjectWideRule):
 
             if self.output_folder and violations:
                 output_file = self.output_folder / 'tsc_analyze.csv'
-                self._write_csv_output(output_file, violations)
+                self._write_csv_output(output_file, records)
 
             return self._ok(violations)
 
@@ -82,39 +96,42 @@ class TscAnalyzeRule(ProjectWideRule):
             return self._failed(f"error running tsc: {e}")
 
     def _parse_tsc_output(self, output: str) -> list[Violation]:
-        """Parse tsc output into violations.
+        """Parse tsc output into violations."""
+        return [v for v, _ in self._parse_tsc_records(output)]
+
+    def _parse_tsc_records(self, output: str) -> list[tuple[Violation, dict[str, Any]]]:
+        """Parse tsc output text into (violation, CSV fields) pairs."""
+        if not output or not output.strip():
+            return []
+        return self._parse_tsc_lines(output.splitlines())
+
+    def _parse_tsc_lines(self, lines: Iterable[str]) -> list[tuple[Violation, dict[str, Any]]]:
+        """Parse tsc output lines (e.g. a subprocess pipe) into (violation, CSV fields) pairs.
 
         tsc output format (with --pretty false):
         file(line,col): error TS1234: message
 
+        The fields dict carries code and base_message so the CSV writer does
+        not have to read them back out of the violation message.
+
         Args:
-            output: Output from tsc --noEmit --pretty false
+            lines: Output lines from tsc --noEmit --pretty false
 
         Returns:
-            List of violations
+            List of (violation, fields) pairs
         """
-        violations = []
-
-        if not output or not output.strip():
-            return violations
-
-        pattern = re.compile(r'^(.+)\((\d+),(\d+)\): (error|warning) (TS\d+): (.+)$')
+        records = []
 
-        for line in output.splitlines():
+        for line in lines:
             line = line.strip()
             if not line:
                 continue
 
-            match = pattern.match(line)
-            if not match:
+            parsed = _parse_diagnostic_line(line)
+            if not parsed:
                 continue
 
-            file_path = match.group(1)
-            line_num = int(match.group(2))
-            col_num = int(match.group(3))
-            severity_str = match.group(4)
-            code = match.group(5)
-            message = match.group(6)
+            file_path, line_num, col_num, severity_str, code, message = parsed
 
             severity = Severity.ERROR if severity_str == 'error' else Severity.WARNING
 
@@ -133,35 +150,26 @@ class TscAnalyzeRule(ProjectWideRule):
                 line=line_num,
                 column=col_num
             )
-            violations.append(violation)
+            records.append((violation, {'code': code, 'base_message': message}))
 
-        return violations
+        return records
 
-    def _write_csv_output(self, output_file: Path, violations: list[Violation]):
+    def _write_csv_output(self, output_file: Path, records: list[tuple[Violation, dict[str, Any]]]):
         """Write tsc results to CSV file.
 
         Args:
             output_file: Path to CSV output file
-            violations: List of violations to write
+            records: (violation, fields) pairs from _parse_tsc_records
         """
         try:
-            with open(output_file, 'w', encoding='utf-8', newline='') as f:
+            with open(output_file, 'w', encoding='utf-8', newline='', buffering=CSV_WRITE_BUFFER_SIZE) as f:
                 writer = csv.writer(f)
                 writer.writerow(['file', 'line', 'column', 'severity', 'code', 'message'])
-
-                for v in violations:
-                    line_num = v.line if v.line is not None else 0
-                    col_num = v.column if v.column is not None else 0
-                    # Extract TSxxxx code from message prefix
-                    code_match = re.match(r'^(TS\d+): (.+)', v.message)
-                    if code_match:
-                        code = code_match.group(1)
-                        msg = re.sub(r' at line \d+, column \d+$', '', code_match.group(2))
-                    else:
-                        code = ''
-                        msg = re.sub(r' at line \d+, column \d+$', '', v.message)
-
-                    writer.writerow([v.file_path, line_num, col_num, v.severity.value, code, msg])
+                writer.writerows(
+                    [v.file_path, v.line if v.line is not None else 0, v.column if v.column is not None else 0,
+                     v.severity.value, fields['code'], fields['base_message']]
+                    for v, fields in records
+                )
 
             self.logger.info(f"tsc report saved to: {output_file}")
 
@@ -24,6 +24,11 @@ class Settings:
         if self.settings_file.exists():
             self.config.read(self.settings_file)
 
+    def reload(self) -> None:
+        """Merge in paths saved to the settings file since this instance was created."""
+        if self.settings_file.exists():
+            self.config.read(self.settings_file)
+
     def _save(self):
         with open(self.settings_file, 'w') as f:
             self.config.write(f)
@@ -0,0 +1,89 @@
+"""Project-wide rules run concurrently when rules.json sets "parallel_rules"."""
+import json
+import threading
+import time
+from pathlib import Path
+
+from analyzer import AnalyzerConfig, CodeAnalyzer
+from logger import Logger
+from models import RuleResult, RuleStatus
+
+
+def _analyzer(tmp_path: Path, logger: Logger | None = None, **rules) -> CodeAnalyzer:
+    rules_file = tmp_path / "rules.json"
+    rules_file.write_text(json.dumps(rules), encoding="utf-8")
+    return CodeAnalyzer(AnalyzerConfig(languages="php", path=str(tmp_path), rules_file=str(rules_file),
+                                       logger=logger or Logger(quiet=True)))
+
+
+class _RecordingLogger(Logger):
+    def __init__(self):
+        super().__init__()
+        self.lines = []
+
+    def _print(self, msg: str) -> None:
+        self.lines.append(msg)
+
+
+class _BarrierRule:
+    """Completes only once `parties` rules are inside check() at the same time."""
+
+    def __init__(self, name: str, barrier: threading.Barrier | None, parallel_safe: bool = True):
+        self.rule_name = name
+        self.parallel_safe = parallel_safe
+        self._barrier = barrier
+
+    def check(self, file_path):
+        if self._barrier is not None:
+            self._barrier.wait(timeout=5)
+        self.logger.info(f"{self.rule_name} output")
+        return RuleResult(rule_name=self.rule_name, status=RuleStatus.OK)
+
+
+class _TrackingRule:
+    """Records the most rules seen inside check() at the same time."""
+
+    def __init__(self, name: str, in_flight: list[str], peak: list[int]):
+        self.rule_name = name
+        self.parallel_safe = True
+        self._in_flight = in_flight
+        self._peak = peak
+
+    def check(self, file_path):
+        self._in_flight.append(self.rule_name)
+        self._peak.append(len(self._in_flight))
+        time.sleep(0.05)
+        self._in_flight.remove(self.rule_name)
+        return RuleResult(rule_name=self.rule_name, status=RuleStatus.OK)
+
+
+def test_parallel_safe_rules_overlap_and_results_keep_registry_order(tmp_path: Path):
+    # A barrier of 3 is only passed if the serial rule runs while both concurrent ones wait
+    barrier = threading.Barrier(3)
+    rules = [("a", _BarrierRule("a", barrier)), ("solo", _BarrierRule("solo", barrier, parallel_safe=False)),
+             ("b", _BarrierRule("b", barrier))]
+    analyzer = _analyzer(tmp_path, parallel_rules=2)
+    analyzer._run_project_rules(rules, tmp_path)
+    assert [r.rule_name for r in analyzer.results] == ["a", "solo", "b"]
+    assert analyzer.get_failures() == []
+
+
+def test_rule_output_is_printed_below_its_language_header(tmp_path: Path):
+    logger = _RecordingLogger()
+    analyzer = _analyzer(tmp_path, logger=logger, parallel_rules=2)
+    analyzer._print_language_header = lambda name: logger.info(f"--- {name} ---")
+    barrier = threading.Barrier(3)
+    rules = [("a", _BarrierRule("a", barrier)), ("solo", _BarrierRule("solo", barrier, parallel_safe=False)),
+             ("b", _BarrierRule("b", barrier))]
+    analyzer._run_project_rules(rules, tmp_path)
+    assert logger.lines == ["--- a ---", "a output", "--- solo ---", "solo output", "--- b ---", "b output"]
+    assert all(rule.logger is logger for _, rule in rules)
+
+
+def test_rules_run_one_at_a_time_without_parallel_rules(tmp_path: Path):
+    in_flight, peak = [], []
+    analyzer = _analyzer(tmp_path)
+    rules = [(name, _TrackingRule(name, in_flight, peak)) for name in ("a", "b")]
+    analyzer._run_project_rules(rules, tmp_path)
+    assert max(peak) == 1
+    assert analyzer.get_failures() == []
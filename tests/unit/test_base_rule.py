@@ -1,8 +1,11 @@
+import threading
+import time
 from pathlib import Path
 
 from logger import Logger
 from models import LogLevel, Severity, Violation
-from rules.base import BaseRule
+from rules import base
+from rules.base import BaseRule, ProjectWideRule
 from rules.context import RuleContext
 
 
@@ -81,3 +84,122 @@ def test_filter_violations_by_log_level_warning_keeps_err_and_warn():
     v_info = Violation(file_path="x.py", rule_name="r", severity=Severity.INFO, message="m")
     out = rule._filter_violations_by_log_level([v_err, v_warn, v_info])
     assert out == [v_err, v_warn]
+
+
+class _SlowProjectRule(ProjectWideRule):
+    def __init__(self, ctx):
+        super().__init__(ctx)
+        self.runs = 0
+
+    def _run(self, file_path):
+        self.runs += 1
+        time.sleep(0.05)
+        return self._ok([Violation(file_path="x.py", rule_name="r", severity=Severity.ERROR, message="m")])
+
+
+def test_project_wide_rule_runs_once_under_concurrent_checks():
+    rule = _SlowProjectRule(_ctx())
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(rule.check(Path("x.py")))) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert rule.runs == 1
+    assert sum(len(r.violations) for r in results) == 1
+
+
+def test_tool_path_lookup_is_shared_across_rule_instances(tmp_path: Path, monkeypatch):
+    lookups = []
+
+    def fake_which(name):
+        lookups.append(name)
+        return f"/usr/bin/{name}" if name == "fake-tool" else None
+
+    monkeypatch.setattr(base.shutil, "which", fake_which)
+    monkeypatch.setattr(base, "_TOOL_PATH_CACHE", {})
+    assert _NoopRule(_ctx(base_path=tmp_path))._get_tool_path("fake-tool") == "/usr/bin/fake-tool"
+    assert _NoopRule(_ctx(base_path=tmp_path))._get_tool_path("fake-tool") == "/usr/bin/fake-tool"
+    assert lookups == ["fake-tool"]
+
+
+def test_get_relative_path_resolves_each_file_once(tmp_path: Path, monkeypatch):
+    rule = _NoopRule(_ctx(base_path=tmp_path))
+    resolved = []
+    original = Path.resolve
+    monkeypatch.setattr(Path, "resolve", lambda self, *a: resolved.append(self.name) or original(self, *a))
+    for _ in range(3):
+        assert rule._get_relative_path(tmp_path / "a.py") == "a.py"
+    assert resolved == ["a.py"]
+
+
+def test_count_file_lines_matches_text_mode_iteration(tmp_path: Path):
+    f = tmp_path / "x.txt"
+    for data in [b"", b"a", b"a\n", b"a\nb", b"a\r\nb\r\n", b"a\rb\r", b"\r\n\r\r\n\n", "ü\n".encode()]:
+        f.write_bytes(data)
+        with open(f, encoding="utf-8") as text:
+            assert base.count_file_lines(f) == sum(1 for _ in text), data
+
+
+def test_limit_violations_filters_then_caps_without_draining_the_source():
+    rule = _NoopRule(_ctx(log_level=LogLevel.WARNING, max_errors=2))
+    produced = []
+
+    def source():
+        for severity in (Severity.INFO, Severity.ERROR, Severity.INFO, Severity.WARNING, Severity.ERROR):
+            produced.append(severity)
+            yield Violation(file_path="a.py", rule_name="r", severity=severity, message="m")
+
+    assert [v.severity for v in rule._limit_violations(source())] == [Severity.ERROR, Severity.WARNING]
+    assert len(produced) == 4
+
+
+def test_find_bundled_php_tool_prefers_bat_and_lists_folder_once(tmp_path: Path, monkeypatch):
+    bin_dir = tmp_path / "php" / "vendor" / "bin"
+    bin_dir.mkdir(parents=True)
+    (bin_dir / "phpstan").write_text("")
+    (bin_dir / "phpstan.bat").write_text("")
+    monkeypatch.setattr(base, "_SCRIPT_DIR", tmp_path)
+    base._bundled_php_bin_names.cache_clear()
+    try:
+        assert base.find_bundled_php_tool("phpstan") == str(bin_dir / "phpstan.bat")
+        (bin_dir / "phpstan.bat").unlink()
+        assert base.find_bundled_php_tool("phpstan") == str(bin_dir / "phpstan.bat")
+        assert base.find_bundled_php_tool("php-cs-fixer") is None
+    finally:
+        base._bundled_php_bin_names.cache_clear()
+
+
+def test_concurrent_tool_path_prompts_ask_once_and_keep_each_others_settings(tmp_path: Path, monkeypatch):
+    from settings import Settings
+
+    tool = tmp_path / "phpstan"
+    tool.write_text("")
+    settings_file = tmp_path / "settings.ini"
+    prompts = []
+
+    def fake_prompt_and_save(self, name):
+        prompts.append(name)
+        time.sleep(0.05)
+        self.set_path(name, str(tool))
+        return str(tool)
+
+    monkeypatch.setattr(base.shutil, "which", lambda name: None)
+    monkeypatch.setattr(base, "_TOOL_PATH_CACHE", {})
+    monkeypatch.setattr(Settings, "prompt_and_save", fake_prompt_and_save)
+    rules = [_NoopRule(_ctx(base_path=tmp_path)) for _ in range(2)]
+    for rule in rules:
+        rule._settings = Settings(str(settings_file), logger=Logger(quiet=True))
+    rules[1]._settings.set_path("php_cs_fixer", "fixer")
+
+    found = []
+    threads = [threading.Thread(target=lambda r=rule: found.append(r._resolve_tool_path("phpstan", "phpstan")))
+               for rule in rules]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert found == [str(tool), str(tool)]
+    assert prompts == ["phpstan"]
+    saved = Settings(str(settings_file), logger=Logger(quiet=True))
+    assert saved.get_path("php_cs_fixer") == "fixer"
@@ -33,3 +33,12 @@ def test_max_errors_non_int_returns_none(tmp_path):
     # Strings and bools are not valid caps.
     assert Config(_write_rules(tmp_path, {"max_errors": "20"})).get_global_max_errors() is None
     assert Config(_write_rules(tmp_path, {"max_errors": True})).get_global_max_errors() is None
+
+
+def test_parallel_rules_returns_worker_count(tmp_path):
+    assert Config(_write_rules(tmp_path, {"parallel_rules": 4})).get_global_parallel_rules() == 4
+
+
+def test_parallel_rules_ignores_invalid_values(tmp_path):
+    for value in (None, 1, True, "4"):
+        assert Config(_write_rules(tmp_path, {"parallel_rules": value})).get_global_parallel_rules() is None
@@ -0,0 +1,53 @@
+"""Unit tests for DartImportRulesRule forbidden-import matching."""
+from pathlib import Path
+
+from logger import Logger
+from models import RuleStatus, Severity
+from rules import DartImportRulesRule
+from rules.context import RuleContext
+
+
+def _project(tmp_path: Path) -> Path:
+    (tmp_path / "pubspec.yaml").write_text("name: myapp\n", encoding="utf-8")
+    lib = tmp_path / "lib"
+    (lib / "ui").mkdir(parents=True)
+    (lib / "data").mkdir()
+    (lib / "data" / "repo.dart").write_text("class Repo {}\n", encoding="utf-8")
+    (lib / "ui" / "page.dart").write_text(
+        "import 'package:flutter/material.dart';\n"
+        "import '../data/repo.dart';\n"
+        "import 'package:myapp/data/repo.dart';\n",
+        encoding="utf-8",
+    )
+    return tmp_path
+
+
+def _rule(base_path: Path, forbidden: list[dict]) -> DartImportRulesRule:
+    return DartImportRulesRule(RuleContext(
+        config={"forbidden_imports": forbidden}, base_path=base_path, logger=Logger(quiet=True),
+    ))
+
+
+def test_relative_and_package_imports_both_resolve_against_forbidden_pattern(tmp_path: Path):
+    base = _project(tmp_path)
+    result = _rule(base, [{"from": "ui/*", "cannot_import": ["data/*"], "message": "no data in ui"}]).check(base)
+    assert result.status == RuleStatus.OK
+    lines = sorted(v.message.rsplit("(line ", 1)[1] for v in result.violations)
+    assert lines == ["2)", "3)"]
+    assert all(v.severity == Severity.ERROR for v in result.violations)
+    assert all(v.file_path.replace("\\", "/") == "lib/ui/page.dart" for v in result.violations)
+
+
+def test_package_uri_pattern_matches_external_packages(tmp_path: Path):
+    base = _project(tmp_path)
+    result = _rule(base, [{"from": "ui/*", "cannot_import": ["package:flutter/*"], "severity": "warning"}]).check(base)
+    assert len(result.violations) == 1
+    assert "package:flutter/material.dart" in result.violations[0].message
+    assert result.violations[0].severity == Severity.WARNING
+
+
+def test_files_outside_from_pattern_are_not_checked(tmp_path: Path):
+    base = _project(tmp_path)
+    result = _rule(base, [{"from": "domain/*", "cannot_import": ["data/*"]}]).check(base)
+    assert result.status == RuleStatus.OK
+    assert result.violations == []
@@ -0,0 +1,45 @@
+"""Unit tests for the LCOV readers of the Dart coverage and CRAP rules."""
+from pathlib import Path
+
+from logger import Logger
+from rules import DartCrapScoreRule, DartTestCoverageRule
+from rules.context import RuleContext
+
+LCOV = """SF:{root}/lib/a.dart
+FN:1,main
+DA:1,3
+DA:2,0
+DA:3,1,checksum
+LF:3
+LH:2
+end_of_record
+  SF:{root}/lib/b.dart  \r
+DA:5,x
+BRDA:5,0,0,1
+end_of_record
+SF:{root}/lib/generated.g.dart
+DA:1,0
+end_of_record
+"""
+
+
+def _ctx(tmp_path: Path) -> RuleContext:
+    return RuleContext(config={}, base_path=tmp_path, logger=Logger(quiet=True))
+
+
+def test_coverage_totals_per_file(tmp_path: Path):
+    lcov = tmp_path / "lcov.info"
+    lcov.write_text(LCOV.format(root=tmp_path), encoding="utf-8")
+    coverage = DartTestCoverageRule(_ctx(tmp_path))._parse_lcov(lcov, ["*.g.dart"])
+    assert {Path(k).as_posix(): v for k, v in coverage.items()} == {
+        "lib/a.dart": {"total": 3, "covered": 2},
+        "lib/b.dart": {"total": 1, "covered": 0},
+    }
+
+
+def test_per_line_hits(tmp_path: Path):
+    lcov = tmp_path / "lcov.info"
+    lcov.write_text(LCOV.format(root=tmp_path), encoding="utf-8")
+    coverage = DartCrapScoreRule(_ctx(tmp_path))._parse_lcov_per_line(lcov)
+    assert coverage[str((tmp_path / "lib" / "a.dart").resolve())] == {1: 3, 2: 0, 3: 1}
+    assert coverage[str((tmp_path / "lib" / "b.dart").resolve())] == {}
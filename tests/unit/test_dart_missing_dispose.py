@@ -0,0 +1,64 @@
+"""Unit tests for DartMissingDisposeRule's disposal detection."""
+from pathlib import Path
+
+import rules.dart_missing_dispose as dart_missing_dispose
+from logger import Logger
+from rules import DartMissingDisposeRule
+from rules.context import RuleContext
+
+SOURCE = (
+    "class _State {\n"
+    "  final controller = TextEditingController();\n"
+    "  final timer = Timer(d, f);\n"
+    "  void dispose() {\n"
+    "    controller?.dispose();\n"
+    "  }\n"
+    "}"
+)
+
+
+def _rule(tmp_path: Path) -> DartMissingDisposeRule:
+    return DartMissingDisposeRule(RuleContext(config={}, base_path=tmp_path, logger=Logger(quiet=True)))
+
+
+def _refs(lines: list[int]):
+    return lambda *_args: [{'line': n} for n in lines]
+
+
+def test_read_source_offsets_delimit_each_line(tmp_path: Path):
+    dart_file = tmp_path / "a.dart"
+    dart_file.write_bytes(b"one\ntwo\n\nfour")
+    data, offsets = _rule(tmp_path)._read_source(dart_file)
+    lines = [data[offsets[i]:offsets[i + 1]].rstrip(b"\n") for i in range(len(offsets) - 1)]
+    assert lines == [b"one", b"two", b"", b"four"]
+
+
+def test_null_aware_cleanup_call_counts_as_disposed(tmp_path: Path, monkeypatch):
+    dart_file = tmp_path / "a.dart"
+    dart_file.write_text(SOURCE, encoding="utf-8")
+    monkeypatch.setattr(dart_missing_dispose, "find_references", _refs([2, 5]), raising=False)
+    rule = _rule(tmp_path)
+    source = rule._read_source(dart_file)
+    assert rule._is_field_disposed(dart_file, "controller", 2, 9, "dispose", source)
+
+
+def test_field_without_cleanup_call_is_not_disposed(tmp_path: Path, monkeypatch):
+    dart_file = tmp_path / "a.dart"
+    dart_file.write_text(SOURCE, encoding="utf-8")
+    # Out-of-range reference lines are ignored rather than raising
+    monkeypatch.setattr(dart_missing_dispose, "find_references", _refs([3, 99]), raising=False)
+    rule = _rule(tmp_path)
+    source = rule._read_source(dart_file)
+    assert not rule._is_field_disposed(dart_file, "timer", 3, 9, "cancel", source)
+
+
+def test_disposable_types_merge_config_in_original_order(tmp_path: Path):
+    rule = DartMissingDisposeRule(RuleContext(
+        config={"disposable_types": {"Timer": "stop"}, "custom_disposable_types": {"RestartableTimer": "cancel"}},
+        base_path=tmp_path, logger=Logger(quiet=True),
+    ))
+    types = rule._disposable_types
+    assert types["Timer"] == "stop"
+    assert types["AnimationController"] == "dispose"
+    # Defaults keep their positions (overrides included); new types are appended
+    assert list(types) == [*dart_missing_dispose.DEFAULT_DISPOSABLE_TYPES, "RestartableTimer"]
@@ -0,0 +1,136 @@
+"""Unit tests for DartUnusedCodeRule with the dart-lsp-mcp API faked out."""
+import asyncio
+from pathlib import Path
+
+import pytest
+
+import rules.dart_unused_code as dart_unused_code
+from logger import Logger
+from models import RuleStatus
+from rules import DartUnusedCodeRule
+from rules.context import RuleContext
+
+
+@pytest.fixture
+def project(tmp_path: Path) -> Path:
+    (tmp_path / "pubspec.yaml").write_text("name: myapp\n", encoding="utf-8")
+    lib = tmp_path / "lib"
+    lib.mkdir()
+    for name in ("a.dart", "b.dart", "c.dart"):
+        (lib / name).write_text("", encoding="utf-8")
+    return tmp_path
+
+
+@pytest.fixture
+def fake_lsp(monkeypatch, project: Path):
+    lib = project / "lib"
+    symbols = {
+        str(lib / "a.dart"): [{"name": "Used", "kind": "class", "line": 1, "col": 7},
+                              {"name": "_Private", "kind": "class", "line": 3, "col": 7}],
+        str(lib / "b.dart"): [{"name": "unusedFn", "kind": "function", "line": 2, "col": 1}],
+        str(lib / "c.dart"): [{"name": "main", "kind": "function", "line": 1, "col": 1}],
+    }
+    refs = {
+        ("Used", 1): [{"file": str(lib / "a.dart"), "line": 1}, {"file": str(lib / "c.dart"), "line": 4}],
+        ("unusedFn", 2): [{"file": str(lib / "b.dart"), "line": 2}],
+    }
+    names = {(f, s["line"]): s["name"] for f, syms in symbols.items() for s in syms}
+
+    monkeypatch.setattr(dart_unused_code, "HAS_DART_LSP", True)
+    monkeypatch.setattr(dart_unused_code, "get_document_symbols", lambda f: symbols.get(f, []), raising=False)
+    monkeypatch.setattr(dart_unused_code, "find_references",
+                        lambda f, line, _col: refs.get((names[(f, line)], line), []), raising=False)
+
+
+def _rule(base_path: Path, **config) -> DartUnusedCodeRule:
+    return DartUnusedCodeRule(RuleContext(config=config, base_path=base_path, logger=Logger(quiet=True)))
+
+
+@pytest.mark.usefixtures("fake_lsp")
+@pytest.mark.parametrize("workers", [1, 4])
+def test_only_symbols_without_other_references_are_reported(project: Path, workers: int):
+    result = _rule(project, max_workers=workers).check(project)
+    assert result.status == RuleStatus.OK
+    assert [v.message for v in result.violations] == [
+        "Unused function 'unusedFn' declared at line 2 - no references found in project",
+    ]
+    assert result.violations[0].file_path.replace("\\", "/") == "lib/b.dart"
+
+
+@pytest.mark.usefixtures("fake_lsp")
+def test_batched_reference_query_is_used_when_available(project: Path, monkeypatch):
+    calls = []
+
+    def fake_batch(file_path, positions):
+        calls.append((Path(file_path).name, positions))
+        return [dart_unused_code.find_references(file_path, line, col) for line, col in positions]
+
+    monkeypatch.setattr(dart_unused_code, "find_references_batch", fake_batch)
+    result = _rule(project, max_workers=1).check(project)
+    assert [v.message.split("'")[1] for v in result.violations] == ["unusedFn"]
+    # One batch per file with candidate symbols; private and ignored names are not queried
+    assert calls == [("a.dart", [(1, 7)]), ("b.dart", [(2, 1)])]
+
+
+@pytest.mark.usefixtures("fake_lsp")
+def test_names_used_in_other_files_skip_the_lsp_query(project: Path, monkeypatch):
+    (project / "lib" / "c.dart").write_text("void main() { Used(); }\n", encoding="utf-8")
+    queried = []
+    original = dart_unused_code.find_references
+    monkeypatch.setattr(dart_unused_code, "find_references",
+                        lambda f, line, col: queried.append(Path(f).name) or original(f, line, col))
+    result = _rule(project, max_workers=1).check(project)
+    assert [v.message.split("'")[1] for v in result.violations] == ["unusedFn"]
+    assert queried == ["b.dart"]
+
+
+@pytest.mark.usefixtures("fake_lsp")
+def test_identifier_index_can_be_disabled(project: Path, monkeypatch):
+    (project / "lib" / "c.dart").write_text("void main() { Used(); }\n", encoding="utf-8")
+    queried = []
+    original = dart_unused_code.find_references
+    monkeypatch.setattr(dart_unused_code, "find_references",
+                        lambda f, line, col: queried.append(Path(f).name) or original(f, line, col))
+    _rule(project, max_workers=1, use_identifier_index=False).check(project)
+    assert queried == ["a.dart", "b.dart"]
+
+
+@pytest.mark.usefixtures("fake_lsp")
+def test_async_client_api_is_pipelined_when_available(project: Path, monkeypatch):
+    in_flight = []
+    peak = []
+
+    def tracked(sync_fn):
+        async def query(*args):
+            in_flight.append(args)
+            peak.append(len(in_flight))
+            await asyncio.sleep(0)
+            in_flight.remove(args)
+            return sync_fn(*args)
+        return query
+
+    monkeypatch.setattr(dart_unused_code, "get_document_symbols_async", tracked(dart_unused_code.get_document_symbols))
+    monkeypatch.setattr(dart_unused_code, "find_references_async", tracked(dart_unused_code.find_references))
+    monkeypatch.setattr(dart_unused_code, "get_document_symbols", None)
+    result = _rule(project, max_workers=2).check(project)
+    assert [v.message.split("'")[1] for v in result.violations] == ["unusedFn"]
+    assert max(peak) == 2
+
+
+@pytest.mark.usefixtures("fake_lsp")
+def test_async_client_api_shares_the_symbol_cache(project: Path, monkeypatch):
+    _rule(project).check(project)  # sync API fills the cache
+    queried = []
+
+    async def get_symbols(path):
+        queried.append(path)
+        return []
+
+    async def find_refs(*_args):
+        return []
+
+    monkeypatch.setattr(dart_unused_code, "get_document_symbols_async", get_symbols)
+    monkeypatch.setattr(dart_unused_code, "find_references_async", find_refs)
+    (project / "lib" / "d.dart").write_text("", encoding="utf-8")
+    _rule(project, max_workers=2).check(project)
+    assert [Path(p).name for p in queried] == ["d.dart"]
@@ -0,0 +1,55 @@
+"""Unit tests for DartUnusedDependenciesRule."""
+from pathlib import Path
+
+import pytest
+
+from logger import Logger
+from models import RuleStatus
+from rules import DartUnusedDependenciesRule, dart_unused_dependencies
+from rules.context import RuleContext
+
+
+@pytest.fixture
+def project(tmp_path: Path) -> Path:
+    (tmp_path / "pubspec.yaml").write_text(
+        "name: myapp\n"
+        "dependencies:\n  http: any\n  unused_dep: any\n"
+        "dev_dependencies:\n  mocktail: any\n  lib_dev: any\n  unused_dev: any\n",
+        encoding="utf-8",
+    )
+    (tmp_path / "lib").mkdir()
+    (tmp_path / "lib" / "a.dart").write_text(
+        "import 'package:http/http.dart';\nimport 'package:lib_dev/x.dart';\n", encoding="utf-8")
+    (tmp_path / "test").mkdir()
+    (tmp_path / "test" / "a_test.dart").write_text("import 'package:mocktail/mocktail.dart';\n", encoding="utf-8")
+    return tmp_path
+
+
+def _unused_messages(project: Path) -> list[str]:
+    rule = DartUnusedDependenciesRule(RuleContext(config={}, base_path=project, logger=Logger(quiet=True)))
+    result = rule.check(project)
+    assert result.status == RuleStatus.OK
+    return [v.message for v in result.violations]
+
+
+def test_reports_dependencies_never_imported(project: Path):
+    messages = _unused_messages(project)
+    assert len(messages) == 2
+    assert "'unused_dep'" in messages[0]
+    assert "'unused_dev'" in messages[1]
+
+
+def test_scan_stops_once_every_dependency_is_seen(project: Path, monkeypatch):
+    pubspec = project / "pubspec.yaml"
+    pubspec.write_text("name: myapp\ndependencies:\n  http: any\n", encoding="utf-8")
+    (project / "lib" / "b.dart").write_text("import 'package:other/o.dart';\n", encoding="utf-8")
+    parsed = []
+    real_parse = dart_unused_dependencies.parse_imports
+
+    def counting_parse(path, sources=None):
+        parsed.append(path.name)
+        return real_parse(path, sources)
+
+    monkeypatch.setattr(dart_unused_dependencies, "parse_imports", counting_parse)
+    assert _unused_messages(project) == []
+    assert parsed == ["a.dart"]
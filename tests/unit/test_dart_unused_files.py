@@ -0,0 +1,67 @@
+"""Unit tests for DartUnusedFilesRule reachability analysis."""
+import os
+from pathlib import Path
+
+import pytest
+
+from logger import Logger
+from models import RuleStatus
+from rules import DartUnusedFilesRule
+from rules.context import RuleContext
+
+
+@pytest.fixture
+def project(tmp_path: Path) -> Path:
+    (tmp_path / "pubspec.yaml").write_text("name: myapp\n", encoding="utf-8")
+    lib = tmp_path / "lib"
+    (lib / "src").mkdir(parents=True)
+    (lib / "main.dart").write_text("import 'src/a.dart';\nimport 'dart:async';\n", encoding="utf-8")
+    (lib / "src" / "a.dart").write_text("import 'package:myapp/src/b.dart';\n", encoding="utf-8")
+    (lib / "src" / "b.dart").write_text("part 'b.g.dart';\n", encoding="utf-8")
+    (lib / "src" / "b.g.dart").write_text("part of 'b.dart';\n", encoding="utf-8")
+    (lib / "src" / "orphan.dart").write_text("", encoding="utf-8")
+    (lib / "src" / "tested.dart").write_text("", encoding="utf-8")
+    test_dir = tmp_path / "test"
+    test_dir.mkdir()
+    (test_dir / "tested_test.dart").write_text("import 'package:myapp/src/tested.dart';\n", encoding="utf-8")
+    return tmp_path
+
+
+def _unused(project: Path, **config) -> list[str]:
+    rule = DartUnusedFilesRule(RuleContext(config=config, base_path=project, logger=Logger(quiet=True)))
+    result = rule.check(project)
+    assert result.status == RuleStatus.OK
+    return sorted(v.file_path.replace("\\", "/") for v in result.violations)
+
+
+def test_files_unreachable_from_entry_points_are_reported(project: Path):
+    assert _unused(project) == ["lib/src/orphan.dart", "lib/src/tested.dart"]
+
+
+def test_test_imports_make_files_reachable_when_enabled(project: Path):
+    assert _unused(project, include_test_imports=True) == ["lib/src/orphan.dart"]
+
+
+def test_missing_entry_points_skip_the_check(project: Path):
+    rule = DartUnusedFilesRule(RuleContext(
+        config={"entry_points": ["lib/nope.dart"]}, base_path=project, logger=Logger(quiet=True),
+    ))
+    assert rule.check(project).status == RuleStatus.SKIPPED
+
+
+@pytest.mark.skipif(not hasattr(os, "symlink"), reason="needs symlinks")
+def test_symlinked_lib_file_does_not_shift_targets_outside_lib(tmp_path: Path):
+    (tmp_path / "pubspec.yaml").write_text("name: myapp\n", encoding="utf-8")
+    lib = tmp_path / "lib"
+    lib.mkdir()
+    (tmp_path / "bin").mkdir()
+    (lib / "main.dart").write_text("import 'a.dart';\n", encoding="utf-8")
+    (lib / "a.dart").write_text("", encoding="utf-8")
+    try:
+        (lib / "alias.dart").symlink_to(lib / "a.dart")
+    except OSError:
+        pytest.skip("symlinks not permitted")
+    (lib / "unused.dart").write_text("import '../bin/helper.dart';\n", encoding="utf-8")
+    (tmp_path / "bin" / "helper.dart").write_text("", encoding="utf-8")
+    # alias.dart and a.dart share a node, so lib files take one id fewer than listed
+    assert _unused(tmp_path) == ["lib/unused.dart"]
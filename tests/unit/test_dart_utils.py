@@ -0,0 +1,93 @@
+"""Unit tests for shared Dart utilities."""
+import os
+from pathlib import Path
+
+from rules import dart_utils
+from rules.dart_utils import get_document_symbols_cached, parse_imports
+
+
+def test_document_symbols_are_cached_until_the_file_changes(tmp_path: Path):
+    dart_file = tmp_path / "a.dart"
+    dart_file.write_text("class A {}\n", encoding="utf-8")
+    calls = []
+
+    def fetch(path):
+        calls.append(path)
+        return [{"name": "A", "kind": "class"}]
+
+    assert get_document_symbols_cached(dart_file, fetch) == [{"name": "A", "kind": "class"}]
+    get_document_symbols_cached(dart_file, fetch)
+    assert len(calls) == 1
+
+    dart_file.write_text("class A {}\nclass B {}\n", encoding="utf-8")
+    stat = dart_file.stat()
+    os.utime(dart_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    get_document_symbols_cached(dart_file, fetch)
+    assert len(calls) == 2
+
+
+def test_parse_imports_reports_type_uri_and_line(tmp_path: Path):
+    dart_file = tmp_path / "a.dart"
+    dart_file.write_text(
+        "// Copyright\n"
+        "import 'package:flutter/material.dart';\n"
+        "\n"
+        "export 'src/ü.dart';\n"
+        "part 'a.g.dart';\n"
+        "class A {}\n",
+        encoding="utf-8",
+    )
+    assert parse_imports(dart_file) == [
+        {"type": "import", "uri": "package:flutter/material.dart", "line": 2},
+        {"type": "export", "uri": "src/ü.dart", "line": 4},
+        {"type": "part", "uri": "a.g.dart", "line": 5},
+    ]
+
+
+def test_parse_imports_missing_file_returns_empty(tmp_path: Path):
+    assert parse_imports(tmp_path / "missing.dart") == []
+
+
+def test_collect_dart_files_applies_name_and_path_excludes(tmp_path: Path):
+    (tmp_path / "gen").mkdir()
+    for rel in ("a.dart", "a.g.dart", "b.freezed.dart", "gen/c.dart", "gen/d.txt"):
+        (tmp_path / rel).write_text("", encoding="utf-8")
+    files = dart_utils.collect_dart_files(tmp_path, ["*.g.dart", "*.freezed.dart", "gen/*.dart"])
+    assert [f.relative_to(tmp_path).as_posix() for f in files] == ["a.dart"]
+    assert len(dart_utils.collect_dart_files(tmp_path)) == 4
+
+
+def test_resolve_relative_import_uses_memoized_resolve(tmp_path: Path):
+    (tmp_path / "lib").mkdir()
+    target = tmp_path / "a.dart"
+    target.write_text("", encoding="utf-8")
+    importer = tmp_path / "lib" / "b.dart"
+    before = dart_utils.resolve_path.cache_info().hits
+    assert dart_utils.resolve_relative_import("../a.dart", importer) == target.resolve()
+    assert dart_utils.resolve_relative_import("../a.dart", importer) == target.resolve()
+    assert dart_utils.resolve_path.cache_info().hits == before + 1
+
+
+def test_build_identifier_index_collects_distinct_identifiers(tmp_path: Path):
+    dart_file = tmp_path / "a.dart"
+    dart_file.write_text("// äöü\nclass Foo extends $Bar { Foo(); final _x = Foo; }\n", encoding="utf-8")
+    index = dart_utils.build_identifier_index([dart_file, tmp_path / "missing.dart"])
+    assert index == {dart_file: {"class", "Foo", "extends", "$Bar", "final", "_x"}}
+
+
+def test_read_dart_source_is_shared_until_the_file_changes(tmp_path: Path):
+    sources = dart_utils.dart_source_cache({})
+    dart_file = tmp_path / "a.dart"
+    dart_file.write_bytes(b"import 'b.dart';\n")
+    first = dart_utils.read_dart_source(dart_file, sources)
+    assert dart_utils.read_dart_source(dart_file, sources) is first
+
+    dart_file.write_bytes(b"import 'c.dart';\n// changed\n")
+    stat = dart_file.stat()
+    os.utime(dart_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert dart_utils.read_dart_source(dart_file, sources) == b"import 'c.dart';\n// changed\n"
+    assert len(sources) == 1  # the stale copy was replaced
+
+    assert dart_utils.read_dart_source(tmp_path / "missing.dart", sources) is None
+    assert str(tmp_path / "missing.dart") not in sources
+    assert dart_utils.read_dart_source(dart_file) == b"import 'c.dart';\n// changed\n"
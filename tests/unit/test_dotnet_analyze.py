@@ -0,0 +1,83 @@
+"""Unit tests for DotnetAnalyzeRule MSBuild output handling."""
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from logger import Logger
+from models import LogLevel, RuleStatus, Severity
+from rules import DotnetAnalyzeRule
+from rules.context import RuleContext
+
+MSBUILD_OUTPUT = [
+    "  Determining projects to restore...\n",
+    r"C:\proj\src\A.cs(10,5): warning CS0168: The variable 'x' is declared but never used" + "\n",
+    r"C:\proj\src\B.cs(3,1): error CS1002: ; expected" + "\n",
+    "Build FAILED.\n",
+]
+
+
+def _rule(tmp_path: Path, **config) -> DotnetAnalyzeRule:
+    return DotnetAnalyzeRule(RuleContext(config=config, base_path=tmp_path, logger=Logger(quiet=True)))
+
+
+def test_parse_msbuild_output_reads_diagnostic_lines(tmp_path: Path):
+    violations = _rule(tmp_path)._parse_msbuild_output(MSBUILD_OUTPUT)
+    assert [v.severity for v in violations] == [Severity.WARNING, Severity.ERROR]
+    assert violations[0].message == "The variable 'x' is declared but never used (CS0168) at line 10, column 5"
+
+
+def test_build_output_is_streamed_from_the_subprocess(tmp_path: Path):
+    rule = _rule(tmp_path)
+    script = "import sys; sys.stdout.write(sys.argv[1]); sys.stderr.write(sys.argv[2])"
+    cmd = [sys.executable, "-c", script, MSBUILD_OUTPUT[1], MSBUILD_OUTPUT[2]]
+    with rule._stream_subprocess(cmd, tmp_path) as proc:
+        violations = rule._parse_msbuild_output(proc.stdout)
+    assert len(violations) == 2
+
+
+def test_stream_subprocess_raises_on_timeout(tmp_path: Path):
+    rule = _rule(tmp_path)
+    with pytest.raises(subprocess.TimeoutExpired):
+        with rule._stream_subprocess([sys.executable, "-c", "import time; time.sleep(5)"], tmp_path, timeout=0.2) as proc:
+            proc.stdout.read()
+
+
+def test_missing_dotnet_is_a_failure(tmp_path: Path, monkeypatch):
+    rule = _rule(tmp_path)
+    monkeypatch.setattr(rule, "_get_tool_path", lambda *_a, **_k: None)
+    assert rule.check(tmp_path).status == RuleStatus.FAILED
+
+
+def test_parse_stops_at_max_errors_after_filtering(tmp_path: Path):
+    lines = [r"C:\proj\A.cs(%d,1): warning CS0168: unused" % n for n in range(1, 4)]
+    lines.insert(0, r"C:\proj\A.cs(9,1): warning CS8618: nullable")
+    consumed = []
+
+    def tracked():
+        for line in lines:
+            consumed.append(line)
+            yield line
+
+    rule = _rule(tmp_path, ignore_codes=["CS8618"])
+    violations = rule._parse_msbuild_output(tracked(), max_errors=2)
+    assert [v.message.rsplit("line ", 1)[1] for v in violations] == ["1, column 1", "2, column 1"]
+    assert len(consumed) == 3
+
+
+def test_parse_drops_diagnostics_below_log_level(tmp_path: Path):
+    rule = DotnetAnalyzeRule(RuleContext(config={}, base_path=tmp_path, log_level=LogLevel.ERROR,
+                                         logger=Logger(quiet=True)))
+    assert [v.severity for v in rule._parse_msbuild_output(MSBUILD_OUTPUT)] == [Severity.ERROR]
+
+
+def test_csv_output_splits_code_line_and_column(tmp_path: Path):
+    rule = _rule(tmp_path)
+    violations = rule._parse_msbuild_output(MSBUILD_OUTPUT)
+    out = tmp_path / "dotnet_analyze.csv"
+    rule._write_csv_output(out, violations)
+    rows = out.read_text(encoding="utf-8").splitlines()
+    assert rows[0] == "file,line,column,severity,code,message"
+    assert rows[1].endswith(",10,5,WARNING,CS0168,The variable 'x' is declared but never used")
+    assert rows[2].endswith(",3,1,ERROR,CS1002,; expected")
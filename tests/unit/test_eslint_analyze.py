@@ -0,0 +1,106 @@
+"""Unit tests for ESLintAnalyzeRule command building."""
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from logger import Logger
+from models import RuleStatus
+from rules import ESLintAnalyzeRule
+from rules.context import RuleContext
+
+
+def _rule(tmp_path: Path, filter_files: set[str] | None = None, **config) -> ESLintAnalyzeRule:
+    return ESLintAnalyzeRule(RuleContext(config=config, base_path=tmp_path, logger=Logger(quiet=True),
+                                         filter_files=filter_files))
+
+
+def _fake_version(monkeypatch, rule: ESLintAnalyzeRule, stdout: str) -> list:
+    calls = []
+
+    def fake_run(cmd, cwd=None, timeout=300):
+        calls.append(cmd)
+        return subprocess.CompletedProcess(cmd, 0, stdout=stdout, stderr="")
+
+    monkeypatch.setattr(rule, "_run_subprocess", fake_run)
+    return calls
+
+
+@pytest.mark.parametrize(("version", "expected"), [
+    ("v9.34.0\n", ["--concurrency", "auto"]),
+    ("v9.10.0\n", []),
+    ("v8.57.1\n", []),
+    ("", []),
+])
+def test_concurrency_is_only_passed_to_supporting_versions(tmp_path: Path, monkeypatch, version, expected):
+    rule = _rule(tmp_path)
+    _fake_version(monkeypatch, rule, version)
+    assert rule._concurrency_args("eslint") == expected
+
+
+def test_eslint_version_is_probed_once(tmp_path: Path, monkeypatch):
+    rule = _rule(tmp_path, concurrency=4)
+    calls = _fake_version(monkeypatch, rule, "v10.0.0\n")
+    assert rule._concurrency_args("eslint") == ["--concurrency", "4"]
+    assert rule._concurrency_args("eslint") == ["--concurrency", "4"]
+    assert calls == [["eslint", "--version"]]
+
+
+def test_concurrency_is_skipped_when_disabled_or_filtering(tmp_path: Path, monkeypatch):
+    rule = _rule(tmp_path, concurrency="off")
+    calls = _fake_version(monkeypatch, rule, "v9.34.0\n")
+    assert rule._concurrency_args("eslint") == []
+
+    rule = _rule(tmp_path, filter_files={"src/a.ts"})
+    calls = _fake_version(monkeypatch, rule, "v9.34.0\n")
+    assert rule._concurrency_args("eslint") == []
+    assert calls == []
+
+
+def test_svelte_probe_skips_dependency_directories(tmp_path: Path):
+    (tmp_path / "node_modules" / "pkg").mkdir(parents=True)
+    (tmp_path / "node_modules" / "pkg" / "Button.svelte").write_text("", encoding="utf-8")
+    assert _rule(tmp_path)._has_svelte_files() is False
+
+    (tmp_path / "src" / "routes").mkdir(parents=True)
+    (tmp_path / "src" / "routes" / "+page.svelte").write_text("", encoding="utf-8")
+    assert _rule(tmp_path)._has_svelte_files() is True
+
+
+def test_project_config_detection_is_cached(tmp_path: Path):
+    rule = _rule(tmp_path)
+    assert rule._has_project_config() is False
+    (tmp_path / "eslint.config.js").write_text("export default [];\n", encoding="utf-8")
+    assert rule._has_project_config() is False
+    assert _rule(tmp_path)._has_project_config() is True
+
+
+def test_run_is_skipped_without_lintable_files(tmp_path: Path, monkeypatch):
+    (tmp_path / "node_modules" / "lib").mkdir(parents=True)
+    (tmp_path / "node_modules" / "lib" / "index.js").write_text("", encoding="utf-8")
+    rule = _rule(tmp_path)
+    monkeypatch.setattr(rule, "_find_local_eslint", lambda: pytest.fail("eslint should not be looked up"))
+    result = rule.check(tmp_path)
+    assert result.status == RuleStatus.SKIPPED
+
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "app.ts").write_text("", encoding="utf-8")
+    assert _rule(tmp_path)._has_lintable_files() is True
+
+
+def test_cache_is_opt_in(tmp_path: Path):
+    assert _rule(tmp_path)._cache_args() == []
+
+
+def test_cache_defaults_to_output_folder(tmp_path: Path):
+    output = tmp_path / "reports" / "eslint"
+    rule = ESLintAnalyzeRule(RuleContext(config={"cache": True}, base_path=tmp_path, output_folder=output,
+                                         logger=Logger(quiet=True)))
+    assert rule._cache_args() == ["--cache", "--cache-location", str(output / ".eslintcache"),
+                                  "--cache-strategy", "content"]
+    assert output.is_dir()
+
+
+def test_relative_cache_location_is_resolved_against_base_path(tmp_path: Path):
+    args = _rule(tmp_path, cache=True, cache_location="tmp/lint.cache")._cache_args()
+    assert args[2] == str(tmp_path / "tmp" / "lint.cache")
@@ -0,0 +1,90 @@
+"""Unit tests for ESLint JSON parsing and CSV reporting."""
+import csv
+import json
+from pathlib import Path
+
+from logger import Logger
+from models import LogLevel, Severity
+import rules.eslint_report as eslint_report
+from rules.eslint_report import iter_eslint_messages, parse_eslint_json, write_eslint_csv
+
+ESLINT_OUTPUT = json.dumps([
+    {"filePath": "/proj/src/a.js", "messages": [
+        {"ruleId": "no-unused-vars", "severity": 1, "message": "'x' is unused", "line": 3, "column": 7},
+        {"ruleId": "no-undef", "severity": 2, "message": "'y' is not defined", "line": 5, "column": 1},
+    ]},
+    {"filePath": "/proj/src/b.js", "messages": []},
+])
+
+
+def _relative(path: Path) -> str:
+    return path.name
+
+
+def test_iter_eslint_messages_flattens_file_results():
+    assert [(f, m["ruleId"]) for f, m in iter_eslint_messages(ESLINT_OUTPUT)] == [
+        ("/proj/src/a.js", "no-unused-vars"),
+        ("/proj/src/a.js", "no-undef"),
+    ]
+
+
+def test_parse_eslint_json_builds_violations():
+    violations = parse_eslint_json(ESLINT_OUTPUT, _relative, Logger(quiet=True))
+    assert [(v.file_path, v.severity, v.line, v.column) for v in violations] == [
+        ("a.js", Severity.WARNING, 3, 7),
+        ("a.js", Severity.ERROR, 5, 1),
+    ]
+    assert violations[1].message == "'y' is not defined (no-undef) at line 5, column 1"
+
+
+def test_parse_eslint_json_tolerates_malformed_output():
+    assert parse_eslint_json("Oops! Something went wrong", _relative, Logger(quiet=True)) == []
+
+
+def test_write_eslint_csv_filters_by_log_level(tmp_path: Path):
+    output_file = tmp_path / "eslint_analyze.csv"
+    write_eslint_csv(output_file, ESLINT_OUTPUT, LogLevel.ERROR, None, _relative, Logger(quiet=True))
+    with open(output_file, encoding="utf-8", newline="") as f:
+        rows = list(csv.reader(f))
+    assert rows == [
+        ["file", "line", "column", "severity", "rule", "message"],
+        ["a.js", "5", "1", "ERROR", "no-undef", "'y' is not defined"],
+    ]
+
+
+def test_write_eslint_csv_keeps_errors_first_when_capped(tmp_path: Path):
+    output_file = tmp_path / "eslint_analyze.csv"
+    write_eslint_csv(output_file, ESLINT_OUTPUT, LogLevel.ALL, 1, _relative, Logger(quiet=True))
+    with open(output_file, encoding="utf-8", newline="") as f:
+        rows = list(csv.reader(f))
+    assert [row[4] for row in rows[1:]] == ["no-undef"]
+
+
+def test_parse_eslint_json_accepts_raw_stdout_bytes():
+    violations = parse_eslint_json(ESLINT_OUTPUT.encode("utf-8"), _relative, Logger(quiet=True))
+    assert [(v.file_path, v.line) for v in violations] == [("a.js", 3), ("a.js", 5)]
+    assert parse_eslint_json(b"Oops! \xff", _relative, Logger(quiet=True)) == []
+
+
+def test_plain_json_fallback_is_used_without_orjson(monkeypatch):
+    monkeypatch.setattr(eslint_report, "_json_loads", json.loads)
+    assert len(list(iter_eslint_messages(ESLINT_OUTPUT.encode("utf-8")))) == 2
+    assert parse_eslint_json("[{", _relative, Logger(quiet=True)) == []
+
+
+def test_output_failing_partway_yields_no_records():
+    output = json.dumps([{"filePath": "/proj/a.js", "messages": [{"ruleId": "x", "severity": 1}]}, 5])
+    assert eslint_report.parse_eslint_messages(output, Logger(quiet=True)) == []
+
+
+def test_relative_paths_are_computed_once_per_file(tmp_path: Path):
+    calls = []
+
+    def relative(path: Path) -> str:
+        calls.append(path.name)
+        return path.name
+
+    violations = parse_eslint_json(ESLINT_OUTPUT, relative, Logger(quiet=True))
+    assert [v.file_path for v in violations] == ["a.js", "a.js"]
+    write_eslint_csv(tmp_path / "eslint.csv", ESLINT_OUTPUT, LogLevel.ALL, None, relative, Logger(quiet=True))
+    assert calls == ["a.js", "a.js"]
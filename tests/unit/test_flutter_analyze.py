@@ -0,0 +1,206 @@
+"""Unit tests for FlutterAnalyzeRule output parsing and CSV reporting."""
+import csv
+import sys
+from pathlib import Path
+
+import pytest
+
+from logger import Logger
+from models import LogLevel, RuleStatus, Severity
+from rules import FlutterAnalyzeRule, flutter_analyze
+from rules.context import RuleContext
+
+FLUTTER_OUTPUT = """Analyzing app...
+
+warning - Unused import: 'package:app/x.dart' - lib/main.dart:3:8 - unused_import
+   info - Prefer const with constant constructors - lib/a.dart:10:5 - prefer_const_constructors
+  error - Undefined name 'foo' - lib/b.dart:7:3 - undefined_identifier
+
+3 issues found. (ran in 1.2s)
+"""
+
+
+def _rule(tmp_path: Path, max_errors: int | None = None, **config) -> FlutterAnalyzeRule:
+    return FlutterAnalyzeRule(RuleContext(config=config, base_path=tmp_path, output_folder=tmp_path,
+                                          max_errors=max_errors, logger=Logger(quiet=True)))
+
+
+def test_parse_flutter_text_output_reads_issue_lines(tmp_path: Path):
+    violations = _rule(tmp_path)._parse_flutter_text_output(FLUTTER_OUTPUT)
+    assert [v.severity for v in violations] == [Severity.WARNING, Severity.INFO, Severity.ERROR]
+    assert violations[2].message == "Undefined name 'foo' (undefined_identifier) at line 7, column 3"
+    assert (violations[2].line, violations[2].column) == (7, 3)
+
+
+def test_parse_handles_windows_line_endings_and_continuations(tmp_path: Path):
+    output = ("  error - A long message that - lib/b.dart:7:3 - some_code\r\n"
+              "   info - wraps onto a second line -\r\n")
+    violations = _rule(tmp_path)._parse_flutter_text_output(output)
+    assert [v.message for v in violations] == [
+        "A long message that wraps onto a second line (some_code) at line 7, column 3"]
+
+
+@pytest.mark.parametrize("line, expected", [
+    ("   info - Use - instead - lib/a.dart:10:5 - some_code",
+     ("info", "Use - instead", "lib/a.dart", 10, 5, "some_code")),
+    ("warning - Msg - C:\\src\\a.dart:3:8 - unused_import",
+     ("warning", "Msg", "C:\\src\\a.dart", 3, 8, "unused_import")),
+    # Irregular spacing is left to the regex fallback
+    ("error\t-  Msg  -  lib/b.dart:7:3  -  undefined_identifier",
+     ("error", "Msg", "lib/b.dart", 7, 3, "undefined_identifier")),
+    ("3 issues found. (ran in 1.2s)", None),
+    ("info - no location here - some_code", None),
+    ("   info - wraps - onto a second line -", "wraps - onto a second line"),
+    ("   info\t-  wraps onto a second line  -", "wraps onto a second line"),
+    ("info - not indented -", None),
+])
+def test_parse_output_line(line: str, expected):
+    assert flutter_analyze._parse_output_line(line) == expected
+
+
+def test_csv_output_has_structured_columns(tmp_path: Path):
+    rule = _rule(tmp_path)
+    output_file = tmp_path / "flutter_analyze.csv"
+    rule._write_csv_output(output_file, rule._parse_flutter_records(FLUTTER_OUTPUT))
+    with open(output_file, encoding="utf-8", newline="") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == ["file", "line", "column", "severity", "code", "message"]
+    assert rows[3][1:] == ["7", "3", "ERROR", "undefined_identifier", "Undefined name 'foo'"]
+
+
+def test_csv_output_keeps_most_severe_rows_when_capped(tmp_path: Path):
+    rule = _rule(tmp_path, max_errors=1)
+    output_file = tmp_path / "flutter_analyze.csv"
+    rule._write_csv_output(output_file, rule._parse_flutter_records(FLUTTER_OUTPUT))
+    with open(output_file, encoding="utf-8", newline="") as f:
+        rows = list(csv.reader(f))
+    assert [row[4] for row in rows[1:]] == ["undefined_identifier"]
+
+
+
+def test_capped_csv_orders_by_severity_file_and_line(tmp_path: Path):
+    output = ("warning - W - lib/b.dart:9:1 - w_code\n"
+              "  error - E2 - lib/b.dart:4:1 - e_code\n"
+              "  error - E1 - lib/a.dart:20:1 - e_code\n"
+              "   info - I - lib/a.dart:1:1 - i_code\n")
+    rule = _rule(tmp_path, max_errors=3)
+    output_file = tmp_path / "flutter_analyze.csv"
+    rule._write_csv_output(output_file, rule._parse_flutter_records(output))
+    with open(output_file, encoding="utf-8", newline="") as f:
+        rows = list(csv.reader(f))
+    assert [row[5] for row in rows[1:]] == ["E1", "E2", "W"]
+
+def test_flutter_project_detection_is_cached(tmp_path: Path):
+    pubspec = tmp_path / "pubspec.yaml"
+    pubspec.write_text("name: app\ndependencies:\n  flutter:\n    sdk: flutter\n", encoding="utf-8")
+    rule = _rule(tmp_path)
+    assert rule._is_flutter_project() is True
+    pubspec.write_text("name: app\n", encoding="utf-8")
+    assert rule._is_flutter_project() is True
+    assert _rule(tmp_path)._is_flutter_project() is False
+
+
+
+def test_continuation_lines_only_extend_the_latest_issue(tmp_path: Path):
+    output = ("warning - Short - lib/a.dart:1:1 - a_code\n"
+              "  error - A long message - lib/b.dart:2:1 - b_code\n"
+              "   info - continued here -\n"
+              "   info - and here -\n"
+              "warning - Also short - lib/c.dart:3:1 - c_code\n")
+    records = _rule(tmp_path)._parse_flutter_records(output)
+    assert [issue.message for _, issue in records] == [
+        "Short", "A long message continued here and here", "Also short"]
+
+
+def test_issues_below_log_level_are_dropped_with_their_continuations(tmp_path: Path, monkeypatch):
+    rule = FlutterAnalyzeRule(RuleContext(config={}, base_path=tmp_path, log_level=LogLevel.ERROR,
+                                          logger=Logger(quiet=True)))
+    created = []
+    original = rule._create_violation
+    monkeypatch.setattr(rule, "_create_violation",
+                        lambda issue, rel_paths=None: created.append(issue) or original(issue, rel_paths))
+    output = ("  error - First - lib/a.dart:1:1 - a_code\n"
+              "warning - Dropped - lib/a.dart:2:1 - b_code\n"
+              "   info - dropped continuation -\n"
+              "  error - Second - lib/a.dart:3:1 - c_code\n")
+    violations = rule._parse_flutter_text_output(output)
+    assert [v.message.split(" (")[0] for v in violations] == ["First", "Second"]
+    assert len(created) == 2
+
+@pytest.mark.parametrize(("pubspec", "expected"), [
+    ("name: app\ndependencies:\n  flutter:\n    sdk: flutter\n", True),
+    ("name: app\ndev_dependencies:\n  # test deps\n  'flutter': any\n", True),
+    ("name: app\ndependencies:\n  http: any\nflutter:\n  uses-material-design: true\n", False),
+    ("name: app\ndependencies:\n  other:\n    flutter: any\n", False),
+    ("name: app\ndescription: |\n  flutter:\n", False),
+    ("name: app\ndependencies: {flutter: {sdk: flutter}}\n", None),
+    ("---\nname: app\ndependencies:\n  flutter: any\n", None),
+    ("name: app\rdependencies:\r  flutter: any\r", None),
+    # Both dependency sections have ended, so the malformed tail is never read
+    ("name: app\ndependencies:\n  http: any\ndev_dependencies:\n  test: any\nflutter: {assets: [a]}\n\tx\n", False),
+    ("dependencies:\n  http: any\r\ndev_dependencies:\r\n  flutter_test: any\r\n  flutter:\r\n", True),
+])
+def test_pubspec_scan_finds_flutter_dependency(pubspec: str, expected):
+    assert flutter_analyze._pubspec_depends_on_flutter(pubspec.encode("utf-8")) is expected
+
+
+def test_flow_style_pubspec_falls_back_to_yaml(tmp_path: Path):
+    (tmp_path / "pubspec.yaml").write_text("name: app\ndependencies: {flutter: {sdk: flutter}}\n", encoding="utf-8")
+    assert _rule(tmp_path)._is_flutter_project() is True
+
+
+def test_absolute_paths_under_project_root_are_sliced_without_resolving(tmp_path: Path, monkeypatch):
+    (tmp_path / "pubspec.yaml").write_text("name: app\ndependencies:\n  flutter:\n    sdk: flutter\n",
+                                           encoding="utf-8")
+    rule = _rule(tmp_path)
+    assert rule._is_flutter_project() is True
+    source = tmp_path.resolve() / "lib" / "main.dart"
+    monkeypatch.setattr(Path, "resolve", lambda self: pytest.fail("resolve() called"))
+    violations = rule._parse_flutter_text_output(f"error - Boom - {source}:1:2 - some_code\n")
+    assert violations[0].file_path == str(Path("lib", "main.dart"))
+
+
+def test_run_parses_streamed_output(tmp_path: Path):
+    script = f"import sys; sys.stdout.write({FLUTTER_OUTPUT!r}); sys.stderr.write('stderr noise\\n')"
+    rule = _rule(tmp_path)
+    result = rule._run_flutter_analyze([sys.executable, "-c", script])
+    assert result.status == RuleStatus.OK
+    assert [v.line for v in result.violations] == [3, 10, 7]
+    assert (tmp_path / "flutter_analyze.csv").exists()
+
+
+def test_uncapped_csv_is_streamed_in_output_order(tmp_path: Path):
+    rule = _rule(tmp_path)
+    violations = rule._stream_csv_output(tmp_path / "flutter_analyze.csv", rule._parse_flutter_records(FLUTTER_OUTPUT))
+    assert [v.line for v in violations] == [3, 10, 7]
+    with open(tmp_path / "flutter_analyze.csv", encoding="utf-8", newline="") as f:
+        rows = list(csv.reader(f))
+    assert [row[4] for row in rows[1:]] == ["unused_import", "prefer_const_constructors", "undefined_identifier"]
+
+
+def test_streamed_csv_is_not_created_without_issues(tmp_path: Path):
+    assert _rule(tmp_path)._stream_csv_output(tmp_path / "flutter_analyze.csv", iter([])) == []
+    assert not (tmp_path / "flutter_analyze.csv").exists()
+
+
+def test_streamed_csv_write_error_still_returns_every_violation(tmp_path: Path):
+    rule = _rule(tmp_path)
+    unwritable = tmp_path / "report_dir"
+    unwritable.mkdir()
+    violations = rule._stream_csv_output(unwritable, rule._parse_flutter_records(FLUTTER_OUTPUT))
+    assert [v.line for v in violations] == [3, 10, 7]
+
+
+def test_regex_fallback_rejects_long_lines_without_location():
+    # Formerly backtracked through every " - " split before failing
+    assert flutter_analyze._parse_output_line("error\t- " + "a - " * 3000 + "x") is None
+
+
+def test_relative_paths_are_resolved_once_per_file(tmp_path: Path, monkeypatch):
+    rule = _rule(tmp_path)
+    resolved = []
+    original = rule._relative_issue_path
+    monkeypatch.setattr(rule, "_relative_issue_path", lambda p: resolved.append(p) or original(p))
+    output = "".join(f"info - Issue {i} - lib/a.dart:{i}:1 - some_code\n" for i in range(1, 4))
+    assert len(rule._parse_flutter_text_output(output + FLUTTER_OUTPUT)) == 6
+    assert resolved == ["lib/a.dart", "lib/main.dart", "lib/b.dart"]
@@ -0,0 +1,91 @@
+"""Unit tests for MaxLinesRule."""
+from pathlib import Path
+
+import pytest
+
+from logger import Logger
+from models import Severity
+from rules import MaxLinesRule, max_lines
+from rules.context import RuleContext
+
+
+@pytest.fixture(autouse=True)
+def _empty_line_count_cache(monkeypatch):
+    monkeypatch.setattr(max_lines, "_LINE_COUNT_CACHE", {})
+
+
+def _rule(tmp_path: Path, **config) -> MaxLinesRule:
+    return MaxLinesRule(RuleContext(config={"warning": 3, "error": 5, **config}, base_path=tmp_path,
+                                    logger=Logger(quiet=True)))
+
+
+def _files(tmp_path: Path) -> list[Path]:
+    files = []
+    for i, line_count in enumerate([1, 3, 6, 0]):
+        path = tmp_path / f"f{i}.py"
+        path.write_text("x\n" * line_count, encoding="utf-8")
+        files.append(path)
+    return files
+
+
+def _summary(results):
+    return [[(v.file_path, v.severity, v.line_count) for v in r.violations] for r in results]
+
+
+def test_check_reports_warning_and_error_thresholds(tmp_path: Path):
+    rule = _rule(tmp_path)
+    assert _summary(rule.check(f) for f in _files(tmp_path)) == [
+        [], [("f1.py", Severity.WARNING, 3)], [("f2.py", Severity.ERROR, 6)], []]
+
+
+def test_check_many_in_process_pool_matches_serial_checks(tmp_path: Path, monkeypatch):
+    files = _files(tmp_path)
+    (tmp_path / "bad.py").write_bytes(b"\xff\xfe\n")
+    files.append(tmp_path / "bad.py")
+    serial = _summary(_rule(tmp_path).check(f) for f in files)
+    monkeypatch.setattr(max_lines, "_LINE_COUNT_CACHE", {})
+    monkeypatch.setattr(max_lines, "PARALLEL_MIN_FILES", 2)
+    monkeypatch.setattr(max_lines.os, "cpu_count", lambda: 2)
+    pools = []
+
+    class RecordingPool(max_lines.ProcessPoolExecutor):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            pools.append(self)
+
+    monkeypatch.setattr(max_lines, "ProcessPoolExecutor", RecordingPool)
+    assert _summary(_rule(tmp_path).check_many(files)) == serial
+    assert len(pools) == 1
+
+
+def test_unchanged_files_are_not_counted_again(tmp_path: Path, monkeypatch):
+    files = _files(tmp_path)
+    _rule(tmp_path).check_many(files)
+    monkeypatch.setattr(max_lines, "count_file_lines", lambda f: pytest.fail(f"{f} was counted again"))
+    files[0].write_text("x\n" * 4, encoding="utf-8")
+    counted = []
+    monkeypatch.setattr(max_lines, "count_file_lines", lambda f: counted.append(f) or 4)
+    assert _summary(_rule(tmp_path).check_many(files))[0] == [("f0.py", Severity.WARNING, 4)]
+    assert counted == [files[0]]
+
+
+def test_cache_is_persisted_between_runs_when_enabled(tmp_path: Path, monkeypatch):
+    files = _files(tmp_path)
+    _rule(tmp_path, cache=True).check_many(files)
+    assert (tmp_path / ".max_lines_cache.json").exists()
+
+    monkeypatch.setattr(max_lines, "_LINE_COUNT_CACHE", {})
+    monkeypatch.setattr(max_lines, "count_file_lines", lambda f: pytest.fail(f"{f} was counted again"))
+    assert _summary(_rule(tmp_path, cache=True).check_many(files))[2] == [("f2.py", Severity.ERROR, 6)]
+
+
+def test_cache_file_is_not_written_by_default(tmp_path: Path):
+    _rule(tmp_path).check_many(_files(tmp_path))
+    assert not (tmp_path / ".max_lines_cache.json").exists()
+
+
+def test_unreadable_files_count_as_zero_lines(tmp_path: Path):
+    f = tmp_path / "latin1.py"
+    f.write_bytes(b"caf\xe9\n" * 10)
+    assert max_lines._count_lines_worker(f)[0] == 0
+    assert _rule(tmp_path, warning=1).check(f).violations == []
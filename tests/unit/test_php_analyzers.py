@@ -0,0 +1,158 @@
+"""Unit tests for the PHPStan, PHP-CS-Fixer and Intelephense result handling."""
+import csv
+import json
+import subprocess
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from logger import Logger
+from models import LogLevel, RuleStatus, Severity
+from rules import (IntelephenseAnalyzeRule, PHPCSFixerAnalyzeRule, PHPStanAnalyzeRule, php_cs_fixer_report,
+                   phpstan_analyze)
+from rules.context import RuleContext
+
+PHPSTAN_OUTPUT = json.dumps({
+    "totals": {"errors": 1, "file_errors": 3},
+    "files": {
+        "/src/A.php": {"errors": 2, "messages": [
+            {"message": "Undefined variable $x", "line": 4, "ignorable": True, "identifier": "variable.undefined"},
+            {"message": "Missing return type", "line": 9, "ignorable": True},
+        ]},
+        "/src/B.php": {"errors": 1, "messages": [{"message": "Dead code", "line": 2, "ignorable": False}]},
+    },
+    "errors": ["Internal error"],
+})
+
+
+def _ctx(tmp_path: Path, **overrides) -> RuleContext:
+    return RuleContext(**{"config": {}, "base_path": tmp_path, "output_folder": tmp_path,
+                          "logger": Logger(quiet=True), **overrides})
+
+
+def _read_csv(path: Path) -> list[list[str]]:
+    with open(path, encoding="utf-8", newline="") as f:
+        return list(csv.reader(f))
+
+
+def test_phpstan_csv_lists_file_messages_then_general_errors(tmp_path: Path):
+    rule = PHPStanAnalyzeRule(_ctx(tmp_path))
+    assert rule._write_csv_data(tmp_path / "phpstan.csv", json.loads(PHPSTAN_OUTPUT)) is True
+    rows = _read_csv(tmp_path / "phpstan.csv")
+    assert rows[0] == ["file", "line", "severity", "identifier", "message", "ignorable"]
+    assert [row[4] for row in rows[1:]] == ["Undefined variable $x", "Missing return type", "Dead code",
+                                            "Internal error"]
+    assert rows[1][3] == "variable.undefined"
+    assert rows[4][:2] == ["<project>", "0"]
+
+
+def test_phpstan_csv_is_capped_by_max_errors(tmp_path: Path):
+    rule = PHPStanAnalyzeRule(_ctx(tmp_path, max_errors=2))
+    rule._write_csv_data(tmp_path / "phpstan.csv", json.loads(PHPSTAN_OUTPUT))
+    assert len(_read_csv(tmp_path / "phpstan.csv")) == 3
+
+
+def test_phpstan_csv_is_not_written_without_issues(tmp_path: Path):
+    rule = PHPStanAnalyzeRule(_ctx(tmp_path))
+    empty = {"totals": {}, "files": {"/src/A.php": {"messages": []}}, "errors": []}
+    assert rule._write_csv_data(tmp_path / "phpstan.csv", empty) is False
+    assert not (tmp_path / "phpstan.csv").exists()
+
+
+def _diagnostic(severity: str, line: int) -> SimpleNamespace:
+    return SimpleNamespace(file_path="src/A.php", line=line, column=1, severity=severity, message=f"{severity} {line}")
+
+
+def test_intelephense_violations_are_filtered_then_capped(tmp_path: Path):
+    diagnostics = [_diagnostic("warning", 1), _diagnostic("error", 2), _diagnostic("hint", 3),
+                   _diagnostic("error", 4), _diagnostic("error", 5)]
+    rule = IntelephenseAnalyzeRule(_ctx(tmp_path, log_level=LogLevel.ERROR, max_errors=2))
+    result = rule._run_intelephense_check(lambda **_: diagnostics)
+    assert [v.message for v in result.violations] == ["error 2 at line 2:1", "error 4 at line 4:1"]
+    assert all(v.severity == Severity.ERROR for v in result.violations)
+    # The CSV keeps the first max_errors diagnostics as reported
+    assert [row[4] for row in _read_csv(tmp_path / "intelephense_analyze.csv")[1:]] == ["warning 1", "error 2"]
+
+
+def _fake_subprocess(monkeypatch, rule, stdout: str) -> None:
+    def fake_run(cmd, cwd=None, timeout=300, text=True):
+        assert text is False
+        return subprocess.CompletedProcess(cmd, 1, stdout=stdout.encode(), stderr=b"")
+
+    monkeypatch.setattr(rule, "_run_subprocess", fake_run)
+
+
+def test_phpstan_output_is_parsed_once_for_violations_and_csv(tmp_path: Path, monkeypatch):
+    calls = []
+    monkeypatch.setattr(phpstan_analyze, "_json_loads", lambda s: calls.append(s) or json.loads(s))
+    rule = PHPStanAnalyzeRule(_ctx(tmp_path))
+    _fake_subprocess(monkeypatch, rule, PHPSTAN_OUTPUT)
+    result = rule._run_phpstan_check("phpstan")
+    assert len(result.violations) == 4
+    assert len(_read_csv(tmp_path / "phpstan_analyze.csv")) == 5
+    assert len(calls) == 1
+
+
+def test_phpstan_non_json_output_fails(tmp_path: Path, monkeypatch):
+    rule = PHPStanAnalyzeRule(_ctx(tmp_path))
+    _fake_subprocess(monkeypatch, rule, "PHP Fatal error: out of memory")
+    assert rule._run_phpstan_check("phpstan").status == RuleStatus.FAILED
+
+
+FIXER_OUTPUT = json.dumps({"files": [
+    {"name": "src/A.php", "appliedFixers": ["braces", "indentation_type"]},
+    {"name": "src/B.php", "appliedFixers": []},
+]})
+
+
+def test_fixer_report_builds_violations_and_csv_from_parsed_data(tmp_path: Path):
+    logger = Logger(quiet=True)
+    data = php_cs_fixer_report.load_fixer_json(FIXER_OUTPUT, logger)
+    violations = list(php_cs_fixer_report.iter_fixer_violations(data, lambda p: p.as_posix(), logger))
+    assert [(v.file_path, v.message) for v in violations] == [
+        ("src/A.php", "Code style issues found. Would apply fixers: braces, indentation_type")]
+    php_cs_fixer_report.write_fixer_csv_from_data(tmp_path / "fixer.csv", data, None, lambda p: p.as_posix(), logger)
+    assert _read_csv(tmp_path / "fixer.csv")[1] == ["src/A.php", "warning", "braces, indentation_type", "2"]
+
+
+def test_fixer_malformed_json_yields_no_data():
+    logger = Logger(quiet=True)
+    assert php_cs_fixer_report.load_fixer_json("not json", logger) is None
+    assert php_cs_fixer_report.load_fixer_json(b"not json", logger) is None
+
+
+def test_phpstan_exclude_patterns_become_directory_arguments(tmp_path: Path, monkeypatch):
+    rule = PHPStanAnalyzeRule(_ctx(tmp_path, config={"exclude_patterns": ["vendor/**", "**/cache", "tmp"]}))
+    commands = []
+    monkeypatch.setattr(rule, "_run_subprocess",
+                        lambda cmd, cwd=None, timeout=300, text=True: commands.append(cmd)
+                        or subprocess.CompletedProcess(cmd, 0, stdout=b"", stderr=b""))
+    rule._run_phpstan_check("phpstan")
+    assert commands[0][commands[0].index("--exclude"):][:6] == [
+        "--exclude", "vendor", "--exclude", "cache", "--exclude", "tmp"]
+
+
+def test_intelephense_severity_mapping(tmp_path: Path):
+    rule = IntelephenseAnalyzeRule(_ctx(tmp_path))
+    assert [rule._map_severity(s) for s in ("error", "Warning", "hint", "info", "other")] == [
+        Severity.ERROR, Severity.WARNING, Severity.INFO, Severity.INFO, Severity.WARNING]
+
+
+def test_phpstan_max_errors_stops_building_violations_at_the_cap(tmp_path: Path, monkeypatch):
+    rule = PHPStanAnalyzeRule(_ctx(tmp_path, max_errors=1))
+    resolved = []
+    monkeypatch.setattr(rule, "_get_relative_path", lambda p: resolved.append(p) or p.as_posix())
+    violations = rule._limit_violations(rule._iter_violations(json.loads(PHPSTAN_OUTPUT)))
+    assert [v.message for v in violations] == ["Undefined variable $x [variable.undefined] at line 4"]
+    assert resolved == [Path("/src/A.php")]
+
+
+def test_fixer_skips_building_violations_when_warnings_are_filtered_out(tmp_path: Path, monkeypatch):
+    rule = PHPCSFixerAnalyzeRule(_ctx(tmp_path, log_level=LogLevel.ERROR))
+    _fake_subprocess(monkeypatch, rule, FIXER_OUTPUT)
+    monkeypatch.setattr(rule, "_get_relative_path", lambda p: pytest.fail("violations were built"))
+    result = rule._run_fixer_check("php-cs-fixer")
+    assert result.status == RuleStatus.OK
+    assert result.violations == []
+    assert not (tmp_path / "php_cs_fixer.csv").exists()
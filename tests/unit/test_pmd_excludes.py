@@ -0,0 +1,82 @@
+"""Tests for the PMD CPD exclude-pattern walk (find_excluded_paths).
+
+The walk must exclude exactly the files the previous per-pattern
+``base_path.rglob(pattern)`` implementation selected, whether it lists them
+directly or excludes a whole directory containing them.
+"""
+import itertools
+from pathlib import Path
+
+from logger import Logger
+from rules import pmd_base
+from rules.pmd_base import find_excluded_paths
+
+DIRS = ['node_modules', 'vendor', '__pycache__', 'build', 'lib', 'src']
+FILES = ['a.dart', 'b.g.dart', 'x.pyc', '.h.pyc', 'm.py', 'a1.txt', 'b.txt']
+PATTERNS = ['*.g.dart', '**/__pycache__/**', '*.pyc', '**/node_modules/**', 'vendor/**', 'lib/*.dart',
+            'src/**/a.dart', 'a?.txt', '[!a]*.txt', '[ab].txt', 'lib', '**', '**/lib/**/x.pyc']
+
+
+def _tree(root: Path) -> None:
+    for d1, d2 in itertools.product([''] + DIRS, [''] + DIRS[:3]):
+        d = root / d1 / d2
+        d.mkdir(parents=True, exist_ok=True)
+        for name in FILES:
+            (d / name).write_text('')
+
+
+def _rglob(root: Path, pattern: str) -> set[str]:
+    if pattern.endswith('/**'):
+        pattern = pattern + '/*'
+    return {str(f) for f in root.rglob(pattern) if f.is_file()}
+
+
+def _excluded(root: Path, patterns: list[str]) -> set[str]:
+    dirs, files = find_excluded_paths(root, patterns, Logger(quiet=True))
+    return set(files).union(*(pmd_base._walk_files(d) for d in dirs))
+
+
+def test_exclude_walk_matches_rglob_per_pattern(tmp_path: Path):
+    _tree(tmp_path)
+    for pattern in PATTERNS:
+        assert _excluded(tmp_path, [pattern]) == _rglob(tmp_path, pattern), pattern
+
+
+def test_exclude_walk_matches_union_of_patterns(tmp_path: Path):
+    _tree(tmp_path)
+    expected = set().union(*(_rglob(tmp_path, p) for p in PATTERNS))
+    assert _excluded(tmp_path, PATTERNS) == expected
+
+
+def test_absolute_patterns_are_skipped(tmp_path: Path):
+    (tmp_path / 'a.pyc').write_text('')
+    assert find_excluded_paths(tmp_path, ['/abs/**', '*.pyc'], Logger(quiet=True)) == ([], [str(tmp_path / 'a.pyc')])
+
+
+def test_directory_patterns_prune_instead_of_listing_files(tmp_path: Path):
+    _tree(tmp_path)
+    dirs, files = find_excluded_paths(tmp_path, ['**/node_modules/**', 'vendor/**', '*.pyc'], Logger(quiet=True))
+    # Pruned at the top level; below other directories at any depth, as rglob anchors patterns
+    expected = {'node_modules', 'vendor'} | {f'{d}/{name}' for d in DIRS[2:] for name in ('node_modules', 'vendor')}
+    assert {Path(d).relative_to(tmp_path).as_posix() for d in dirs} == expected
+    assert not any('node_modules' in f or 'vendor' in f for f in files)
+
+
+def test_exclude_patterns_are_compiled_once_per_pattern_set(tmp_path: Path):
+    pmd_base._compile_exclude_patterns.cache_clear()
+    try:
+        for _ in range(3):
+            find_excluded_paths(tmp_path, ['*.g.dart', '**/build/**'], Logger(quiet=True))
+        info = pmd_base._compile_exclude_patterns.cache_info()
+        assert (info.misses, info.hits) == (1, 2)
+    finally:
+        pmd_base._compile_exclude_patterns.cache_clear()
+
+
+def test_temp_path_list_writes_paths_as_given(tmp_path: Path):
+    paths = [str(tmp_path / 'b.dart'), str(tmp_path / 'a.dart'), str(tmp_path / 'b.dart')]
+    listing = pmd_base.write_temp_path_list(paths, 'pmd_test_', Logger(quiet=True))
+    try:
+        assert listing.read_text(encoding='utf-8').splitlines() == paths[:2]
+    finally:
+        listing.unlink()
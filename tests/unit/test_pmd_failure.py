@@ -52,3 +52,16 @@ def test_no_duplicates_is_ok_and_empty(tmp_path: Path):
     res = _rule(tmp_path)._result_from_pmd_stdout(NO_DUPLICATES)
     assert res.status == RuleStatus.OK
     assert res.violations == []
+
+
+def test_stderr_filter_drops_only_reserved_device_name_lines():
+    from rules.pmd_base import filter_pmd_stderr
+    stderr = "\n".join([
+        "[WARN] Cannot read C:\\proj\\nul",
+        "[WARN] Cannot read C:\\proj\\CON.txt",
+        "[WARN] Cannot read /proj/aux/x.php",
+        "Error reading: prn",
+        "[ERROR] C:\\src\\nullable.dart: parse error",
+        "Lexical error in falcon",
+    ])
+    assert filter_pmd_stderr(stderr) == "[ERROR] C:\\src\\nullable.dart: parse error\nLexical error in falcon"
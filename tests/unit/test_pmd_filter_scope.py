@@ -1,8 +1,9 @@
 """Tests for PMD CPD scoping under --only-changed / --file.
 
 Covers the --file-list vs -d command construction in _run_pmd_cpd, the
-resolve_filtered_pmd_files helper (extension + exclude filtering), and the
-"fewer than 2 changed files" short-circuit in _run.
+resolve_filtered_pmd_files helper (extension + exclude filtering), the
+"fewer than 2 changed files" short-circuit in _run, and the reuse of
+identical CPD runs.
 """
 from pathlib import Path
 from types import SimpleNamespace
@@ -11,25 +12,26 @@ from logger import Logger
 from models import RuleStatus
 from rules import PMDDuplicatesRule
 from rules.context import RuleContext
+from rules import pmd_base
 from rules.pmd_base import resolve_filtered_pmd_files
 
 EMPTY_CPD = '<?xml version="1.0"?><pmd-cpd></pmd-cpd>'
 
 
-def _rule(tmp_path: Path, filter_files=None, language="flutter") -> PMDDuplicatesRule:
+def _rule(tmp_path: Path, filter_files=None, language="flutter", run_cache=None) -> PMDDuplicatesRule:
     return PMDDuplicatesRule(RuleContext(
         config={}, base_path=tmp_path, language=language,
-        filter_files=filter_files, logger=Logger(quiet=True),
+        filter_files=filter_files, logger=Logger(quiet=True), run_cache=run_cache,
     ))
 
 
-def _capture_cmd(rule):
+def _capture_cmd(rule, returncode=0):
     """Replace _run_subprocess with a spy returning empty CPD output."""
     seen = {}
 
     def fake(cmd, *_args, **_kwargs):
         seen['cmd'] = cmd
-        return SimpleNamespace(returncode=0, stdout=EMPTY_CPD, stderr="")
+        return SimpleNamespace(returncode=returncode, stdout=EMPTY_CPD, stderr="")
 
     rule._run_subprocess = fake
     return seen
@@ -77,3 +79,93 @@ def test_run_skips_when_fewer_than_two_changed_files(tmp_path: Path):
     assert result.status == RuleStatus.OK
     assert result.violations == []
     assert called['ran'] is False  # short-circuited before invoking PMD
+
+
+def test_identical_cpd_jobs_run_pmd_once_per_analyzer_run(tmp_path: Path):
+    run_cache = {}
+    runs = []
+    for language in ("flutter", "dart"):
+        rule = _rule(tmp_path, language=language, run_cache=run_cache)
+        seen = _capture_cmd(rule)
+        result = rule._run_pmd_cpd("pmd", "dart", tmp_path, 100, [], ["*.g.dart"], filtered=None)
+        assert result.status == RuleStatus.OK
+        runs.append('cmd' in seen)
+    assert runs == [True, False]
+
+    rule = _rule(tmp_path, run_cache=run_cache)
+    seen = _capture_cmd(rule)
+    rule._run_pmd_cpd("pmd", "dart", tmp_path, 50, [], ["*.g.dart"], filtered=None)
+    assert 'cmd' in seen  # different minimum tokens, so a new run
+
+    rule = _rule(tmp_path, run_cache={})
+    seen = _capture_cmd(rule)
+    rule._run_pmd_cpd("pmd", "dart", tmp_path, 100, [], ["*.g.dart"], filtered=None)
+    assert 'cmd' in seen  # a new analyzer run scans again
+
+
+def test_failed_cpd_runs_are_not_reused(tmp_path: Path):
+    run_cache = {}
+    for _ in range(2):
+        rule = _rule(tmp_path, run_cache=run_cache)
+        seen = _capture_cmd(rule, returncode=1)
+        rule._run_pmd_cpd("pmd", "dart", tmp_path, 100, [], [], filtered=None)
+        assert 'cmd' in seen
+    assert not any(key[0] == 'pmd_cpd_output' for key in run_cache)
+
+
+def test_directory_exclude_patterns_become_exclude_arguments(tmp_path: Path):
+    (tmp_path / "node_modules" / "pkg").mkdir(parents=True)
+    (tmp_path / "node_modules" / "pkg" / "index.js").write_text("")
+    rule = _rule(tmp_path, language="javascript")
+    seen = _capture_cmd(rule)
+    rule._run_pmd_cpd("pmd", "ecmascript", tmp_path, 100, [], ["**/node_modules/**"], filtered=None)
+    cmd = seen['cmd']
+    assert cmd[cmd.index('--exclude') + 1] == str(tmp_path / "node_modules")
+    assert '--exclude-file-list' not in cmd
+
+
+def test_cached_report_is_reused_until_a_source_changes(tmp_path: Path):
+    source = tmp_path / "a.dart"
+    source.write_text("void main() {}")
+
+    def run():
+        rule = PMDDuplicatesRule(RuleContext(config={"cache": True}, base_path=tmp_path, output_folder=tmp_path,
+                                             language="dart", logger=Logger(quiet=True)))
+        seen = _capture_cmd(rule)
+        assert rule._run_pmd_cpd("pmd", "dart", tmp_path, 100, [], [], filtered=None).status == RuleStatus.OK
+        return 'cmd' in seen
+
+    assert run() is True
+    assert (tmp_path / ".pmd_duplicates_dart_cache.json").exists()
+    assert run() is False
+    source.write_text("void main() { print(1); }")
+    assert run() is True
+
+
+def test_duplicate_and_similar_code_rules_share_one_exclude_walk(tmp_path: Path, monkeypatch):
+    from rules import PMDSimilarCodeRule
+    walks = []
+    original = pmd_base.find_excluded_paths
+    monkeypatch.setattr(pmd_base, "find_excluded_paths", lambda *a: walks.append(a[0]) or original(*a))
+    (tmp_path / "build").mkdir()
+    (tmp_path / "build" / "gen.dart").write_text("")
+
+    run_cache = {}
+    duplicates = _rule(tmp_path, run_cache=run_cache)
+    similar = PMDSimilarCodeRule(RuleContext(config={}, base_path=tmp_path, language="flutter",
+                                             logger=Logger(quiet=True), run_cache=run_cache))
+    commands = [_capture_cmd(duplicates), _capture_cmd(similar)]
+    duplicates._run_pmd_cpd("pmd", "dart", tmp_path, 100, [], ["**/build/**"], filtered=None)
+    similar._run_pmd_cpd("pmd", "dart", tmp_path, 100, [], ["**/build/**"], True, True, False, filtered=None)
+    assert walks == [tmp_path]
+    for seen in commands:
+        assert str(tmp_path / "build") in seen['cmd']
+
+    # The next analyzer run walks again and sees directories created since
+    (tmp_path / "vendor").mkdir()
+    (tmp_path / "vendor" / "lib.dart").write_text("")
+    rule = _rule(tmp_path, run_cache={})
+    seen = _capture_cmd(rule)
+    rule._run_pmd_cpd("pmd", "dart", tmp_path, 100, [], ["**/build/**", "vendor/**"], filtered=None)
+    assert len(walks) == 2
+    assert str(tmp_path / "vendor") in seen['cmd']
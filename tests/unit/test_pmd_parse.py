@@ -37,3 +37,30 @@ def test_namespaced_violations_are_tagged_pmd_duplicates(tmp_path: Path):
     violations = _rule(tmp_path)._parse_xml_output(NAMESPACED_XML)
     assert violations
     assert all(v.rule_name == "pmd_duplicates" for v in violations)
+
+
+def test_similar_code_violations_list_the_other_occurrences(tmp_path: Path):
+    from rules import PMDSimilarCodeRule
+    xml = (
+        '<pmd-cpd xmlns="https://pmd-code.org/schema/cpd-report"><duplication lines="12" tokens="90">'
+        f'<file line="3" path="{tmp_path / "a.php"}"/><file line="8" path="{tmp_path / "b.php"}"/>'
+        f'<file path="{tmp_path / "c.php"}"/></duplication></pmd-cpd>'
+    )
+    rule = PMDSimilarCodeRule(RuleContext(config={}, base_path=tmp_path, logger=Logger(quiet=True)))
+    violations = rule._parse_xml_output(xml)
+    assert [(v.file_path, v.line) for v in violations] == [("a.php", 3), ("b.php", 8), ("c.php", None)]
+    assert violations[0].message == (
+        "Similar code found: 12 lines, 90 tokens, 3 occurrences — also in: b.php:8, c.php:?")
+    assert violations[2].message.endswith("also in: a.php:3, b.php:8")
+
+
+def test_max_errors_keeps_the_largest_duplications(tmp_path: Path):
+    groups = ''.join(
+        f'<duplication lines="{lines}" tokens="99"><file line="1" path="{tmp_path / name}"/>'
+        f'<file line="2" path="{tmp_path / "z.php"}"/></duplication>'
+        for name, lines in (("a.php", 5), ("b.php", 40), ("c.php", 12))
+    )
+    xml = f'<pmd-cpd xmlns="https://pmd-code.org/schema/cpd-report">{groups}</pmd-cpd>'
+    rule = PMDDuplicatesRule(RuleContext(config={}, base_path=tmp_path, max_errors=3, logger=Logger(quiet=True)))
+    violations = rule._parse_xml_output(xml)
+    assert [v.file_path for v in violations] == ["b.php", "z.php", "c.php"]
@@ -0,0 +1,44 @@
+"""Unit tests for the shared ProjectFileIndex."""
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from logger import Logger
+from rules import ESLintAnalyzeRule
+from rules.context import RuleContext
+from rules.project_files import ProjectFileIndex
+
+
+def _touch(path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("", encoding="utf-8")
+
+
+def test_counts_extensions_and_prunes_dependency_directories(tmp_path: Path):
+    _touch(tmp_path / "src" / "a.ts")
+    _touch(tmp_path / "src" / "nested" / "b.ts")
+    _touch(tmp_path / "lib" / "main.dart")
+    _touch(tmp_path / "node_modules" / "pkg" / "Button.svelte")
+    index = ProjectFileIndex(tmp_path)
+    assert index.count(".ts") == 2
+    assert index.count("dart") == 1
+    assert index.has_extension(".js", ".ts") is True
+    assert index.has_extension(".svelte") is False
+
+
+def test_scan_runs_once_when_shared_across_threads(tmp_path: Path, monkeypatch):
+    _touch(tmp_path / "a.js")
+    index = ProjectFileIndex(tmp_path)
+    scans = []
+    original = index._scan
+    monkeypatch.setattr(index, "_scan", lambda: scans.append(1) or original())
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        assert all(pool.map(lambda _: index.has_extension(".js"), range(32)))
+    assert scans == [1]
+
+
+def test_rules_use_the_index_from_their_context(tmp_path: Path):
+    index = ProjectFileIndex(tmp_path)
+    rule = ESLintAnalyzeRule(RuleContext(config={}, base_path=tmp_path, logger=Logger(quiet=True),
+                                         file_index=index))
+    assert rule.file_index is index
+    assert ProjectFileIndex(None).has_extension(".js") is False
@@ -0,0 +1,60 @@
+"""Unit tests for TscAnalyzeRule output parsing and CSV reporting."""
+import csv
+import sys
+from pathlib import Path
+
+import pytest
+
+from logger import Logger
+from models import RuleStatus
+from rules import TscAnalyzeRule, tsc_analyze
+from rules.context import RuleContext
+
+TSC_OUTPUT = """src/a.ts(3,5): error TS2304: Cannot find name 'x' at line 9.
+src/b.ts(10,1): warning TS6133: 'y' is declared but never used.
+"""
+
+
+def _rule(tmp_path: Path) -> TscAnalyzeRule:
+    return TscAnalyzeRule(RuleContext(config={}, base_path=tmp_path, output_folder=tmp_path,
+                                      logger=Logger(quiet=True)))
+
+
+def test_csv_has_code_and_message_without_location_suffix(tmp_path: Path):
+    rule = _rule(tmp_path)
+    violations = rule._parse_tsc_output(TSC_OUTPUT)
+    assert [(v.file_path, v.line, v.column) for v in violations] == [("src/a.ts", 3, 5), ("src/b.ts", 10, 1)]
+    assert violations[0].message == "TS2304: Cannot find name 'x' at line 9. at line 3, column 5"
+    output_file = tmp_path / "tsc.csv"
+    rule._write_csv_output(output_file, rule._parse_tsc_records(TSC_OUTPUT))
+    with open(output_file, encoding="utf-8", newline="") as f:
+        rows = list(csv.reader(f))
+    assert [row[4:] for row in rows[1:]] == [
+        ["TS2304", "Cannot find name 'x' at line 9."],
+        ["TS6133", "'y' is declared but never used."],
+    ]
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="uses a POSIX shell script as the fake tsc")
+def test_run_parses_streamed_output(tmp_path: Path):
+    fake_tsc = tmp_path / "tsc"
+    fake_tsc.write_text(f"#!/bin/sh\ncat <<'EOF'\n{TSC_OUTPUT}EOF\necho 'noise' >&2\n", encoding="utf-8")
+    fake_tsc.chmod(0o755)
+    result = _rule(tmp_path)._run_tsc(str(fake_tsc))
+    assert result.status == RuleStatus.OK
+    assert [v.line for v in result.violations] == [3, 10]
+    assert (tmp_path / "tsc_analyze.csv").exists()
+
+
+@pytest.mark.parametrize("line, expected", [
+    ("src/a (copy).ts(3,5): error TS2304: Cannot find name 'x'.",
+     ("src/a (copy).ts", 3, 5, "error", "TS2304", "Cannot find name 'x'.")),
+    ("C:\\src\\b.ts(10,1): warning TS6133: 'y' is declared: but never used.",
+     ("C:\\src\\b.ts", 10, 1, "warning", "TS6133", "'y' is declared: but never used.")),
+    ("src/odd): dir/c.ts(7,2): error TS1005: ';' expected.",
+     ("src/odd): dir/c.ts", 7, 2, "error", "TS1005", "';' expected.")),
+    ("error TS5058: The specified path does not exist: 'tsconfig.json'.", None),
+    ("src/a.ts(3,5): error TS2304:", None),
+])
+def test_parse_diagnostic_line(line: str, expected):
+    assert tsc_analyze._parse_diagnostic_line(line) == expected